@@ -1,8 +1,32 @@
 """Staxing's module file."""
 
 from .helper import Helper, Admin, Student, Teacher, User, ContentQA
+from .admin_tables import AdminTable
+from .artifacts import ArtifactRecorder
 from .assignment import Assignment
+from .broker import SessionBroker
+from .budget import Budget, BudgetExceeded
+from .cleanup import CourseCleanup
+from .content import BookCrawler
+from .content_index import ContentIndex
+from .element_cache import ElementCache
+from .event_wait import EventWait
+from .events import LOG, EventLogger
+from .http_driver import HTTPDriver
+from .jobs import JobWatcher
+from .latency import LatencyHistogram, LatencyRecorder
+from .load import Pacer, PracticeLoad
+from .locators import LOCATORS, Locator, LocatorRegistry
+from .metrics import PageMetrics
 from .page_load import SeleniumWait
+from .provision import Provisioner
+from .replay import CommandRecorder, Replayer
+from .runtime import Runtime
+from .schedule import Moment, Schedule
+from .supervisor import SUPERVISOR, Supervisor
+from .tabs import TabScheduler
+from .toc import BookTOC
+from .tutor_api import AssignmentAPI, TutorAPI
 
 if __name__ == '__main__':
     a = Helper
@@ -13,3 +37,37 @@ if __name__ == '__main__':
     f = User
     g = ContentQA
     h = SeleniumWait
+    i = Locator
+    j = LocatorRegistry
+    k = LOCATORS
+    m = ElementCache
+    n = ArtifactRecorder
+    o = LatencyHistogram
+    p = LatencyRecorder
+    q = Pacer
+    r = PracticeLoad
+    s = LOG
+    t = EventLogger
+    u = AssignmentAPI
+    v = TutorAPI
+    w = CourseCleanup
+    x = Provisioner
+    y = Moment
+    z = Schedule
+    aa = TabScheduler
+    ab = SUPERVISOR
+    ac = Supervisor
+    ad = CommandRecorder
+    ae = Replayer
+    af = SessionBroker
+    ag = AdminTable
+    ah = HTTPDriver
+    ai = JobWatcher
+    aj = BookTOC
+    ak = BookCrawler
+    al = ContentIndex
+    am = PageMetrics
+    an = Budget
+    ao = BudgetExceeded
+    ap = EventWait
+    aq = Runtime
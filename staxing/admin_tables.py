@@ -0,0 +1,121 @@
+"""Stream the paginated tables on the Tutor admin list pages."""
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urljoin, urlparse, parse_qsl, urlunparse
+
+import requests
+
+from bs4 import BeautifulSoup
+
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+
+__version__ = '0.0.1'
+
+NEXT_PAGE = 'a[rel~=next], .pagination .next a, a.next_page'
+
+
+def with_query(url, params):
+    """Return url with params merged into its query string."""
+    parts = urlparse(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({key: value for key, value in params.items()
+                  if value is not None})
+    return urlunparse(parts._replace(query=urlencode(sorted(query.items()))))
+
+
+def parse_table(html, url, selector='table'):
+    """Return (headers, rows, next page URL) in one pass over a page.
+
+    Rows are lists of cell texts; the last item is the row's first link or
+    None. Headers without text are named by their column number.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.select_one(selector)
+    headers = []
+    rows = []
+    if table is not None:
+        head = table.select('thead th') or table.select('tr:first-of-type th')
+        headers = [cell.get_text(' ', strip=True) or 'column_%s' % index
+                   for index, cell in enumerate(head)]
+        for line in table.find_all('tr'):
+            cells = line.find_all('td')
+            if not cells:
+                continue
+            link = line.find('a', href=True)
+            rows.append([cell.get_text(' ', strip=True) for cell in cells] +
+                        [urljoin(url, link['href']) if link else None])
+    following = soup.select_one(NEXT_PAGE)
+    after = urljoin(url, following['href']) if following is not None and \
+        following.get('href') else None
+    return headers, rows, after
+
+
+class AdminTable(object):
+    """Lazily iterate the rows of an admin list across its pages.
+
+    Each page is fetched over HTTP with the browser's login and parsed in
+    a single pass; the next page downloads in the background while the
+    caller works through the current one, so at most two pages are held.
+
+    session (requests.Session): session holding the admin login cookies
+    url (string): first page of the list, e.g. https://.../admin/users
+    filters (dict): query string parameters applied by the server
+    selector (string): CSS selector of the data table
+    prefetch (bool): download the next page while rows are consumed
+    limit (int): stop after this many pages
+    """
+
+    def __init__(self, session, url, filters=None, selector='table',
+                 prefetch=True, timeout=30, limit=None):
+        """Table constructor."""
+        self.session = session if session is not None else requests.Session()
+        self.url = with_query(url, filters or {})
+        self.selector = selector
+        self.prefetch = prefetch
+        self.timeout = timeout
+        self.limit = limit
+        self.headers = []
+        self.pages = 0
+
+    def fetch(self, url):
+        """Return the parsed page at url."""
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return parse_table(response.text, response.url, self.selector)
+
+    def _row(self, cells):
+        """Return a row dictionary keyed by the table headers."""
+        row = {}
+        for index, value in enumerate(cells[:-1]):
+            header = self.headers[index] if index < len(self.headers) else \
+                'column_%s' % index
+            row[header] = value
+        row['href'] = cells[-1]
+        return row
+
+    def __iter__(self):
+        """Yield each row as a dictionary, page by page."""
+        url = self.url
+        seen = set()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(self.fetch, url)
+            while pending is not None:
+                headers, rows, after = pending.result()
+                seen.add(url)
+                self.pages += 1
+                self.headers = headers or self.headers
+                pending = None
+                more = after is not None and after not in seen and \
+                    (self.limit is None or self.pages < self.limit)
+                if more:
+                    url = after
+                    pending = pool.submit(self.fetch, url) \
+                        if self.prefetch else None
+                LOG.debug(self, 'Page %s: %s rows', self.pages, len(rows))
+                for cells in rows:
+                    yield self._row(cells)
+                if more and pending is None:
+                    pending = pool.submit(self.fetch, url)
@@ -0,0 +1,200 @@
+"""Failure-time artifact capture for WebDriver sessions."""
+
+import atexit
+import datetime
+import functools
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+
+from collections import deque
+from weakref import WeakKeyDictionary, ref
+
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+
+__version__ = '0.0.1'
+
+
+class ArtifactWriter(object):
+    """Background thread that writes captured artifacts to disk."""
+
+    def __init__(self):
+        """Writer constructor."""
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, path, data):
+        """Queue a file write; data is bytes or text."""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run,
+                                               name='staxing-artifacts',
+                                               daemon=True)
+                self.thread.start()
+        self.jobs.put((path, data))
+
+    def flush(self):
+        """Block until every queued artifact is on disk."""
+        if self.thread is not None and self.thread.is_alive():
+            self.jobs.join()
+
+    def _run(self):
+        """Write queued files until the process exits."""
+        while True:
+            path, data = self.jobs.get()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                mode = 'wb' if isinstance(data, bytes) else 'w'
+                with open(path, mode) as artifact:
+                    artifact.write(data)
+            except Exception as err:
+                LOG.error('artifacts', 'Artifact write failed for %s: %s',
+                          path, err)
+            finally:
+                self.jobs.task_done()
+
+
+WRITER = ArtifactWriter()
+atexit.register(WRITER.flush)
+
+
+class ArtifactRecorder(object):
+    """Ring buffer of recent WebDriver commands with failure capture.
+
+    Every command sent through driver.execute is logged with its start
+    time and duration; nothing else happens until capture() is called,
+    so passing runs only pay for a deque append per command.
+    """
+
+    DEFAULT_SIZE = 50
+    _recorders = WeakKeyDictionary()
+
+    def __init__(self, driver, size=DEFAULT_SIZE, directory=None):
+        """Recorder constructor."""
+        self._driver = ref(driver)
+        self.commands = deque(maxlen=size)
+        self.directory = directory if directory else os.getenv(
+            'STAXING_ARTIFACTS', os.path.join(os.getcwd(), 'artifacts'))
+        # keep the unbound command method: a bound one would hold the
+        # driver and keep it alive as a key of _recorders
+        execute = driver.execute
+        if getattr(execute, '__self__', None) is driver:
+            execute = execute.__func__
+            self._execute = lambda command, params: execute(
+                self.driver, command, params)
+        else:
+            self._execute = execute
+        driver.execute = self._record
+
+    @property
+    def driver(self):
+        """Return the recorded WebDriver."""
+        return self._driver()
+
+    @classmethod
+    def for_driver(cls, driver, **kwargs):
+        """Return the recorder attached to a driver, attaching one if new."""
+        recorder = cls._recorders.get(driver)
+        if recorder is None:
+            recorder = cls(driver, **kwargs)
+            cls._recorders[driver] = recorder
+        return recorder
+
+    @classmethod
+    def find(cls, driver):
+        """Return the recorder attached to a driver, if any."""
+        try:
+            return cls._recorders.get(driver)
+        except TypeError:
+            return None
+
+    def _record(self, driver_command, params=None):
+        """Pass a command to the driver and log its timing."""
+        start = time.time()
+        try:
+            return self._execute(driver_command, params)
+        finally:
+            detail = None
+            if params:
+                detail = params.get('value', params.get('url'))
+                if isinstance(detail, str) and len(detail) > 120:
+                    detail = detail[:117] + '...'
+                elif not isinstance(detail, str):
+                    detail = None
+            self.commands.append(
+                (start, driver_command, time.time() - start, detail)
+            )
+
+    def history(self):
+        """Return the buffered commands as dictionaries, oldest first."""
+        return [
+            {'time': start, 'command': command,
+             'duration': round(duration, 4), 'detail': detail}
+            for start, command, duration, detail in list(self.commands)
+        ]
+
+    def capture(self, name, error=None):
+        """Save a screenshot, DOM, console log and command history.
+
+        Browser state is read immediately; the files are written by a
+        background thread. Return the artifact directory.
+        """
+        history = self.history()
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        folder = os.path.join(self.directory, '%s-%s' % (stamp, name))
+        files = {'commands.json': json.dumps(history, indent=2)}
+        if error is not None:
+            files['error.txt'] = ''.join(
+                traceback.format_exception(type(error), error,
+                                           error.__traceback__))
+        readers = {
+            'screenshot.png': self.driver.get_screenshot_as_png,
+            'page.html': lambda: self.driver.page_source,
+            'url.txt': lambda: self.driver.current_url,
+            'console.json':
+                lambda: json.dumps(self.driver.get_log('browser'), indent=2),
+        }
+        for filename, reader in readers.items():
+            try:
+                files[filename] = reader()
+            except Exception as err:
+                files[filename + '.error'] = str(err)
+        for filename, data in files.items():
+            WRITER.submit(os.path.join(folder, filename), data)
+        LOG.warning(self, 'Failure artifacts: %s', folder)
+        return folder
+
+
+def capture_on_failure(method):
+    """Capture browser artifacts when a helper or Assignment method fails.
+
+    The driver is taken from a 'driver' argument (Assignment style) or
+    from self.driver (Helper style). Nested decorated calls only capture
+    once per exception.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as err:
+            if getattr(err, 'staxing_artifacts', None) is None:
+                driver = kwargs.get('driver', args[0] if args else None)
+                if not hasattr(driver, 'execute'):
+                    driver = getattr(self, 'driver', None)
+                recorder = ArtifactRecorder.find(driver)
+                if recorder is not None:
+                    try:
+                        err.staxing_artifacts = recorder.capture(
+                            method.__name__, err)
+                    except Exception as capture_error:
+                        LOG.warning(self, 'Artifact capture failed: %s',
+                                    capture_error)
+            raise
+    return wrapper
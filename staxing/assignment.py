@@ -7,17 +7,41 @@ import random
 import string
 import time
 
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support import expected_conditions as expect
-from selenium.webdriver.support.ui import WebDriverWait
 
 __version__ = '0.0.35'
 
 try:
-    from staxing.page_load import SeleniumWait as Page
+    from staxing.artifacts import capture_on_failure
 except ImportError:
-    from page_load import SeleniumWait as Page
+    from artifacts import capture_on_failure
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+try:
+    from staxing.element_cache import ElementCache
+except ImportError:
+    from element_cache import ElementCache
+try:
+    from staxing.event_wait import EventWait
+except ImportError:
+    from event_wait import EventWait
+try:
+    from staxing.locators import LOCATORS
+except ImportError:
+    from locators import LOCATORS
+try:
+    from staxing.runtime import Runtime
+except ImportError:
+    from runtime import Runtime
+try:
+    from staxing.schedule import normalize, parse_date
+except ImportError:
+    from schedule import normalize, parse_date
 
 
 class Assignment(object):
@@ -46,8 +70,16 @@ class Assignment(object):
     DRAFT = 'draft'
     DELETE = 'delete'
 
-    def __init__(self):
-        """Provide a switch-style dictionary to add assignments."""
+    UI = 'ui'
+    API = 'api'
+
+    def __init__(self, backend=None):
+        """Provide a switch-style dictionary to add assignments.
+
+        backend: optional AssignmentAPI used by Teacher.add_assignment in
+                 place of the UI
+        """
+        self.backend = backend
         self.add = {
             Assignment.READING:
             (
@@ -208,9 +240,8 @@ class Assignment(object):
 
     @classmethod
     def scroll_to(cls, driver, element):
-        """Execute a scroll until in view javascript."""
-        driver.execute_script('return arguments[0].scrollIntoView();', element)
-        driver.execute_script('window.scrollBy(0, -80);')
+        """Scroll an element into view below the 80 pixel page header."""
+        return Runtime.for_driver(driver).scroll_to(element, 80)
 
     @classmethod
     def send_keys(cls, driver, element, text):
@@ -223,17 +254,14 @@ class Assignment(object):
 
     def open_assignment_menu(self, driver):
         """Open the Add Assignment menu if it is closed."""
-        print('Open the assignment menu')
-        assignment_menu = driver.find_element(
-            By.CSS_SELECTOR, 'button.sidebar-toggle')
-        Assignment.scroll_to(driver, assignment_menu)
-        color = assignment_menu.value_of_css_property('background-color')
-        if not color.lower() == 'rgba(153, 153, 153, 1)':
-            # background isn't gray so the toggle is still closed
-            assignment_menu.click()
-            print('Open menu')
+        LOG.debug(self, 'Open the assignment menu')
+        # background isn't gray while the toggle is still closed
+        if Runtime.for_driver(driver).click_unless_style(
+                LOCATORS.get('calendar.sidebar_toggle'), 'background-color',
+                'rgba(153, 153, 153, 1)'):
+            LOG.debug(self, 'Open menu')
             return
-        print('Menu already open')
+        LOG.debug(self, 'Menu already open')
 
     def modify_time(self, time):
         """Modify time string for react."""
@@ -250,119 +278,105 @@ class Assignment(object):
         if today.year == new_date.year and today.month == new_date.month:
             return
         months = {v: k for k, v in enumerate(calendar.month_name)}
+        cache = ElementCache.for_driver(driver)
+        # the picker is rebuilt each time it opens
+        cache.forget(LOCATORS.get('datepicker.next'))
+        cache.forget(LOCATORS.get('datepicker.previous'))
+        cache.forget(LOCATORS.get('datepicker.month'))
 
-        next_month = driver.find_element(
-            By.CLASS_NAME,
-            'react-datepicker__navigation--next'
-        )
-        current = driver.find_element(
-            By.CLASS_NAME,
-            'react-datepicker__current-month'
-        )
-        month, year = current.text.split(' ')
+        month, year = cache.text(LOCATORS.get('datepicker.month')).split(' ')
         month = months[month]
         year = int(year)
 
         while year <= new_date.year and month < new_date.month:
-            next_month.click()
-            current = driver.find_element(
-                By.CLASS_NAME,
-                'react-datepicker__current-month'
-            )
-            month, year = current.text.split(' ')
+            cache.click(LOCATORS.get('datepicker.next'))
+            month, year = cache.text(
+                LOCATORS.get('datepicker.month')).split(' ')
             month = months[month]
             year = int(year)
             time.sleep(1.0)
         while year >= new_date.year and month > new_date.month:
-            # because it will only ever go back one month it's okay to find
-            # arrow inside the while loop
-            previous_month = driver.find_element(
-                By.CLASS_NAME,
-                'react-datepicker__navigation--previous'
-            )
-            previous_month.click()
-            current = driver.find_element(
-                By.CLASS_NAME,
-                'react-datepicker__current-month'
-            )
-            month, year = current.text.split(' ')
+            cache.click(LOCATORS.get('datepicker.previous'))
+            month, year = cache.text(
+                LOCATORS.get('datepicker.month')).split(' ')
             month = months[month]
             year = int(year)
             time.sleep(1.0)
 
     def assign_time(self, driver, time,
-                    option=None, is_all=False, target='due'):
-        """Set the time for a particular period/section row."""
-        start = option if option else driver
-        path = '../..' if not is_all else ''
-        path += '//div[contains(@class,"-%s-time")]//input' % target
-        element = start.find_element(By.XPATH, path)
-        element.clear()
-        for char in self.modify_time(time):
-            element.send_keys(char)
+                    option=None, is_all=False, target='due',
+                    normalized=False):
+        """Set the time for a particular period/section row.
+
+        normalized: time is already input keystrokes (schedule.Moment.time)
+        """
+        keys = time if normalized else self.modify_time(time)
+
+        def enter_time(element):
+            element.clear()
+            for char in keys:
+                element.send_keys(char)
+
+        ElementCache.for_driver(driver).use(
+            LOCATORS.get('plan.all_time' if is_all else 'plan.row_time',
+                         target=target),
+            enter_time,
+            root=option)
 
     def assign_date(self, driver, date,
                     option=None, is_all=False, target='due'):
         """Set the date for a particular period/section row."""
-        start = option if option else driver
-        path = '../..' if not is_all else ''
-        path += '//div[contains(@class,"-%s-date")]' % target
-        path += '//div[contains(@class,"react-datepicker__input")]//input'
-        date_element = start.find_element(By.XPATH, path)
         # get calendar to correct month
-        split = date.split('/')
-        change = datetime.date(int(split[2]), int(split[0]), int(split[1]))
+        change = parse_date(date)
         time.sleep(0.15)
-        self.adjust_date_picker(driver, date_element, change)
+        ElementCache.for_driver(driver).use(
+            LOCATORS.get('plan.all_date' if is_all else 'plan.row_date',
+                         target=target),
+            lambda date_element:
+                self.adjust_date_picker(driver, date_element, change),
+            root=option)
         driver.find_element(
-            By.XPATH,
-            '//div[contains(@class,"react-datepicker__day") ' +
-            'and not(contains(@class,"disabled")) ' +
-            'and text()="%s"]' % change.day
-        ).click()
+            *LOCATORS.get('datepicker.day', day=change.day)).click()
 
     def assign_periods(self, driver, periods):
-        """Assign dates and times to particular periods/sections."""
+        """Assign dates and times to particular periods/sections.
+
+        Period values may be date strings, (date, time) pairs or
+        schedule.Moment pairs from a Schedule; all are normalized once here.
+        """
+        periods = normalize(periods)
         # prepare assignment for all periods/sections together
         if 'all' in periods:
             # activate the collective time/date panel
-            driver.find_element(By.ID, 'hide-periods-radio').click()
-            opens_at = None
-            closes_at = None
-            opens_on, closes_on = periods['all']
-            if isinstance(opens_on, tuple):
-                opens_on, opens_at = opens_on
-            if isinstance(closes_on, tuple):
-                closes_on, closes_at = closes_on
-            self.assign_date(driver=driver, date=opens_on,
+            driver.find_element(*LOCATORS.get('plan.all_periods')).click()
+            opens, closes = periods['all']
+            self.assign_date(driver=driver, date=opens.date,
                              is_all=True, target='open')
-            self.assign_date(driver=driver, date=closes_on,
+            self.assign_date(driver=driver, date=closes.date,
                              is_all=True, target='due')
-            if opens_at:
-                self.assign_time(driver=driver, time=opens_at,
-                                 is_all=True, target='open')
-            if closes_at:
-                self.assign_time(driver=driver, time=closes_at,
-                                 is_all=True, target='due')
+            if opens.time:
+                self.assign_time(driver=driver, time=opens.time,
+                                 is_all=True, target='open', normalized=True)
+            if closes.time:
+                self.assign_time(driver=driver, time=closes.time,
+                                 is_all=True, target='due', normalized=True)
             return
         # or locate important elements for each period/section
         options = {}
         # activate the individual period time/date panel
-        driver.find_element(By.ID, 'show-periods-radio').click()
+        driver.find_element(*LOCATORS.get('plan.each_period')).click()
         period_boxes = driver.find_elements(
-            By.XPATH,
-            '//input[contains(@id,"period-toggle-period")]'
-        )
+            *LOCATORS.get('plan.period_toggles'))
         for period in period_boxes:
             options[
                 driver.find_element(
-                    By.XPATH,
-                    '//label[@for="%s"]' % period.get_attribute('id')
+                    *LOCATORS.get('plan.period_label',
+                                  id=period.get_attribute('id'))
                 ).text
             ] = period
         period_match = False
         for period in options:
-            print('Period:', period)
+            LOG.debug(self, 'Period: %s', period)
             # activate or deactivate a specific period/section row
             period_match = period_match or period in periods
             if period not in periods:
@@ -377,77 +391,63 @@ class Assignment(object):
             if options[period].get_attribute('checked') is None:
                 options[period].click()
             # set dates
-            opens_at = None
-            closes_at = None
-            opens_on, closes_on = periods[period]
-            if isinstance(opens_on, tuple):
-                opens_on, opens_at = opens_on
-            if isinstance(closes_on, tuple):
-                closes_on, closes_at = closes_on
-            self.assign_date(driver=driver, date=closes_on,
+            opens, closes = periods[period]
+            self.assign_date(driver=driver, date=closes.date,
                              option=options[period], target='due')
-            self.assign_date(driver=driver, date=opens_on,
+            self.assign_date(driver=driver, date=opens.date,
                              option=options[period], target='open')
-            if closes_at:
-                self.assign_time(driver=driver, time=closes_at,
-                                 option=options[period], target='due')
-            if opens_at:
-                self.assign_time(driver=driver, time=opens_at,
-                                 option=options[period], target='open')
+            if closes.time:
+                self.assign_time(driver=driver, time=closes.time,
+                                 option=options[period], target='due',
+                                 normalized=True)
+            if opens.time:
+                self.assign_time(driver=driver, time=opens.time,
+                                 option=options[period], target='open',
+                                 normalized=True)
         if not period_match:
             raise ValueError('No periods matched')
 
     def select_status(self, driver, status):
         """Select assignment status."""
-        element = driver.find_element(
-            By.XPATH, '//div[contains(@class,"footer")]')
-        Assignment.scroll_to(driver, element)
+        cache = ElementCache.for_driver(driver)
+        cache.use(LOCATORS.get('plan.footer'),
+                  lambda footer: Assignment.scroll_to(driver, footer))
         if status == self.PUBLISH:
-            print('Publishing...')
+            LOG.info(self, 'Publishing...')
             time.sleep(1)
-            driver.find_element(
-                By.XPATH, '//button[contains(@class,"-publish")]').click()
+            cache.click(LOCATORS.get('plan.publish'))
         elif status == self.DRAFT:
-            print('Saving draft')
+            LOG.info(self, 'Saving draft')
             time.sleep(1)
-            element = driver.find_element(
-                By.XPATH, '//button[contains(@class," -save")]').click()
+            cache.click(LOCATORS.get('plan.save'))
         elif status == self.CANCEL:
-            print('Canceling assignment')
+            LOG.info(self, 'Canceling assignment')
             time.sleep(1)
-            element = driver.find_element(
-                By.XPATH,
-                '//button[contains(text(),"Cancel") and @type="button"]'
-            ).click()
+            cache.click(LOCATORS.get('plan.cancel'))
             try:
-                wait = WebDriverWait(driver, Assignment.WAIT_TIME)
+                wait = EventWait(driver, Assignment.WAIT_TIME)
                 wait.until(
                     expect.visibility_of_element_located(
-                        (By.XPATH, '//button[contains(@class,"ok")]')
+                        LOCATORS.get('plan.confirm')
                     )
                 ).click()
             except:
                 pass
         elif status == self.DELETE:
-            print('Deleting assignment')
+            LOG.info(self, 'Deleting assignment')
             time.sleep(1)
-            element = driver.find_element(
-                By.XPATH,
-                '//button[contains(text(),"Delete")]'
-            ).click()
-            wait = WebDriverWait(driver, Assignment.WAIT_TIME)
+            cache.click(LOCATORS.get('plan.delete'))
+            wait = EventWait(driver, Assignment.WAIT_TIME)
             wait.until(
                 expect.visibility_of_element_located(
-                    (By.XPATH, '//button[contains(@class,"ok")]')
+                    LOCATORS.get('plan.confirm')
                 )
             ).click()
 
     def open_chapter_list(self, driver, chapter):
         """Open the reading chapter list."""
         data_chapter = driver.find_element(
-            By.XPATH,
-            '//div[@data-chapter-section="%s"]/a' % chapter
-        )
+            *LOCATORS.get('reading.chapter', chapter=chapter))
         if (data_chapter.get_attribute('aria-expanded')) == 'false':
             data_chapter.click()
 
@@ -455,33 +455,30 @@ class Assignment(object):
         """Select the sections and chapters."""
         for section in chapters:
             if 'ch' in section:  # select the whole chapter
-                print('Adding chapter: ' + section)
+                LOG.debug(self, 'Adding chapter: %s', section)
                 chapter = driver.find_element(
-                    By.XPATH,
-                    '//div[@data-chapter-section="%s"]' % section[2:] +
-                    '//i[contains(@class,"tutor-icon")]'
-                )
+                    *LOCATORS.get('reading.chapter_checkbox',
+                                  chapter=section[2:]))
                 time.sleep(0.5)
                 if not chapter.is_selected():
                     chapter.click()
             elif 'tutor' in section:
                 continue
             else:  # select an individual section
-                print('Adding section: ' + section)
+                LOG.debug(self, 'Adding section: %s', section)
                 self.open_chapter_list(driver, section.split('.')[0])
                 time.sleep(0.5)
-                wait = WebDriverWait(driver, Assignment.WAIT_TIME)
+                wait = EventWait(driver, Assignment.WAIT_TIME)
                 marked = wait.until(
-                    expect.visibility_of_element_located((
-                        By.XPATH,
-                        ('//span[contains(@data-chapter-section' +
-                         ',"{0}") and text()="{0}"]').format(section) +
-                        '/preceding-sibling::span/input'
-                    ))
+                    expect.visibility_of_element_located(
+                        LOCATORS.get('reading.section_checkbox',
+                                     section=section)
+                    )
                 )
                 if not marked.is_selected():
                     marked.click()
 
+    @capture_on_failure
     def add_new_reading(self, driver, title, description, periods, readings,
                         status, break_point=None):
         """Add a new reading assignment.
@@ -498,87 +495,73 @@ class Assignment(object):
                                  'ch'
         status:      string    - 'publish', 'cancel', or 'draft'
         """
-        print('Creating a new Reading')
+        LOG.info(self, 'Creating a new Reading')
         self.open_assignment_menu(driver)
         driver.find_element(By.LINK_TEXT, 'Add Reading').click()
         time.sleep(1)
-        wait = WebDriverWait(driver, Assignment.WAIT_TIME * 3)
-        wait.until(
-            expect.element_to_be_clickable(
-                (By.ID, 'reading-title')
-            )
-        )
+        wait = EventWait(driver, Assignment.WAIT_TIME * 3)
+        wait.until(expect.element_to_be_clickable(LOCATORS.get('plan.title')))
         if break_point == Assignment.BEFORE_TITLE:
-            print('Break BEFORE_TITLE')
+            LOG.debug(self, 'Break BEFORE_TITLE')
             return
-        print('Enter the title')
-        driver.find_element(By.ID, 'reading-title').send_keys(title)
+        LOG.debug(self, 'Enter the title')
+        driver.find_element(*LOCATORS.get('plan.title')).send_keys(title)
         if break_point == Assignment.BEFORE_DESCRIPTION:
-            print('Break BEFORE_DESCRIPTION')
+            LOG.debug(self, 'Break BEFORE_DESCRIPTION')
             return
-        print('Enter the description')
-        driver.find_element(
-            By.XPATH,
-            '//div[contains(@class,"assignment-description")]//textarea' +
-            '[contains(@class,"form-control")]'). \
+        LOG.debug(self, 'Enter the description')
+        driver.find_element(*LOCATORS.get('plan.description')). \
             send_keys(description)
         if break_point == Assignment.BEFORE_PERIOD:
-            print('Break BEFORE_PERIOD')
+            LOG.debug(self, 'Break BEFORE_PERIOD')
             return
-        print('Assign periods')
+        LOG.debug(self, 'Assign periods')
         self.assign_periods(driver, periods)
         # add reading sections to the assignment
-        print('Set reading section list')
-        driver.find_element(By.ID, 'reading-select').click()
+        LOG.debug(self, 'Set reading section list')
+        driver.find_element(*LOCATORS.get('reading.select')).click()
         wait.until(
             expect.visibility_of_element_located(
-                (By.XPATH, '//div[contains(@class,"reading-plan")]')
+                LOCATORS.get('reading.plan')
             )
         )
         if break_point == Assignment.BEFORE_SECTION_SELECT:
-            print('Break BEFORE_SECTION_SELECT')
+            LOG.debug(self, 'Break BEFORE_SECTION_SELECT')
             return
         self.select_sections(driver, readings)
         if break_point == Assignment.BEFORE_READING_SELECT:
-            print('Break BEFORE_READING_SELECT')
+            LOG.debug(self, 'Break BEFORE_READING_SELECT')
             return
-        driver.find_element(By.XPATH,
-                            '//button[text()="Add Readings"]').click()
+        driver.find_element(*LOCATORS.get('reading.add')).click()
         wait.until(
-            expect.visibility_of_element_located(
-                (By.XPATH, '//button[contains(@class,"-publish")]')
-            )
+            expect.visibility_of_element_located(LOCATORS.get('plan.publish'))
         )
         if break_point == Assignment.BEFORE_STATUS_SELECT:
-            print('Break BEFORE_STATUS_SELECT')
+            LOG.debug(self, 'Break BEFORE_STATUS_SELECT')
             return
-        print('Set assignment status: %s' % status)
+        LOG.debug(self, 'Set assignment status: %s', status)
         self.select_status(driver, status)
 
     def find_all_questions(self, driver, problems):
         """Final all available questions."""
         questions = {}
         section = ''
-        wait = WebDriverWait(driver, 5)
+        wait = EventWait(driver, 5)
         try:
             loading = wait.until(
                 expect.visibility_of_element_located(
-                    (By.XPATH, '//span[text()="Loading..."]')
+                    LOCATORS.get('homework.loading')
                 )
             )
             wait.until(expect.staleness_of(loading))
         except:
             pass
-        rows = driver.find_elements(
-            By.XPATH,
-            '//div[contains(@class,"exercise-sections")]')
+        rows = LOCATORS.find_all(driver, 'homework.sections')
         for row in rows:
-            children = row.find_elements(
-                By.XPATH,
-                './/div[@class="exercises"]//span[contains(text(),"ID:")]')
-            section = row.find_element(
-                By.XPATH,
-                './label/span[@class="chapter-section"]').text
+            children = LOCATORS.find_all(driver, 'homework.section_ids',
+                                         root=row)
+            section = LOCATORS.find(driver, 'homework.section_name',
+                                    root=row).text
 
             if len(children) == 0:
                 # print('FAQ - No children tags')
@@ -602,59 +585,45 @@ class Assignment(object):
 
     def set_tutor_selections(self, driver, problems):
         """Select the number of Tutor selected problems."""
-        tutor_picks = driver.find_element(
-            By.XPATH, '//div[@class="tutor-selections"]//h2')
-        current = int(tutor_picks.text)
-        change = int(problems['tutor']) - current
-        if change != 0:
-            increase = driver.find_element(
-                By.XPATH,
-                '//div[@class="tutor-selections"]' +
-                '//button[contains(@class,"-move-exercise-down")]'
-            )
-            decrease = driver.find_element(
-                By.XPATH,
-                '//div[@class="tutor-selections"]' +
-                '//button[contains(@class,"-move-exercise-up")]'
-            )
-            while change < 0:
-                change += 1
-                increase.click()
-            while change > 0:
-                change -= 1
-                decrease.click()
+        runtime = Runtime.for_driver(driver)
+        current = runtime.snapshot(
+            {'count': LOCATORS.get('homework.tutor_count')})['count']
+        if current is None:
+            raise NoSuchElementException('Tutor selection count not found')
+        change = int(problems['tutor']) - int(current)
+        if change < 0:
+            runtime.click(LOCATORS.get('homework.tutor_more'), -change)
+        elif change > 0:
+            runtime.click(LOCATORS.get('homework.tutor_fewer'), change)
 
     def add_homework_problems(self, driver, problems):
         """Add assessments to a homework."""
-        wait = WebDriverWait(driver, Assignment.WAIT_TIME)
-        driver.find_element(By.ID, 'problems-select').click()
+        wait = EventWait(driver, Assignment.WAIT_TIME)
+        driver.find_element(*LOCATORS.get('homework.select')).click()
         wait.until(
             expect.visibility_of_element_located(
-                (By.XPATH,
-                 '//div[@class="homework-plan-exercise-select-topics"]')
+                LOCATORS.get('homework.topics')
             )
         )
         self.select_sections(driver, list(problems.keys()))
         driver.execute_script(
             "window.scrollTo(0, document.body.scrollHeight);"
         )
-        driver.find_element(
-            By.XPATH, '//button[contains(@class,"-show-problems")]'
-        ).click()
+        driver.find_element(*LOCATORS.get('homework.show_problems')).click()
         all_available = self.find_all_questions(driver, problems)
         using = []
-        # print('AHP - Selection list: %s' % selections)
         for section in problems:
             if problems is None or str(problems).lower() == 'none':
-                print('%s: No exercises (%s)' % (section, problems[section]))
+                LOG.debug(self, '%s: No exercises (%s)',
+                          section, problems[section])
                 continue
             # Set maximum Tutor-selected problems
             if section == 'tutor':
-                print('Using %s Tutor selections' % problems[section])
+                LOG.debug(self, 'Using %s Tutor selections', problems[section])
                 self.set_tutor_selections(driver, problems)
             # Select all exercises in the section
             elif problems[section] == 'all':
-                print('Selecting all from %s' % section)
+                LOG.debug(self, 'Selecting all from %s', section)
                 available = self.get_chapter_list(all_available, section) if \
                     'ch' in section else all_available[section]
                 for ex in available:
@@ -663,8 +632,8 @@ class Assignment(object):
             elif type(problems[section]) == tuple:
                 low, high = problems[section]
                 total = random.randint(int(low), int(high))
-                print('Selecting %s random from %s (%s to %s)' %
-                      (total, section, low, high))
+                LOG.debug(self, 'Selecting %s random from %s (%s to %s)',
+                          total, section, low, high)
                 available = self.get_chapter_list(all_available, section) if \
                     'ch' in section else all_available[section]
                 for _ in range(total):
@@ -673,23 +642,22 @@ class Assignment(object):
                     available.remove(available[ex])
             # Select the first X exercises from the section
             elif type(problems[section]) == int:
-                print('Selecting first %s from %s' %
-                      (problems[section], section))
+                LOG.debug(self, 'Selecting first %s from %s',
+                          problems[section], section)
                 available = self.get_chapter_list(all_available, section) if \
                     'ch' in section else all_available[section]
                 for position in range(problems[section]):
                     using.append(available[position])
             elif type(problems[section]) == list:
-                print('Adding %s custom if available' % len(problems[section]))
+                LOG.debug(self, 'Adding %s custom if available',
+                          len(problems[section]))
                 for ex in problems[section]:
                     for section in all_available:
                         if ex in all_available[section]:
                             using.append(ex)
         for exercise in set(using):
             add_button = driver.find_element(
-                By.XPATH,
-                '//span[contains(text(),"%s")]' % exercise +
-                '/../../div[@class="controls-overlay"]')
+                *LOCATORS.get('homework.add_exercise', exercise=exercise))
             Assignment.scroll_to(driver, add_button)
             ac = ActionChains(driver)
             time.sleep(0.5)
@@ -699,11 +667,10 @@ class Assignment(object):
             ac.click()
             ac.perform()
         wait.until(
-            expect.visibility_of_element_located(
-                (By.XPATH, '//*[text()="Next"]')
-            )
+            expect.visibility_of_element_located(LOCATORS.get('homework.next'))
         ).click()
 
+    @capture_on_failure
     def add_new_homework(self, driver, title, description, periods, problems,
                          status, feedback, break_point=None):
         """Add a new homework assignment.
@@ -728,24 +695,19 @@ class Assignment(object):
         status:      string    - 'publish', 'cancel', or 'draft'
         feedback:    string    - 'immediate', 'non-immediate'
         """
-        print('Creating a new Homework')
+        LOG.info(self, 'Creating a new Homework')
         self.open_assignment_menu(driver)
         driver.find_element(By.LINK_TEXT, 'Add Homework').click()
-        wait = WebDriverWait(driver, Assignment.WAIT_TIME)
+        wait = EventWait(driver, Assignment.WAIT_TIME)
         wait.until(
-            expect.visibility_of_element_located(
-                (By.XPATH, '//div[contains(@class,"homework-plan")]')
-            )
+            expect.visibility_of_element_located(LOCATORS.get('homework.plan'))
         )
         if break_point == Assignment.BEFORE_TITLE:
             return
-        driver.find_element(By.ID, 'reading-title').send_keys(title)
+        driver.find_element(*LOCATORS.get('plan.title')).send_keys(title)
         if break_point == Assignment.BEFORE_DESCRIPTION:
             return
-        driver.find_element(
-            By.XPATH,
-            '//div[contains(@class,"assignment-description")]' +
-            '//textarea[contains(@class,"form-control")]'). \
+        driver.find_element(*LOCATORS.get('plan.description')). \
             send_keys(description)
         if break_point == Assignment.BEFORE_PERIOD:
             return
@@ -753,20 +715,22 @@ class Assignment(object):
         if break_point == Assignment.BEFORE_EXERCISE_SELECT:
             return
         self.add_homework_problems(driver, problems)
-        feedback = driver.find_element(By.ID, 'feedback-select')
+        feedback = driver.find_element(*LOCATORS.get('plan.feedback'))
         Assignment.scroll_to(driver, feedback)
         feedback.click()
         if feedback == 'immediate':
             driver.find_element(
-                By.XPATH,
-                '//option[@value="immediate"]'
+                *LOCATORS.get('plan.feedback_option', value='immediate')
             ).click()
         else:
-            driver.find_element(By.XPATH, '//option[@value="due_at"]').click()
+            driver.find_element(
+                *LOCATORS.get('plan.feedback_option', value='due_at')
+            ).click()
         if break_point == Assignment.BEFORE_STATUS_SELECT:
             return
         self.select_status(driver, status)
 
+    @capture_on_failure
     def add_new_external(self, driver, title, description, periods,
                          assignment_url, status, break_point=None):
         """Add a new external assignment.
@@ -781,41 +745,34 @@ class Assignment(object):
         assignment_url:    string      - website name
         status:      string    - 'publish', 'cancel', or 'draft'
         """
-        print('Creating a new External Assignment')
+        LOG.info(self, 'Creating a new External Assignment')
         self.open_assignment_menu(driver)
         driver.find_element(By.LINK_TEXT, 'Add External Assignment').click()
         time.sleep(1)
-        wait = WebDriverWait(driver, Assignment.WAIT_TIME * 3)
-        wait.until(
-            expect.element_to_be_clickable(
-                (By.ID, 'reading-title')
-            )
-        )
+        wait = EventWait(driver, Assignment.WAIT_TIME * 3)
+        wait.until(expect.element_to_be_clickable(LOCATORS.get('plan.title')))
         if break_point == Assignment.BEFORE_TITLE:
             return
-        driver.find_element(By.ID, 'reading-title').send_keys(title)
+        driver.find_element(*LOCATORS.get('plan.title')).send_keys(title)
         if break_point == Assignment.BEFORE_DESCRIPTION:
             return
-        driver.find_element(
-            By.XPATH,
-            '//div[contains(@class,"assignment-description")]//textarea' +
-            '[contains(@class,"form-control")]'). \
+        driver.find_element(*LOCATORS.get('plan.description')). \
             send_keys(description)
         if break_point == Assignment.BEFORE_PERIOD:
             return
         self.assign_periods(driver, periods)
         if break_point == Assignment.BEFORE_URL:
             return
-        driver.find_element(By.ID, 'external-url').send_keys(assignment_url)
+        driver.find_element(*LOCATORS.get('plan.external_url')). \
+            send_keys(assignment_url)
         wait.until(
-            expect.visibility_of_element_located(
-                (By.XPATH, '//button[contains(@class,"-publish")]')
-            )
+            expect.visibility_of_element_located(LOCATORS.get('plan.publish'))
         )
         if break_point == Assignment.BEFORE_STATUS_SELECT:
             return
         self.select_status(driver, status)
 
+    @capture_on_failure
     def add_new_event(self, driver, title, description, periods, status,
                       break_point=None):
         """Add a new external assignment.
@@ -829,33 +786,24 @@ class Assignment(object):
                                           date format is 'MM/DD/YYYY'
         status:      string    - 'publish', 'cancel', or 'draft'
         """
-        print('Creating a new Event')
+        LOG.info(self, 'Creating a new Event')
         self.open_assignment_menu(driver)
         driver.find_element(By.LINK_TEXT, 'Add Event').click()
         time.sleep(1)
-        wait = WebDriverWait(driver, Assignment.WAIT_TIME * 3)
-        wait.until(
-            expect.element_to_be_clickable(
-                (By.ID, 'reading-title')
-            )
-        )
+        wait = EventWait(driver, Assignment.WAIT_TIME * 3)
+        wait.until(expect.element_to_be_clickable(LOCATORS.get('plan.title')))
         if break_point == Assignment.BEFORE_TITLE:
             return
-        driver.find_element(By.ID, 'reading-title').send_keys(title)
+        driver.find_element(*LOCATORS.get('plan.title')).send_keys(title)
         if break_point == Assignment.BEFORE_DESCRIPTION:
             return
-        driver.find_element(
-            By.XPATH,
-            '//div[contains(@class,"assignment-description")]//textarea' +
-            '[contains(@class,"form-control")]'). \
+        driver.find_element(*LOCATORS.get('plan.description')). \
             send_keys(description)
         if break_point == Assignment.BEFORE_PERIOD:
             return
         self.assign_periods(driver, periods)
         wait.until(
-            expect.visibility_of_element_located(
-                (By.XPATH, '//button[contains(@class,"-publish")]')
-            )
+            expect.visibility_of_element_located(LOCATORS.get('plan.publish'))
         )
         if break_point == Assignment.BEFORE_STATUS_SELECT:
             return
@@ -880,60 +828,58 @@ class Assignment(object):
         """Edit an event."""
         raise NotImplementedError(inspect.currentframe().f_code.co_name)
 
+    def calendar_url(self, driver, periods):
+        """Return the calendar month URL holding the first period's due date.
+
+        Period values take the same forms as in assign_periods.
+        """
+        _, due = next(iter(normalize(periods).values()))
+        return '%s/month/%s' % (driver.current_url.rstrip('/'),
+                                due.date.isoformat())
+
+    @capture_on_failure
     def delete_reading(self, driver, title, description, periods, readings,
                        status):
         """Delete a reading assignment."""
-        wait = WebDriverWait(driver, Assignment.WAIT_TIME * 4)
+        wait = EventWait(driver, Assignment.WAIT_TIME * 4)
         wait.until(
             expect.visibility_of_element_located(
-                (By.XPATH, '//ul/a[contains(@class,"navbar-brand")]')
+                LOCATORS.get('calendar.home')
             )
         ).click()
-        due_date = ''
-        for period in periods:
-            _, due_date = periods[period]
-            break
-        url = driver.current_url.split('/')
-        print(url)
-        date = due_date.split('/')
-        temp = []
-        temp.append(date[2])
-        temp.append(date[0])
-        temp.append(date[1])
-        date = '-'.join(temp)
-        print(url)
-        url.append('month')
-        url.append(date)
-        print(url)
-        url = '/'.join(url)
-        print(url)
+        url = self.calendar_url(driver, periods)
+        LOG.debug(self, 'Open the calendar at %s', url)
         driver.get(url)
-        page = Page(driver, Assignment.WAIT_TIME)
-        page.wait_for_page_load()
+        wait.load()
         wait.until(
             expect.presence_of_element_located(
-                (By.XPATH, '//a[label[text()="%s"]]' % title)
+                LOCATORS.get('calendar.plan', title=title)
             )
         ).click()
+        self.confirm_delete(driver)
+
+    def confirm_delete(self, driver):
+        """Delete the plan open in the calendar modal or plan editor."""
+        wait = EventWait(driver, Assignment.WAIT_TIME * 4)
         time.sleep(0.3)
         try:
-            modal = driver.find_element(By.CLASS_NAME, '-edit-assignment')
+            modal = driver.find_element(*LOCATORS.get('calendar.edit_plan'))
             Assignment.scroll_to(driver, modal)
             modal.click()
         except:
             pass
-        page.wait_for_page_load()
+        wait.load()
         wait.until(
             expect.presence_of_element_located(
-                (By.CLASS_NAME, 'delete-link')
+                LOCATORS.get('plan.delete_link')
             )
         ).click()
         wait.until(
             expect.presence_of_element_located(
-                (By.XPATH, '//div[@class="controls"]/button[text()="Yes"]')
+                LOCATORS.get('plan.delete_confirm')
             )
         ).click()
-        page.wait_for_page_load()
+        wait.load()
 
     def delete_homework(self, driver, title, description, periods, problems,
                         feedback, status):
@@ -991,7 +937,7 @@ if __name__ == '__main__':
         send_keys(os.getenv('TEACHER_PASSWORD'))
     driver.find_element(By.CSS_SELECTOR, 'input.primary').click()
     print('Select a course')
-    WebDriverWait(driver, 20).until(
+    EventWait(driver, 20).until(
             expect.element_to_be_clickable(
                 (
                     By.XPATH, '//div[@data-%s="%s"]//a' %
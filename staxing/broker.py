@@ -0,0 +1,211 @@
+"""Rate-limited, retrying creation of remote WebDriver sessions.
+
+Configuration comes from the environment:
+    STAXING_REMOTE_SLOTS  concurrent remote sessions allowed across every
+                          process on the host (default 5)
+    STAXING_LOCK_DIR      directory holding the slot lock files
+"""
+
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+try:
+    from staxing.latency import LatencyRecorder
+except ImportError:
+    from latency import LatencyRecorder
+
+__version__ = '0.0.1'
+
+QUOTA_ERROR = re.compile(r'concurren|parallel|quota|rate limit|too many|'
+                         r'429|no available|capacity', re.IGNORECASE)
+
+
+class FileSemaphore(object):
+    """Counting semaphore shared by processes through lock files.
+
+    Each slot is a file locked with flock; a crashed holder's lock is
+    released by the operating system. Without fcntl the semaphore only
+    covers the current process.
+    """
+
+    _local = {}
+    _guard = threading.Lock()
+
+    def __init__(self, directory, slots, poll=0.2):
+        """Semaphore constructor."""
+        if slots < 1:
+            raise ValueError('A semaphore needs at least one slot.')
+        self.directory = directory
+        self.slots = slots
+        self.poll = poll
+        os.makedirs(directory, exist_ok=True)
+        with FileSemaphore._guard:
+            self.fallback = FileSemaphore._local.setdefault(
+                (directory, slots), threading.BoundedSemaphore(slots))
+
+    def _try(self, slot):
+        """Return an open, locked file for a slot or None."""
+        handle = open(os.path.join(self.directory, 'slot-%s.lock' % slot),
+                      'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return handle
+        except (IOError, OSError):
+            handle.close()
+            return None
+
+    def acquire(self, timeout=None):
+        """Block until a slot is free and return its token."""
+        deadline = time.monotonic() + timeout if timeout else None
+        if fcntl is None:
+            # a semaphore waits forever on None; -1 would not wait at all
+            if not self.fallback.acquire(timeout=timeout if timeout
+                                         else None):
+                raise TimeoutError('No remote session slot free')
+            return None
+        while True:
+            for slot in random.sample(range(self.slots), self.slots):
+                handle = self._try(slot)
+                if handle is not None:
+                    return handle
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError('No remote session slot free')
+            time.sleep(self.poll)
+
+    def release(self, token):
+        """Free a slot."""
+        if token is None:
+            self.fallback.release()
+            return
+        try:
+            fcntl.flock(token, fcntl.LOCK_UN)
+        finally:
+            token.close()
+
+
+class SessionBroker(object):
+    """Queue, create and retry remote sessions within a concurrency cap.
+
+    slots (int): concurrent sessions across processes
+    lock_dir (string): directory for the shared slot locks
+    retries (int): attempts after a quota or capacity error
+    backoff (float): first retry delay in seconds, doubled per attempt
+    max_backoff (float): longest retry delay
+    factory: callable(**kwargs) creating the driver; webdriver.Remote
+    """
+
+    def __init__(self, slots=5, lock_dir=None, retries=5, backoff=2.0,
+                 max_backoff=60.0, factory=None, wait_timeout=None):
+        """Broker constructor."""
+        lock_dir = lock_dir if lock_dir else \
+            os.path.join(tempfile.gettempdir(), 'staxing-remote')
+        self.semaphore = FileSemaphore(lock_dir, slots)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.factory = factory if factory else webdriver.Remote
+        self.wait_timeout = wait_timeout
+        self.latency = LatencyRecorder()
+        self.attempts = 0
+        self.quota_errors = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, **kwargs):
+        """Build a broker from STAXING_REMOTE_SLOTS and STAXING_LOCK_DIR."""
+        kwargs.setdefault('slots', int(os.getenv('STAXING_REMOTE_SLOTS', 5)))
+        kwargs.setdefault('lock_dir', os.getenv('STAXING_LOCK_DIR'))
+        return cls(**kwargs)
+
+    def delay(self, attempt):
+        """Return the jittered backoff before a retry."""
+        return min(self.max_backoff, self.backoff * 2 ** attempt) * \
+            random.uniform(0.5, 1.0)
+
+    def create(self, **kwargs):
+        """Return a new remote driver holding a slot until it quits."""
+        with self.latency.time('queue'):
+            token = self.semaphore.acquire(self.wait_timeout)
+        try:
+            driver = self._create(kwargs)
+        except Exception:
+            self.semaphore.release(token)
+            raise
+        self._hold(driver, token)
+        return driver
+
+    def _create(self, kwargs):
+        """Create a session, backing off on quota errors."""
+        attempt = 0
+        start = time.perf_counter()
+        while True:
+            with self.lock:
+                self.attempts += 1
+            try:
+                with self.latency.time('attempt'):
+                    driver = self.factory(**kwargs)
+                self.latency.record('create', time.perf_counter() - start)
+                return driver
+            except WebDriverException as err:
+                if not QUOTA_ERROR.search(str(err)) or \
+                        attempt >= self.retries:
+                    raise
+                with self.lock:
+                    self.quota_errors += 1
+                pause = self.delay(attempt)
+                LOG.warning(self, 'Remote quota reached; retry %s in %.1fs',
+                            attempt + 1, pause, error=str(err).strip())
+                time.sleep(pause)
+                attempt += 1
+
+    def _hold(self, driver, token):
+        """Release the slot when the driver quits."""
+        original = driver.quit
+        released = []
+
+        def quit():
+            try:
+                original()
+            finally:
+                if not released:
+                    released.append(True)
+                    self.semaphore.release(token)
+
+        driver.quit = quit
+
+    def summary(self):
+        """Return attempt counts and queue/creation latency."""
+        return {
+            'attempts': self.attempts,
+            'quota_errors': self.quota_errors,
+            'latency': self.latency.summary(),
+        }
+
+
+BROKER = None
+_BROKER_LOCK = threading.Lock()
+
+
+def broker():
+    """Return the shared broker, created from the environment on first use."""
+    global BROKER
+    with _BROKER_LOCK:
+        if BROKER is None:
+            BROKER = SessionBroker.from_environment()
+    return BROKER
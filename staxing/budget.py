@@ -0,0 +1,245 @@
+"""Performance budgets for Tutor routes.
+
+A budget file holds one rule per line, a route pattern followed by limits:
+
+    # pattern                     limits
+    *                             dom<3s load<6s requests<150
+    /course/:id/t/calendar*       dom<2s kb<1500 long_tasks<=5
+
+Patterns are shell-style globs over the routes PageMetrics reports. Every
+matching rule applies; a later rule overrides an earlier limit on the
+same metric. Metrics: ttfb, dom, load (times; ms or s), kb (transferred
+size; B, KB or MB) and requests and long_tasks (counts).
+
+Usage:
+    python -m staxing.budget check <metrics.json> <budget file>
+    python -m staxing.budget update <metrics.json> <budget file> [headroom]
+"""
+
+import fnmatch
+import json
+import math
+import re
+import sys
+
+from collections import namedtuple
+
+__version__ = '0.0.1'
+
+LIMIT = re.compile(r'^([a-z_]+)(<=?)([\d.]+)([a-z]*)$', re.IGNORECASE)
+METRICS = {
+    'ttfb': 'ttfb',
+    'dom': 'dom_content_loaded',
+    'dom_content_loaded': 'dom_content_loaded',
+    'load': 'load',
+    'kb': 'kilobytes',
+    'bytes': 'kilobytes',
+    'kilobytes': 'kilobytes',
+    'requests': 'requests',
+    'long_tasks': 'long_tasks',
+}
+TIMES = ('ttfb', 'dom_content_loaded', 'load')
+UNITS = {
+    '': 1.0, 's': 1.0, 'ms': 0.001,
+    'b': 1 / 1024.0, 'kb': 1.0, 'mb': 1024.0,
+}
+SHORT = {'dom_content_loaded': 'dom', 'kilobytes': 'kb'}
+
+Violation = namedtuple('Violation', ['route', 'metric', 'value', 'limit'])
+
+
+class BudgetExceeded(AssertionError):
+    """Raised when captured page metrics break the performance budget."""
+
+    def __init__(self, violations):
+        """Exception initializer."""
+        self.violations = list(violations)
+        super(BudgetExceeded, self).__init__(
+            'Performance budget exceeded:\n' + '\n'.join(
+                '  %s %s=%s (limit %s)' % violation
+                for violation in self.violations))
+
+
+def sample_values(sample):
+    """Return budget metrics from a raw PageMetrics sample."""
+    values = {
+        'kilobytes': round((sample.get('bytes') or 0) / 1024.0, 1),
+        'requests': sample.get('resources') or 0,
+        'long_tasks': sample.get('long_tasks') or 0,
+    }
+    for step in TIMES:
+        value = (sample.get('timing') or {}).get(step)
+        if value:
+            values[step] = value / 1000.0
+    return values
+
+
+def summary_values(route_summary):
+    """Return budget metrics from one route of PageMetrics.summary().
+
+    Times use the 90th percentile; sizes and counts the mean per visit.
+    """
+    visits = route_summary.get('visits') or 1
+    values = {
+        'kilobytes': round(route_summary.get('kilobytes', 0) / visits, 1),
+        'requests': route_summary.get('resources', 0) / visits,
+        'long_tasks': route_summary.get('long_tasks', 0) / visits,
+    }
+    for step in TIMES:
+        timing = route_summary.get('timing', {}).get(step)
+        if timing and timing.get('p90') is not None:
+            values[step] = timing['p90']
+    return values
+
+
+class Budget(object):
+    """Ordered route pattern rules with metric limits."""
+
+    def __init__(self, rules=None):
+        """Budget constructor.
+
+        rules ([(string, dict)]): (route pattern, {metric: limit}) pairs;
+            limits use seconds, kilobytes and counts
+        """
+        self.rules = []
+        for pattern, limits in rules or []:
+            self.add(pattern, **limits)
+
+    def add(self, pattern, **limits):
+        """Append a rule; metric names may use the short forms."""
+        rule = {}
+        for metric, limit in limits.items():
+            if metric not in METRICS:
+                raise ValueError('Unknown budget metric: %s' % metric)
+            rule[METRICS[metric]] = float(limit)
+        self.rules.append((pattern, rule))
+        return self
+
+    @classmethod
+    def parse(cls, text):
+        """Build a budget from the line format."""
+        budget = cls()
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            pattern, *limits = line.split()
+            rule = {}
+            for limit in limits:
+                match = LIMIT.match(limit)
+                unit = match.group(4).lower() if match else None
+                if not match or unit not in UNITS or \
+                        match.group(1).lower() not in METRICS:
+                    raise ValueError('Line %s: bad limit "%s"' %
+                                     (number, limit))
+                rule[match.group(1).lower()] = \
+                    float(match.group(3)) * UNITS[unit]
+            budget.add(pattern, **rule)
+        return budget
+
+    @classmethod
+    def load(cls, path):
+        """Read a budget file."""
+        with open(path) as budget:
+            return cls.parse(budget.read())
+
+    def dump(self):
+        """Return the budget in the line format."""
+        lines = []
+        width = max([len(pattern) for pattern, _ in self.rules] + [1])
+        for pattern, rule in self.rules:
+            limits = []
+            for metric, limit in sorted(rule.items()):
+                if metric in TIMES:
+                    text = '%dms' % int(math.ceil(limit * 1000))
+                else:
+                    text = '%d' % int(math.ceil(limit))
+                limits.append('%s<%s' % (SHORT.get(metric, metric), text))
+            lines.append('%s  %s' % (pattern.ljust(width), ' '.join(limits)))
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path):
+        """Write the budget file and return its path."""
+        with open(path, 'w') as budget:
+            budget.write(self.dump())
+        return path
+
+    def limits(self, route):
+        """Return the limits that apply to a route."""
+        merged = {}
+        for pattern, rule in self.rules:
+            if fnmatch.fnmatchcase(route, pattern):
+                merged.update(rule)
+        return merged
+
+    def check(self, route, values):
+        """Return the violations of a route's metric values."""
+        return [Violation(route, metric, round(values[metric], 3), limit)
+                for metric, limit in sorted(self.limits(route).items())
+                if values.get(metric) is not None and
+                values[metric] > limit]
+
+    def check_sample(self, route, sample):
+        """Return the violations of one raw navigation sample."""
+        return self.check(route, sample_values(sample))
+
+    def check_summary(self, summary):
+        """Return the violations of a PageMetrics summary."""
+        violations = []
+        for route, route_summary in sorted(summary.items()):
+            violations += self.check(route, summary_values(route_summary))
+        return violations
+
+    def report(self, summary):
+        """Return per route values against limits for a summary."""
+        routes = {}
+        for route, route_summary in sorted(summary.items()):
+            values = summary_values(route_summary)
+            routes[route] = {
+                metric: {'value': values.get(metric), 'limit': limit,
+                         'ok': values.get(metric) is None or
+                         values[metric] <= limit}
+                for metric, limit in self.limits(route).items()
+            }
+        violations = self.check_summary(summary)
+        return {'passed': not violations,
+                'violations': [violation._asdict()
+                               for violation in violations],
+                'routes': routes}
+
+    @classmethod
+    def baseline(cls, summary, headroom=1.2):
+        """Return a budget allowing headroom over observed metrics."""
+        budget = cls()
+        for route, route_summary in sorted(summary.items()):
+            values = summary_values(route_summary)
+            budget.add(route, **{metric: value * headroom
+                                 for metric, value in values.items()
+                                 if value})
+        return budget
+
+
+def main(argv):
+    """Check a metrics summary against a budget or rewrite the budget."""
+    if len(argv) < 3 or argv[0] not in ('check', 'update'):
+        print(__doc__)
+        return 2
+    with open(argv[1]) as metrics:
+        summary = json.load(metrics)
+    if argv[0] == 'update':
+        headroom = float(argv[3]) if len(argv) > 3 else 1.2
+        Budget.baseline(summary, headroom).save(argv[2])
+        print('Baseline for %s routes written to %s' %
+              (len(summary), argv[2]))
+        return 0
+    report = Budget.load(argv[2]).report(summary)
+    for violation in report['violations']:
+        print('FAIL %(route)s %(metric)s=%(value)s (limit %(limit)s)' %
+              violation)
+    print('%s routes, %s violations' % (len(summary),
+                                        len(report['violations'])))
+    return 0 if report['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
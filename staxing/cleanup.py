@@ -0,0 +1,253 @@
+"""Bulk removal of course plans for test teardown."""
+
+import datetime
+import re
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as expect
+
+try:
+    from staxing.assignment import Assignment
+except ImportError:
+    from assignment import Assignment
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+try:
+    from staxing.event_wait import EventWait
+except ImportError:
+    from event_wait import EventWait
+try:
+    from staxing.locators import LOCATORS
+except ImportError:
+    from locators import LOCATORS
+try:
+    from staxing.tutor_api import AssignmentAPI, parse_date
+except ImportError:
+    from tutor_api import AssignmentAPI, parse_date
+
+__version__ = '0.0.2'
+
+# seconds to wait for plans on a calendar month that may have none
+PLAN_WAIT = 5
+
+# every labelled plan link on a calendar month, with the day it is shown
+# on when the plan or its day cell carries one, read in one round trip
+CALENDAR_PLANS = '''
+var plans = [];
+var links = document.querySelectorAll('a');
+for (var i = 0; i < links.length; i++) {
+    var label = links[i].querySelector('label');
+    if (!label) { continue; }
+    var day = links[i].closest('[data-date]');
+    plans.push({
+        title: label.textContent.trim(),
+        href: links[i].href,
+        type: links[i].getAttribute('data-assignment-type') ||
+            links[i].className,
+        date: day ? day.getAttribute('data-date') : null
+    });
+}
+return plans;
+'''
+PLAN_ID = re.compile(r'/(?:plans?|readings|homeworks|externals|events)/'
+                     r'(\d+)')
+
+
+def calendar_day(value):
+    """Return the date of a calendar data-date value or None."""
+    try:
+        return datetime.datetime.strptime(value[:10], '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def whole_months(start, end):
+    """Return True if a date range starts and ends on month boundaries."""
+    start, end = parse_date(start), parse_date(end)
+    return start.day == 1 and \
+        (end + datetime.timedelta(days=1)).day == 1
+
+
+def months(start, end):
+    """Yield the first day of every month from start to end."""
+    month = parse_date(start).replace(day=1)
+    end = parse_date(end)
+    while month <= end:
+        yield month
+        month = (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+class CourseCleanup(object):
+    """List the plans in a date range and delete them in one batch.
+
+    With an API client (tutor_api.TutorAPI) plans are listed from the
+    dashboard endpoint and deleted over HTTP. Otherwise they are scraped
+    from the calendar, one script call per month, and deleted through the
+    plan editor spread across every logged-in driver given.
+
+    api (TutorAPI): client carrying the teacher's cookies
+    course_id (int): course whose plans are removed
+    drivers ([WebDriver]): logged-in teacher sessions for browser deletes
+    workers (int): concurrent API deletes
+    """
+
+    def __init__(self, api=None, course_id=None, drivers=None, workers=8):
+        """Cleanup constructor."""
+        if api is None and not drivers:
+            raise ValueError('Cleanup needs an API client or a driver.')
+        self.api = api
+        self.course_id = course_id
+        self.drivers = list(drivers) if drivers else []
+        self.workers = workers
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_teacher(cls, teacher, use_api=True, drivers=None, **kwargs):
+        """Build a cleanup for the course open in a Teacher's browser.
+
+        With use_api the teacher's API backend is shared if it has one;
+        otherwise a private one is built so the teacher keeps adding
+        assignments through the browser.
+        """
+        if use_api:
+            backend = teacher.assign.backend or AssignmentAPI.from_driver(
+                teacher.driver, base_url=teacher.url)
+            return cls(api=backend.api, course_id=backend.course_id,
+                       drivers=drivers, **kwargs)
+        return cls(drivers=[teacher.driver] + list(drivers or []), **kwargs)
+
+    def calendar_url(self, driver, month):
+        """Return the calendar URL for a month of the open course."""
+        base = re.sub(r'/month/.*$', '', driver.current_url.rstrip('/'))
+        return '%s/month/%s' % (base, month.isoformat())
+
+    def wait_for_calendar(self, driver):
+        """Wait for the calendar month and any plans it shows to render."""
+        EventWait(driver, Assignment.WAIT_TIME).until(
+            expect.presence_of_element_located(
+                LOCATORS.get('calendar.heading')))
+        try:
+            EventWait(driver, PLAN_WAIT).until(
+                expect.presence_of_element_located(
+                    LOCATORS.get('calendar.plans')))
+        except TimeoutException:
+            LOG.debug(self, 'No plans on %s', driver.current_url)
+
+    def scrape(self, driver, start, end):
+        """Return the distinct plans shown on the calendar in a range.
+
+        Plans are kept when any day they are shown on falls in the range,
+        as the API listing does. If the calendar gives no day for a plan,
+        only ranges of whole months can be listed; anything else raises
+        ValueError rather than return plans from outside the range.
+        """
+        first, last = parse_date(start), parse_date(end)
+        plans = {}
+        for month in months(start, end):
+            driver.get(self.calendar_url(driver, month))
+            self.wait_for_calendar(driver)
+            for shown in driver.execute_script(CALENDAR_PLANS):
+                plan = plans.get(shown['href'])
+                if plan is None:
+                    match = PLAN_ID.search(shown['href'])
+                    plan = plans[shown['href']] = dict(
+                        shown, id=int(match.group(1)) if match else None,
+                        days=set())
+                    del plan['date']
+                plan['days'].add(calendar_day(shown['date']))
+        listed = []
+        for plan in plans.values():
+            days = plan.pop('days')
+            if None in days:
+                if not whole_months(first, last):
+                    raise ValueError('The calendar shows no plan dates; list '
+                                     'whole months or use the API.')
+                listed.append(plan)
+            elif any(first <= day <= last for day in days):
+                listed.append(plan)
+        return listed
+
+    def list_plans(self, start, end, match=None):
+        """Return the plans between two dates whose titles match.
+
+        match: a regular expression for the title or a callable taking the
+            plan record; None keeps every plan
+        """
+        if self.api is not None:
+            plans = self.api.plans(self.course_id, start, end)
+        else:
+            plans = self.scrape(self.drivers[0], start, end)
+        if match is None:
+            return plans
+        if not callable(match):
+            pattern = re.compile(match)
+
+            def match(plan):
+                return pattern.search(plan['title'])
+        return [plan for plan in plans if match(plan)]
+
+    def _delete_with_api(self, plans, report):
+        """Delete plans over HTTP with a session per worker thread."""
+        local = threading.local()
+
+        def delete(plan):
+            if not hasattr(local, 'api'):
+                local.api = self.api.clone()
+            try:
+                local.api.delete_plan(plan['id'])
+                self._record(report, plan)
+            except Exception as err:
+                self._record(report, plan, err)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(delete, plans))
+
+    def _delete_in_browser(self, plans, report):
+        """Delete plans through the editor, one queue per driver."""
+        shares = [plans[index::len(self.drivers)]
+                  for index in range(len(self.drivers))]
+
+        def delete(driver, share):
+            assign = Assignment()
+            for plan in share:
+                try:
+                    driver.get(plan['href'])
+                    assign.confirm_delete(driver)
+                    self._record(report, plan)
+                except Exception as err:
+                    self._record(report, plan, err)
+
+        with ThreadPoolExecutor(max_workers=len(self.drivers)) as pool:
+            for driver, share in zip(self.drivers, shares):
+                pool.submit(delete, driver, share)
+
+    def _record(self, report, plan, error=None):
+        """Add one outcome to the report."""
+        with self.lock:
+            if error is None:
+                report['deleted'].append(plan)
+            else:
+                report['failed'].append((plan, repr(error)))
+
+    def delete(self, plans):
+        """Delete plans in one batch and return a report."""
+        start = time.monotonic()
+        report = {'found': len(plans), 'deleted': [], 'failed': []}
+        if self.api is not None:
+            self._delete_with_api(plans, report)
+        else:
+            self._delete_in_browser(plans, report)
+        report['elapsed'] = time.monotonic() - start
+        LOG.info(self, 'Deleted %s of %s plans in %.1fs',
+                 len(report['deleted']), len(plans), report['elapsed'],
+                 failed=len(report['failed']))
+        return report
+
+    def run(self, start, end, match=None):
+        """List and delete the matching plans between two dates."""
+        return self.delete(self.list_plans(start, end, match))
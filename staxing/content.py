@@ -0,0 +1,281 @@
+"""Concurrent HTTP crawler validating the pages of a CNX book."""
+
+import json
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+try:
+    from staxing.content_index import content_hash
+except ImportError:
+    from content_index import content_hash
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+
+__version__ = '0.0.1'
+
+
+class Page(object):
+    """One fetched book page handed to the checks."""
+
+    def __init__(self, entry, url, html):
+        """Page constructor."""
+        self.entry = entry
+        self.url = url
+        self.html = html
+        self.soup = BeautifulSoup(html, 'html.parser')
+        self.ids = set(node['id'] for node in self.soup.find_all(id=True))
+
+
+def issue(check, message, **detail):
+    """Return a report issue."""
+    found = {'check': check, 'message': message}
+    found.update(detail)
+    return found
+
+
+def broken_links(page, crawler):
+    """Report links to missing anchors or to URLs answering with errors."""
+    for link in page.soup.find_all('a', href=True):
+        href = link['href'].strip()
+        if href.startswith('#'):
+            if len(href) > 1 and href[1:] not in page.ids:
+                yield issue('broken_links', 'Missing anchor', href=href)
+            continue
+        target = urljoin(page.url, href)
+        if urlparse(target).scheme not in ('http', 'https'):
+            continue
+        status = crawler.status(target)
+        if status is None or status >= 400:
+            yield issue('broken_links', 'Link failed', href=target,
+                        status=status)
+
+
+def missing_images(page, crawler):
+    """Report images without a source or whose source does not load."""
+    for image in page.soup.find_all('img'):
+        source = (image.get('src') or '').strip()
+        if not source:
+            yield issue('missing_images', 'Image has no source',
+                        alt=image.get('alt'))
+            continue
+        if source.startswith('data:'):
+            continue
+        target = urljoin(page.url, source)
+        status = crawler.status(target)
+        if status is None or status >= 400:
+            yield issue('missing_images', 'Image failed', src=target,
+                        status=status)
+
+
+def empty_sections(page, crawler):
+    """Report pages and sections with neither text nor media."""
+    media = ('img', 'math', 'figure', 'table', 'iframe', 'video', 'object')
+    if not page.soup.get_text(strip=True) and not page.soup.find(media):
+        yield issue('empty_sections', 'Page has no content')
+        return
+    for section in page.soup.find_all('section'):
+        heading = section.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        text = section.get_text(' ', strip=True)
+        if heading is not None:
+            text = text.replace(heading.get_text(' ', strip=True), '', 1)
+        if not text.strip() and not section.find(media):
+            yield issue('empty_sections', 'Empty section',
+                        id=section.get('id'),
+                        heading=heading.get_text(' ', strip=True)
+                        if heading else None)
+
+
+def malformed_math(page, crawler):
+    """Report MathML errors, empty formulas and unrendered TeX."""
+    for formula in page.soup.find_all('math'):
+        if formula.find('merror') is not None:
+            yield issue('malformed_math', 'MathML error',
+                        text=formula.get_text(' ', strip=True)[:80])
+        elif not formula.find(True) and not formula.get_text(strip=True):
+            yield issue('malformed_math', 'Empty formula')
+    for text in page.soup.find_all(string=True):
+        if text.parent.name in ('script', 'style', 'annotation', 'code',
+                                'pre'):
+            continue
+        if '\\(' in text or '\\[' in text or '$$' in text:
+            yield issue('malformed_math', 'Unrendered TeX',
+                        text=text.strip()[:80])
+
+
+CHECKS = [broken_links, missing_images, empty_sections, malformed_math]
+
+
+class BookCrawler(object):
+    """Fetch every page of a book over HTTP and run checks on each.
+
+    Pages are requested from the archive by a bounded thread pool, each
+    thread keeping its own pooled session; link and image statuses are
+    shared so each URL is requested once per crawl. Results are written
+    as they complete, so memory stays flat for any book size.
+
+    With an index, pages are requested conditionally and only pages whose
+    content changed since the last crawl are checked again; unchanged
+    pages report their stored result.
+
+    toc (BookTOC): book reading order
+    checks ([callable]): check(page, crawler) yielding issue dictionaries
+    workers (int): concurrent requests
+    index (ContentIndex): page hashes and results from earlier crawls
+    """
+
+    def __init__(self, toc, checks=None, workers=16, timeout=30,
+                 session=None, index=None):
+        """Crawler constructor."""
+        self.toc = toc
+        self.checks = list(CHECKS if checks is None else checks)
+        self.signature = ','.join(check.__name__ for check in self.checks)
+        self.index = index
+        self.workers = workers
+        self.timeout = timeout
+        self.template = session if session is not None else toc.session
+        self.local = threading.local()
+        self.statuses = {}
+        self.lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Return this thread's pooled session."""
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.template.headers)
+            session.cookies.update(self.template.cookies)
+            adapter = HTTPAdapter(pool_connections=4,
+                                  pool_maxsize=self.workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self.local.session = session
+        return session
+
+    def status(self, url):
+        """Return the HTTP status of a URL, requesting it once per crawl."""
+        with self.lock:
+            known = self.statuses.get(url, False)
+            if known is False:
+                # other threads wait for this request instead of repeating it
+                self.statuses[url] = pending = threading.Event()
+        if known is not False:
+            if isinstance(known, threading.Event):
+                known.wait()
+                return self.statuses[url]
+            return known
+        status = None
+        try:
+            response = self.session.head(url, allow_redirects=True,
+                                         timeout=self.timeout)
+            if response.status_code in (403, 405, 501):
+                response = self.session.get(url, stream=True,
+                                            timeout=self.timeout)
+                response.close()
+            status = response.status_code
+        except requests.RequestException:
+            pass
+        finally:
+            # release the waiting threads even if the request raised
+            with self.lock:
+                self.statuses[url] = status
+            pending.set()
+        return status
+
+    def page_url(self, entry):
+        """Return the archive JSON URL of a page."""
+        return urljoin(self.toc.archive, 'contents/%s:%s.json' %
+                       (self.toc.book, entry.id))
+
+    def check(self, entry):
+        """Fetch one page and return its report line."""
+        start = time.perf_counter()
+        line = {'page': entry.id, 'number': entry.number,
+                'title': entry.title, 'url': entry.url, 'issues': []}
+        record = self.index.get(self.toc.book, entry.id) \
+            if self.index is not None else None
+        if record is not None and record['checks'] != self.signature:
+            record = None
+        try:
+            response = self.session.get(
+                self.page_url(entry), timeout=self.timeout,
+                headers=self.index.headers(record) if record else None)
+            line['status'] = response.status_code
+            if record is not None and response.status_code == 304:
+                line['issues'] = record['result']
+                line['unchanged'] = True
+                return self._finish(line, start)
+            response.raise_for_status()
+            html = response.json().get('content', '')
+            digest = content_hash(html)
+            if record is not None and digest == record['hash']:
+                line['issues'] = record['result']
+                line['unchanged'] = True
+            else:
+                page = Page(entry, entry.url, html)
+                for check in self.checks:
+                    line['issues'].extend(check(page, self))
+            if self.index is not None:
+                self.index.put(self.toc.book, entry.id, digest,
+                               response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'),
+                               self.signature, line['issues'])
+        except Exception as err:
+            line['error'] = repr(err)
+        return self._finish(line, start)
+
+    def _finish(self, line, start):
+        """Stamp a report line with its duration."""
+        line['seconds'] = round(time.perf_counter() - start, 3)
+        return line
+
+    def crawl(self):
+        """Yield report lines as pages finish, in completion order."""
+        entries = iter(self.toc.entries)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = set()
+            for entry in entries:
+                running.add(pool.submit(self.check, entry))
+                if len(running) >= self.workers * 2:
+                    break
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    following = next(entries, None)
+                    if following is not None:
+                        running.add(pool.submit(self.check, following))
+
+    def run(self, report=None):
+        """Crawl the book, writing JSON lines to report; return a summary."""
+        start = time.perf_counter()
+        summary = {'pages': 0, 'unchanged': 0, 'errors': 0, 'issues': {}}
+        stream = open(report, 'w') if report else None
+        try:
+            for line in self.crawl():
+                summary['pages'] += 1
+                summary['errors'] += 'error' in line
+                summary['unchanged'] += line.get('unchanged', False)
+                for found in line['issues']:
+                    summary['issues'][found['check']] = \
+                        summary['issues'].get(found['check'], 0) + 1
+                if stream is not None:
+                    stream.write(json.dumps(line, sort_keys=True) + '\n')
+        finally:
+            if stream is not None:
+                stream.close()
+        summary['urls_checked'] = len(self.statuses)
+        summary['elapsed'] = round(time.perf_counter() - start, 2)
+        LOG.info(self, 'Crawled %s pages of %s', summary['pages'],
+                 self.toc.book, elapsed=summary['elapsed'])
+        return summary
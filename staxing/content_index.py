@@ -0,0 +1,98 @@
+"""Local record of checked book pages for incremental content QA."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+__version__ = '0.0.1'
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS pages (
+        book TEXT NOT NULL,
+        page TEXT NOT NULL,
+        hash TEXT,
+        etag TEXT,
+        modified TEXT,
+        checks TEXT,
+        result TEXT,
+        checked REAL,
+        PRIMARY KEY (book, page)
+    )
+'''
+
+
+def content_hash(html):
+    """Return the digest identifying a page's content."""
+    return hashlib.sha1(html.encode('utf-8')).hexdigest()
+
+
+class ContentIndex(object):
+    """sqlite index of page hashes, validators and last check results.
+
+    Books are keyed without their version, so a republished book only
+    rechecks the pages whose content changed.
+
+    path (string): database file; ':memory:' keeps it for this process
+    """
+
+    def __init__(self, path):
+        """Index constructor."""
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(SCHEMA)
+
+    @staticmethod
+    def _book(book):
+        """Return the book id without its version."""
+        return book.split('@')[0]
+
+    def get(self, book, page):
+        """Return the stored record for a page or None."""
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT hash, etag, modified, checks, result, checked '
+                'FROM pages WHERE book = ? AND page = ?',
+                (self._book(book), page)).fetchone()
+        if row is None:
+            return None
+        return {'hash': row[0], 'etag': row[1], 'modified': row[2],
+                'checks': row[3], 'result': json.loads(row[4] or 'null'),
+                'checked': row[5]}
+
+    def headers(self, record):
+        """Return the conditional request headers for a stored record."""
+        headers = {}
+        if record is None:
+            return headers
+        if record['etag']:
+            headers['If-None-Match'] = record['etag']
+        if record['modified']:
+            headers['If-Modified-Since'] = record['modified']
+        return headers
+
+    def put(self, book, page, digest, etag, modified, checks, result):
+        """Store a page's hash, validators and check result."""
+        with self.lock, self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (self._book(book), page, digest, etag, modified, checks,
+                 json.dumps(result), time.time()))
+
+    def forget(self, book, page=None):
+        """Drop the records of a page or of a whole book."""
+        with self.lock, self.connection:
+            if page is None:
+                self.connection.execute('DELETE FROM pages WHERE book = ?',
+                                        (self._book(book),))
+            else:
+                self.connection.execute(
+                    'DELETE FROM pages WHERE book = ? AND page = ?',
+                    (self._book(book), page))
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
@@ -0,0 +1,102 @@
+"""Element handle cache scoped to the current page state."""
+
+from weakref import WeakKeyDictionary, ref
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+__version__ = '0.0.3'
+
+
+class ElementCache(object):
+    """Memoize element lookups by (locator, root) for one page generation.
+
+    There is one cache per WebDriver, shared by every helper on it. Entries
+    are kept per window handle set with focus() (TabScheduler does), so
+    switching tabs keeps each tab's handles. A window's handles are dropped
+    when its page changes (page_changed(), called by EventWait.load,
+    SeleniumWait and Helper.get) or the window is closed; every handle is
+    dropped by clear(), and one that raises
+    StaleElementReferenceException while used is refound.
+    """
+
+    _caches = WeakKeyDictionary()
+
+    def __init__(self, driver):
+        """Cache constructor."""
+        self._driver = ref(driver)
+        self.elements = {}
+        self.window = None
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def driver(self):
+        """Return the cached WebDriver."""
+        return self._driver()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Return the shared cache for a WebDriver, creating it if needed."""
+        cache = cls._caches.get(driver)
+        if cache is None:
+            cache = cls(driver)
+            cls._caches[driver] = cache
+        return cache
+
+    def _key(self, locator, root):
+        """Return the cache key for a locator within a root element."""
+        by, value = locator
+        return (self.window, by, value,
+                root.id if root is not None else None)
+
+    def focus(self, window):
+        """Look up and cache elements for the window now focused."""
+        self.window = window
+
+    def clear(self):
+        """Forget every cached element."""
+        self.elements.clear()
+
+    def drop_window(self, window):
+        """Forget the elements cached for one window."""
+        for key in [key for key in self.elements if key[0] == window]:
+            del self.elements[key]
+
+    def page_changed(self):
+        """Start a new page generation in the focused window."""
+        self.generation += 1
+        self.drop_window(self.window)
+
+    def find(self, locator, root=None):
+        """Return a cached element for a (by, value) locator."""
+        key = self._key(locator, root)
+        element = self.elements.get(key)
+        if element is not None:
+            self.hits += 1
+            return element
+        self.misses += 1
+        start = root if root is not None else self.driver
+        element = start.find_element(*locator)
+        self.elements[key] = element
+        return element
+
+    def forget(self, locator, root=None):
+        """Drop one cached element."""
+        self.elements.pop(self._key(locator, root), None)
+
+    def use(self, locator, action, root=None):
+        """Run action(element), refinding once if the handle went stale."""
+        try:
+            return action(self.find(locator, root))
+        except StaleElementReferenceException:
+            self.forget(locator, root)
+            return action(self.find(locator, root))
+
+    def click(self, locator, root=None):
+        """Click a cached element."""
+        return self.use(locator, lambda element: element.click(), root)
+
+    def text(self, locator, root=None):
+        """Return the text of a cached element."""
+        return self.use(locator, lambda element: element.text, root)
@@ -0,0 +1,394 @@
+"""Event-driven waits for Chrome with a polling fallback.
+
+WebDriverWait re-runs its condition every poll. On Chrome, EventWait
+resolves the same expected conditions inside the page instead: one
+asynchronous script checks the condition and, if it does not hold yet,
+rechecks it on DOM mutations and on a short in-page timer, so a wait costs
+a single WebDriver round trip and returns as soon as the condition is met.
+Network activity comes from the DevTools events ChromeDriver records in
+the performance log (Network.requestWillBeSent, loadingFinished and
+loadingFailed), which count the requests in flight without touching the
+page. Performance logging is opt-in (STAXING_NETWORK_IDLE=1), as
+ChromeDriver buffers the log until it is read.
+
+Other browsers, and conditions without an in-page equivalent, fall back
+to WebDriverWait polling.
+"""
+
+import json
+import os
+import time
+
+from weakref import WeakKeyDictionary, ref
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.support import expected_conditions as expect
+from selenium.webdriver.support.ui import WebDriverWait
+
+try:
+    from staxing.element_cache import ElementCache
+except ImportError:
+    from element_cache import ElementCache
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+
+__version__ = '0.0.2'
+
+EVENT_BROWSERS = ('chrome', 'chromium')
+NETWORK_IDLE = bool(os.getenv('STAXING_NETWORK_IDLE'))
+# requests without a finishing event stop counting after this many seconds
+MAX_REQUEST_AGE = 10.0
+# seconds for an action to start a navigation before load() keeps the page
+NAVIGATION_GRACE = 0.5
+# long-lived connections never finish loading, so they never count
+STREAMING = ('WebSocket', 'EventSource')
+# expected condition class -> state checked in the page
+STATES = {
+    expect.presence_of_element_located: 'present',
+    expect.visibility_of_element_located: 'visible',
+    expect.element_to_be_clickable: 'clickable',
+    expect.staleness_of: 'stale',
+}
+CONDITION_SCRIPT = '''
+    var by = arguments[0], value = arguments[1], state = arguments[2],
+        limit = arguments[3], done = arguments[arguments.length - 1];
+    function first(nodes, test) {
+        for (var i = 0; i < nodes.length; i++) {
+            if (!test || test(nodes[i])) { return nodes[i]; }
+        }
+        return null;
+    }
+    function find() {
+        switch (by) {
+        case 'css selector': return document.querySelector(value);
+        case 'id': return document.getElementById(value);
+        case 'name': return first(document.getElementsByName(value));
+        case 'class name':
+            return first(document.getElementsByClassName(value));
+        case 'tag name': return first(document.getElementsByTagName(value));
+        case 'link text':
+            return first(document.links, function (link) {
+                return link.textContent.trim() === value;
+            });
+        case 'partial link text':
+            return first(document.links, function (link) {
+                return link.textContent.indexOf(value) >= 0;
+            });
+        }
+        return document.evaluate(value, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    function visible(node) {
+        var box = node.getBoundingClientRect(),
+            style = window.getComputedStyle(node);
+        return box.width > 0 && box.height > 0 &&
+            style.visibility !== 'hidden' && style.display !== 'none';
+    }
+    function check() {
+        var node = find();
+        if (!node || state === 'present') { return node; }
+        if (!visible(node)) { return null; }
+        return state === 'clickable' && node.disabled ? null : node;
+    }
+    var found = check();
+    if (found) { done(found); return; }
+    var timer, interval, observer;
+    function finish(result) {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearInterval(interval);
+        done(result);
+    }
+    function recheck() {
+        var result = check();
+        if (result) { finish(result); }
+    }
+    observer = new MutationObserver(recheck);
+    observer.observe(document, {childList: true, subtree: true,
+                                attributes: true, characterData: true});
+    // stylesheets, layout and scrolling change visibility without mutations
+    interval = setInterval(recheck, 100);
+    timer = setTimeout(function () { finish(null); }, limit);
+'''
+STALE_SCRIPT = '''
+    var node = arguments[0], limit = arguments[1],
+        done = arguments[arguments.length - 1];
+    if (!document.contains(node)) { done(true); return; }
+    var timer, observer = new MutationObserver(function () {
+        if (!document.contains(node)) {
+            observer.disconnect();
+            clearTimeout(timer);
+            done(true);
+        }
+    });
+    observer.observe(document, {childList: true, subtree: true});
+    timer = setTimeout(function () {
+        observer.disconnect();
+        done(false);
+    }, limit);
+'''
+LOAD_SCRIPT = '''
+    var limit = arguments[0], grace = arguments[1],
+        done = arguments[arguments.length - 1];
+    function ready() {
+        window.__staxingLoaded = true;
+        done(true);
+    }
+    if (window.__staxingLoaded) {
+        // still the document an earlier wait saw: a navigation started by
+        // the last action aborts this script, otherwise the page is kept
+        var kept = setTimeout(function () { done(true); }, grace);
+        window.addEventListener('beforeunload', function () {
+            clearTimeout(kept);
+            setTimeout(function () { done(false); }, limit);
+        });
+        return;
+    }
+    if (document.readyState === 'complete') { ready(); return; }
+    var timer = setTimeout(function () { done(false); }, limit);
+    window.addEventListener('load', function () {
+        clearTimeout(timer);
+        ready();
+    });
+'''
+MARK_SCRIPT = '''
+    var seen = !!window.__staxingLoaded;
+    if (document.readyState === 'complete') { window.__staxingLoaded = true; }
+    return [document.readyState, seen];
+'''
+READY_SCRIPT = 'return document.readyState;'
+
+
+def supports_events(driver):
+    """Return True if the browser can resolve waits from page events."""
+    capabilities = getattr(driver, 'capabilities', None) or {}
+    return str(capabilities.get('browserName', '')).lower() in EVENT_BROWSERS
+
+
+def performance_logging(capabilities):
+    """Return Chrome capabilities recording DevTools events for EventWait.
+
+    The capabilities are returned unchanged unless STAXING_NETWORK_IDLE
+    is set.
+    """
+    capabilities = dict(capabilities or {})
+    if NETWORK_IDLE and \
+            str(capabilities.get('browserName', '')).lower() in EVENT_BROWSERS:
+        capabilities['goog:loggingPrefs'] = dict(
+            capabilities.get('goog:loggingPrefs', {}), performance='ALL')
+    return capabilities
+
+
+class BrowserEvents(object):
+    """DevTools network events and script settings shared per WebDriver."""
+
+    _browsers = WeakKeyDictionary()
+
+    def __init__(self, driver):
+        """Event reader constructor."""
+        self._driver = ref(driver)
+        self.logging = NETWORK_IDLE
+        self.script_timeout = None
+        self.in_flight = {}
+        self.requests = 0
+        self.loads = 0
+        self.last_activity = 0.0
+
+    @property
+    def driver(self):
+        """Return the WebDriver."""
+        return self._driver()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Return the shared event reader for a WebDriver."""
+        browser = cls._browsers.get(driver)
+        if browser is None:
+            browser = cls._browsers[driver] = cls(driver)
+        return browser
+
+    def allow_scripts(self, seconds):
+        """Raise the asynchronous script timeout to cover a wait."""
+        if self.script_timeout is None or self.script_timeout < seconds:
+            self.driver.set_script_timeout(seconds)
+            self.script_timeout = seconds
+
+    def drain(self):
+        """Read the buffered DevTools events and update request counts."""
+        if not self.logging:
+            return
+        try:
+            entries = self.driver.get_log('performance')
+        except WebDriverException as err:
+            LOG.debug(self, 'Performance log unavailable: %s', err)
+            self.logging = False
+            return
+        for entry in entries:
+            message = json.loads(entry['message']).get('message', {})
+            method = message.get('method', '')
+            params = message.get('params', {})
+            # log timestamps are wall clock milliseconds
+            stamp = entry.get('timestamp', time.time() * 1000) / 1000.0
+            if method == 'Network.requestWillBeSent':
+                if params.get('type') in STREAMING:
+                    continue
+                if params.get('requestId') not in self.in_flight:
+                    self.requests += 1
+                self.in_flight[params.get('requestId')] = stamp
+            elif method in ('Network.loadingFinished',
+                            'Network.loadingFailed'):
+                self.in_flight.pop(params.get('requestId'), None)
+            elif method == 'Page.loadEventFired' or (
+                    method == 'Page.frameNavigated' and
+                    not params.get('frame', {}).get('parentId')):
+                # requests of the previous document never report finishing
+                self.loads += method == 'Page.loadEventFired'
+                self.in_flight.clear()
+            else:
+                continue
+            self.last_activity = max(self.last_activity, stamp)
+
+    def idle_for(self):
+        """Return seconds since the network went quiet, or None if busy.
+
+        Requests older than MAX_REQUEST_AGE, such as long polls, stop
+        counting as in flight.
+        """
+        now = time.time()
+        for request, started in list(self.in_flight.items()):
+            if now - started > MAX_REQUEST_AGE:
+                del self.in_flight[request]
+        if self.in_flight:
+            return None
+        return now - self.last_activity
+
+
+class EventWait(object):
+    """WebDriverWait replacement resolving conditions from page events.
+
+    driver (WebDriver): browser to wait on
+    timeout (float): seconds before TimeoutException
+    poll_frequency (float): polling interval when events are unavailable
+    events (bool): force event waits on or off; detected by default
+    """
+
+    def __init__(self, driver, timeout=15, poll_frequency=0.5, events=None):
+        """Wait constructor."""
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.events = supports_events(driver) if events is None else events
+        self.browser = BrowserEvents.for_driver(driver)
+
+    def polling(self, timeout=None):
+        """Return the WebDriverWait used as the fallback."""
+        return WebDriverWait(self.driver,
+                             self.timeout if timeout is None else timeout,
+                             self.poll_frequency)
+
+    def until(self, condition, message=''):
+        """Return the condition's value once it holds, like WebDriverWait."""
+        state = STATES.get(type(condition))
+        if self.events and state is not None:
+            try:
+                return self._observe(condition, state, message)
+            except TimeoutException:
+                raise
+            except StaleElementReferenceException:
+                if state == 'stale':
+                    return True
+                raise
+            except WebDriverException as err:
+                LOG.debug(self, 'Event wait failed, polling: %s', err)
+        return self.polling().until(condition, message)
+
+    def _observe(self, condition, state, message):
+        """Resolve one expected condition with a single page script."""
+        limit = int(self.timeout * 1000)
+        self.browser.allow_scripts(self.timeout + 5)
+        if state == 'stale':
+            found = self.driver.execute_async_script(
+                STALE_SCRIPT, condition.element, limit)
+        else:
+            by, value = condition.locator
+            found = self.driver.execute_async_script(
+                CONDITION_SCRIPT, by, value, state, limit)
+        if found is None or found is False:
+            raise TimeoutException(message or '%s not %s after %ss' % (
+                getattr(condition, 'locator', 'element'), state,
+                self.timeout))
+        return found
+
+    def load(self, grace=NAVIGATION_GRACE):
+        """Wait for the document replacing the last one waited on to load.
+
+        If the document seen by the previous load() is still current and
+        no navigation starts within grace seconds, the page is kept.
+        Cached element handles for the driver are dropped either way.
+        """
+        try:
+            return self._load(grace)
+        finally:
+            ElementCache.for_driver(self.driver).page_changed()
+
+    def _load(self, grace):
+        """Wait for the next document as load() describes."""
+        if self.events:
+            self.browser.allow_scripts(self.timeout + 5)
+            # a navigation replacing the document aborts the script; the
+            # retries wait on the pages that follow, including redirects
+            for _ in range(3):
+                try:
+                    if self.driver.execute_async_script(
+                            LOAD_SCRIPT, int(self.timeout * 1000),
+                            int(grace * 1000)):
+                        return True
+                    raise TimeoutException(
+                        'Page not loaded after %ss' % self.timeout)
+                except TimeoutException:
+                    raise
+                except WebDriverException as err:
+                    LOG.debug(self, 'Load wait interrupted: %s', err)
+        start = time.monotonic()
+
+        def loaded(driver):
+            try:
+                state, seen = driver.execute_script(MARK_SCRIPT)
+            except WebDriverException:
+                return driver.execute_script(READY_SCRIPT) == 'complete'
+            if seen:
+                return time.monotonic() - start >= grace
+            return state == 'complete'
+        return WebDriverWait(self.driver, self.timeout,
+                             min(self.poll_frequency, grace or 0.1)).until(
+            loaded, 'Page not loaded after %ss' % self.timeout)
+
+    def settle(self, quiet=0.5, timeout=None):
+        """Wait until no request has been in flight for quiet seconds.
+
+        Only Chrome with performance logging reports requests; elsewhere
+        this returns True at once. Returns False if the network was still
+        busy at the timeout.
+        """
+        if not self.events or not self.browser.logging:
+            return True
+        deadline = time.monotonic() + (self.timeout if timeout is None
+                                       else timeout)
+        while True:
+            self.browser.drain()
+            if not self.browser.logging:
+                return True
+            idle = self.browser.idle_for()
+            if idle is not None and idle >= quiet:
+                return True
+            if time.monotonic() >= deadline:
+                LOG.debug(self, 'Network busy: %s requests in flight',
+                          len(self.browser.in_flight))
+                return False
+            # sleep until the quiet window would close instead of polling
+            time.sleep(max(quiet - idle, 0.05) if idle is not None
+                       else min(self.poll_frequency, quiet))
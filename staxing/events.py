@@ -0,0 +1,188 @@
+"""Structured JSON-lines event logging for the staxing helpers.
+
+Configuration comes from the environment:
+    STAXING_LOG_LEVEL  debug, info, warning (default), error or off
+    STAXING_LOG        output path; '{worker}' is replaced with the
+                       pytest-xdist worker id ('main' outside xdist).
+                       Defaults to standard error.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+__version__ = '0.0.1'
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVELS = {
+    'debug': DEBUG,
+    'info': INFO,
+    'warning': WARNING,
+    'error': ERROR,
+    'off': OFF,
+}
+NAMES = {value: key for key, value in LEVELS.items()}
+
+
+class EventWriter(object):
+    """Buffered line writer flushed by a background thread."""
+
+    def __init__(self, target=None, interval=0.5, limit=1000):
+        """Writer constructor.
+
+        target (string|file): path to append to, or an open text stream
+        interval (float): seconds between background flushes
+        limit (int): buffered lines that trigger an early flush
+        """
+        self.target = target if target is not None else sys.stderr
+        self.interval = interval
+        self.limit = limit
+        self.lines = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def write(self, line):
+        """Queue one line without touching the disk."""
+        with self.lock:
+            self.lines.append(line)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run,
+                                               name='staxing-events',
+                                               daemon=True)
+                self.thread.start()
+            if len(self.lines) >= self.limit:
+                self.wake.set()
+
+    def flush(self):
+        """Write every queued line now."""
+        with self.lock:
+            lines, self.lines = self.lines, []
+        if not lines:
+            return
+        data = '\n'.join(lines) + '\n'
+        if isinstance(self.target, str):
+            folder = os.path.dirname(self.target)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(self.target, 'a') as stream:
+                stream.write(data)
+        else:
+            self.target.write(data)
+            self.target.flush()
+
+    def _run(self):
+        """Flush on a timer or when the buffer fills."""
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception as err:
+                sys.stderr.write('staxing event flush failed: %s\n' % err)
+
+
+class EventLogger(object):
+    """Leveled JSON event logger with a no-op path below its level."""
+
+    def __init__(self, level=WARNING, writer=None, worker=None):
+        """Logger constructor."""
+        self.level = LEVELS.get(level, level) if isinstance(level, str) \
+            else level
+        self.writer = writer if writer else EventWriter()
+        self.worker = worker if worker else \
+            os.getenv('PYTEST_XDIST_WORKER', 'main')
+
+    @classmethod
+    def from_environment(cls):
+        """Build a logger from STAXING_LOG_LEVEL and STAXING_LOG."""
+        level = LEVELS.get(os.getenv('STAXING_LOG_LEVEL', 'warning').lower(),
+                           WARNING)
+        worker = os.getenv('PYTEST_XDIST_WORKER', 'main')
+        path = os.getenv('STAXING_LOG')
+        writer = EventWriter(path.replace('{worker}', worker)) if path \
+            else EventWriter()
+        return cls(level=level, writer=writer, worker=worker)
+
+    def enabled(self, level):
+        """Return True if events at this level are written."""
+        return level >= self.level
+
+    def emit(self, level, source, message, args=(), **fields):
+        """Write one event.
+
+        source: the calling helper object (its class names the role) or a
+            role string
+        message: %-style text, only formatted when the event is written
+        """
+        if level < self.level:
+            return
+        role = source if isinstance(source, str) \
+            else type(source).__name__.lower()
+        event = {
+            'ts': round(time.time(), 3),
+            'level': NAMES.get(level, level),
+            'worker': self.worker,
+            'role': role,
+            'method': fields.pop('method', None) or
+            sys._getframe(2).f_code.co_name,
+            'msg': message % args if args else message,
+        }
+        event.update(fields)
+        self.writer.write(json.dumps(event, default=str))
+
+    def debug(self, source, message, *args, **fields):
+        """Write a debug event."""
+        if DEBUG >= self.level:
+            self.emit(DEBUG, source, message, args, **fields)
+
+    def info(self, source, message, *args, **fields):
+        """Write an info event."""
+        if INFO >= self.level:
+            self.emit(INFO, source, message, args, **fields)
+
+    def warning(self, source, message, *args, **fields):
+        """Write a warning event."""
+        if WARNING >= self.level:
+            self.emit(WARNING, source, message, args, **fields)
+
+    def error(self, source, message, *args, **fields):
+        """Write an error event."""
+        if ERROR >= self.level:
+            self.emit(ERROR, source, message, args, **fields)
+
+    def flush(self):
+        """Write any buffered events."""
+        self.writer.flush()
+
+
+LOG = EventLogger.from_environment()
+atexit.register(LOG.flush)
+
+
+def traced(method):
+    """Log a debug event with the duration of each call to a method."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if DEBUG < LOG.level:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        status = 'error'
+        try:
+            result = method(self, *args, **kwargs)
+            status = 'ok'
+            return result
+        finally:
+            LOG.emit(DEBUG, self, 'exit', method=method.__name__,
+                     status=status,
+                     duration=round(time.perf_counter() - start, 4))
+    return wrapper
@@ -3,6 +3,7 @@
 import calendar
 import datetime
 import inspect
+import json
 import os
 import re
 
@@ -13,6 +14,7 @@ from random import randint
 from requests import HTTPError
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome import service
 from selenium.webdriver.common.by import By
@@ -22,16 +24,94 @@ from selenium.webdriver.support.ui import WebDriverWait
 from time import sleep
 from urllib.parse import urlparse, ParseResult
 
+try:
+    from staxing.admin_tables import AdminTable
+except ImportError:
+    from admin_tables import AdminTable
 try:
     from staxing.assignment import Assignment
 except ImportError:
     from assignment import Assignment
+try:
+    from staxing.artifacts import ArtifactRecorder, capture_on_failure
+except ImportError:
+    from artifacts import ArtifactRecorder, capture_on_failure
+try:
+    from staxing.broker import broker
+except ImportError:
+    from broker import broker
+try:
+    from staxing.cleanup import CourseCleanup
+except ImportError:
+    from cleanup import CourseCleanup
+try:
+    from staxing.content import BookCrawler
+except ImportError:
+    from content import BookCrawler
+try:
+    from staxing.content_index import ContentIndex
+except ImportError:
+    from content_index import ContentIndex
+try:
+    from staxing.element_cache import ElementCache
+except ImportError:
+    from element_cache import ElementCache
+try:
+    from staxing.event_wait import EventWait, performance_logging
+except ImportError:
+    from event_wait import EventWait, performance_logging
+try:
+    from staxing.events import DEBUG, LOG, traced
+except ImportError:
+    from events import DEBUG, LOG, traced
+try:
+    from staxing.http_driver import HTTPDriver
+except ImportError:
+    from http_driver import HTTPDriver
+try:
+    from staxing.jobs import JobWatcher
+except ImportError:
+    from jobs import JobWatcher
+try:
+    from staxing.latency import LatencyRecorder
+except ImportError:
+    from latency import LatencyRecorder
+try:
+    from staxing.locators import LOCATORS
+except ImportError:
+    from locators import LOCATORS
+try:
+    from staxing.metrics import PageMetrics, measured
+except ImportError:
+    from metrics import PageMetrics, measured
 try:
     from staxing.page_load import SeleniumWait as Page
 except ImportError:
     from page_load import SeleniumWait as Page
+try:
+    from staxing.runtime import Runtime
+except ImportError:
+    from runtime import Runtime
+try:
+    from staxing.supervisor import SUPERVISOR
+except ImportError:
+    from supervisor import SUPERVISOR
+try:
+    from staxing.tabs import TabScheduler
+except ImportError:
+    from tabs import TabScheduler
+try:
+    from staxing.toc import BookTOC, book_from_url
+except ImportError:
+    from toc import BookTOC, book_from_url
+try:
+    from staxing.tutor_api import AssignmentAPI, course_id_from_url, \
+        session_from_driver
+except ImportError:
+    from tutor_api import AssignmentAPI, course_id_from_url, \
+        session_from_driver
 
-__version__ = '0.0.32'
+__version__ = '0.0.33'
 
 
 class Helper(object):
@@ -67,6 +147,7 @@ class Helper(object):
             raise TypeError('A Sauce Labs user is required for remote testing')
         self.pasta = pasta_user
         self.opera_driver = opera_driver
+        self.shared_driver = False
         if existing_driver:
             self.driver = existing_driver
         else:
@@ -75,9 +156,14 @@ class Helper(object):
                                       pasta_user=self.pasta,
                                       capabilities=capabilities)
             self.driver.implicitly_wait(wait_time)
-        self.wait = WebDriverWait(self.driver, wait_time)
+        self.wait = EventWait(self.driver, wait_time)
         self.wait_time = wait_time
         self.page = Page(self.driver, self.wait_time)
+        self.cache = ElementCache.for_driver(self.driver)
+        self.artifacts = ArtifactRecorder.for_driver(self.driver)
+        self.metrics = PageMetrics(os.getenv('STAXING_BUDGET')) if \
+            os.getenv('STAXING_METRICS') or os.getenv('STAXING_BUDGET') \
+            else None
         super(Helper, self).__init__(**kwargs)
 
     def __enter__(self):
@@ -90,15 +176,70 @@ class Helper(object):
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Class exitor."""
+        if exc_val is not None and \
+                getattr(exc_val, 'staxing_artifacts', None) is None:
+            try:
+                exc_val.staxing_artifacts = self.artifacts.capture(
+                    type(exc_val).__name__, exc_val)
+            except Exception as err:
+                LOG.warning(self, 'Artifact capture failed: %s', err)
         self.delete()
 
     def delete(self):
         """Webdriver destructor."""
         self.wait = None
+        driver = getattr(self, 'driver', None)
+        # no driver when the constructor failed to start a browser
+        if driver is None or getattr(self, 'shared_driver', False):
+            return
+        error = None
         try:
-            self.driver.quit()
-        except:
-            pass
+            # find the browser's children before quit() re-parents them
+            SUPERVISOR.sample_driver(driver)
+        except Exception as err:
+            LOG.debug(self, 'Process sample failed: %s', err)
+        try:
+            driver.quit()
+        except Exception as err:
+            error = repr(err)
+            LOG.debug(self, 'Driver quit failed: %s', error)
+        try:
+            SUPERVISOR.release(driver, error)
+        except Exception as err:
+            LOG.debug(self, 'Process release failed: %s', err)
+
+    def resources(self):
+        """Return peak memory and CPU for this browser's processes."""
+        session = SUPERVISOR.find(self.driver)
+        if session is None:
+            return None
+        session.sample()
+        return session.summary()
+
+    def enable_metrics(self, metrics=None, budget=None, strict=False):
+        """Sample page timings after each navigation; return the collector.
+
+        metrics (PageMetrics): collector to share between helpers
+        budget (Budget|string): performance budget or budget file
+        strict (bool): fail the navigation that breaks the budget
+        """
+        self.metrics = metrics if metrics is not None else \
+            PageMetrics(budget, strict)
+        return self.metrics
+
+    def assert_budget(self):
+        """Fail if any navigation so far broke the performance budget."""
+        if self.metrics is not None:
+            self.metrics.assert_budget()
+
+    @property
+    def runtime(self):
+        """Return the injected page helpers for this browser."""
+        return Runtime.for_driver(self.driver)
+
+    def tabs(self, poll=0.05):
+        """Return a scheduler to run several sessions in this browser."""
+        return TabScheduler(self.driver, poll)
 
     @classmethod
     def default_capabilities(cls, browser='chrome'):
@@ -110,7 +251,8 @@ class Helper(object):
     def run_on(self, driver_type, pasta_user=None, capabilities={}):
         """Webdriver activation.
 
-        driver_type (string): web browser type
+        driver_type (string): web browser type; 'http' fetches pages with
+            requests instead of a browser, for server-rendered pages only
         pasta_user (PastaSauce): optional API access for saucelabs
         capabilities (dict): browser settings; copy object to avoid overwrite
             Defaults:
@@ -141,20 +283,26 @@ class Helper(object):
         else:
             driver = 'chrome'
         try:
-            return {
+            started = {
                 'firefox': lambda: webdriver.Firefox(),
-                'chrome': lambda: webdriver.Chrome(),
+                'chrome': lambda: webdriver.Chrome(
+                    desired_capabilities=performance_logging(
+                        DesiredCapabilities.CHROME.copy())),
                 'ie': lambda: webdriver.Ie(),
                 'opera': lambda: self.start_opera(self.opera_driver),
                 'phantomjs': lambda: webdriver.PhantomJS(),
+                'http': lambda: HTTPDriver(),
                 # 'safari': lambda: webdriver.Safari(),
-                'saucelabs': lambda: webdriver.Remote(
+                'saucelabs': lambda: broker().create(
                     command_executor=(
                         'http://%s:%s@ondemand.saucelabs.com:80/wd/hub' %
                         (pasta_user.get_user(), pasta_user.get_access_key())),
-                    desired_capabilities=capabilities
+                    desired_capabilities=performance_logging(capabilities)
                 ),
             }[driver]()
+            if driver != 'opera':
+                SUPERVISOR.track(started, name=driver)
+            return started
         except WebDriverException as err:
             raise FileNotFoundError(err)
         except Exception as err:
@@ -164,17 +312,20 @@ class Helper(object):
         """Opera initiator."""
         webdriver_service = service.Service(location)
         webdriver_service.start()
-        return webdriver.Remote(
+        driver = webdriver.Remote(
             webdriver_service.service_url,
             DesiredCapabilities.OPERA.copy()
         )
+        SUPERVISOR.track(driver, name='opera',
+                         pids=[webdriver_service.process.pid])
+        return driver
 
     def change_wait_time(self, new_wait):
         """Change the max action wait time."""
         if new_wait <= 0:
             raise ValueError('Wait time must be 1 or higher.')
         self.driver.implicitly_wait(new_wait)
-        self.wait = WebDriverWait(self.driver, new_wait)
+        self.wait = EventWait(self.driver, new_wait)
         self.wait_time = new_wait
 
     def date_string(self, day_delta=0, str_format='%m/%d/%Y'):
@@ -182,10 +333,12 @@ class Helper(object):
         return (datetime.date.today() + datetime.timedelta(days=day_delta)). \
             strftime(str_format)
 
+    @measured
     def get(self, url):
         """Return the current URL."""
         self.driver.get(url)
-        self.page.wait_for_page_load()
+        self.page.page_changed()
+        self.wait.settle()
 
     def get_window_size(self, dimension=None):
         """Return the current window dimensions."""
@@ -249,6 +402,28 @@ class User(Helper):
 
     CONDENSED_WIDTH = Helper.CONDENSED_WIDTH
     DEFAULT_WAIT_TIME = Helper.DEFAULT_WAIT_TIME
+    # (site, username) -> {host: [cookie]} for every account signed in
+    SESSIONS = {}
+    # site -> OpenStax Accounts host its login goes through
+    SSO_HOSTS = {}
+    IDENTITY_SCRIPT = '''
+        var request = new XMLHttpRequest();
+        request.open('GET', '/api/user', false);
+        request.send();
+        return request.status == 200 ? request.responseText : '';
+    '''
+    COURSE_INDEX_SCRIPT = '''
+        var items = document.querySelectorAll(arguments[0]);
+        return Array.prototype.map.call(items, function (item) {
+            var link = item.querySelector('a');
+            return {
+                title: item.getAttribute('data-title'),
+                appearance: item.getAttribute('data-appearance'),
+                href: link ? link.href : null,
+                text: item.textContent.trim()
+            };
+        });
+    '''
 
     def __init__(self,
                  username,
@@ -312,6 +487,7 @@ class User(Helper):
         self.email_username = email_username
         self.email_password = email_password
         self.assign = Assignment()
+        self.course_indexes = {}
         super(User, self).__init__(driver_type=driver_type,
                                    capabilities=capabilities,
                                    pasta_user=pasta_user,
@@ -330,12 +506,14 @@ class User(Helper):
             target = self.find(By.ID, checkbox_id)
             Assignment.scroll_to(self.driver, target)
             target.click()
-            target = self.find(By.ID, 'agreement_submit')
+            target = self.find(*LOCATORS.get('contract.submit'))
             Assignment.scroll_to(self.driver, target)
             target.click()
         except Exception as e:
             raise e
 
+    @measured
+    @capture_on_failure
     def login(self, url=None, username=None, password=None):
         """
         Tutor login control.
@@ -352,32 +530,30 @@ class User(Helper):
         url_address = self.url if not url else url
         # open the URL
         self.get(url_address)
-        self.page.wait_for_page_load()
+        self.wait.load()
         if 'tutor' in url_address:
             # check to see if the screen width is normal or condensed
             if self.get_window_size('width') <= self.CONDENSED_WIDTH:
                 # get small-window menu toggle
-                is_collapsed = self.find(By.CSS_SELECTOR,
-                                         'button.navbar-toggle')
+                is_collapsed = self.find(*LOCATORS.get('login.menu_toggle'))
                 # check if the menu is collapsed and, if yes, open it
                 try:
-                    WebDriverWait(self.driver, 2).until(
+                    EventWait(self.driver, 2).until(
                         expect.visibility_of_element_located(
-                            By.XPATH,
-                            '//a[contains(@href,"/accounts/login")]'
+                            LOCATORS.get('login.accounts_link')
                         )
                     )
                 except:  # closed menu,
                     is_collapsed.click()
             self.wait.until(
                 expect.visibility_of_element_located(
-                    (By.LINK_TEXT, 'Log in')
+                    LOCATORS.get('login.tutor_link')
                 )
             ).click()
-            self.page.wait_for_page_load()
+            self.wait.load()
         elif 'exercises' in url_address:
-            self.find(By.LINK_TEXT, 'Sign in').click()
-            self.page.wait_for_page_load()
+            self.find(*LOCATORS.get('login.exercises_link')).click()
+            self.wait.load()
         src = self.driver.page_source
         text_located = re.search(r'openstax', src.lower())
         self.sleep(1)
@@ -386,29 +562,32 @@ class User(Helper):
                 'Non-OpenStax URL: %s' % self.driver.current_url
             )
         # enter the username and password
-        self.find(By.ID, 'login_username_or_email').send_keys(username)
-        self.find(By.XPATH, '//input[@value="Next"]').click()
-        self.find(By.ID, 'login_password').send_keys(password)
-        self.find(By.XPATH, '//input[@value="Login"]').click()
-        self.page.wait_for_page_load()
+        accounts = urlparse(self.current_url()).netloc
+        if accounts != urlparse(self.url).netloc:
+            User.SSO_HOSTS[self.url] = accounts
+        self.find(*LOCATORS.get('login.username')).send_keys(username)
+        self.find(*LOCATORS.get('login.next')).click()
+        self.find(*LOCATORS.get('login.password')).send_keys(password)
+        self.find(*LOCATORS.get('login.submit')).click()
+        self.wait.load()
         # check if a password change is required
         if 'reset your password' in self.driver.page_source.lower():
             try:
-                self.find(By.ID, 'reset_password_password') \
+                self.find(*LOCATORS.get('login.reset_password')) \
                     .send_keys(self.password)
-                self.find(By.ID, 'reset_password_password_confirmation') \
+                self.find(*LOCATORS.get('login.reset_confirmation')) \
                     .send_keys(self.password)
-                self.find(By.XPATH, '//input[@value="Reset Password"]').click()
+                self.find(*LOCATORS.get('login.reset_submit')).click()
                 self.sleep(1)
-                self.find(By.XPATH, '//input[@value="Continue"]').click()
+                self.find(*LOCATORS.get('login.reset_continue')).click()
             except Exception as e:
                 raise e
-        self.page.wait_for_page_load()
+        self.wait.load()
         source = self.driver.page_source.lower()
-        print('Reached Terms/Privacy')
+        LOG.debug(self, 'Reached Terms/Privacy')
         while 'terms of use' in source or 'privacy policy' in source:
             self.accept_contract()
-            self.page.wait_for_page_load()
+            self.wait.load()
             source = self.driver.page_source.lower()
         return self
 
@@ -428,33 +607,177 @@ class User(Helper):
         """Return the current browser URL."""
         return self.driver.current_url
 
+    def visit_host(self, host):
+        """Open a host's root page unless the browser is already there."""
+        if urlparse(self.current_url()).netloc != host:
+            self.get('%s://%s/' % (urlparse(self.url).scheme or 'https',
+                                   host))
+
+    def session_hosts(self):
+        """Return the Accounts host, if known, then the current host."""
+        home = urlparse(self.current_url()).netloc
+        sso = User.SSO_HOSTS.get(self.url)
+        return [sso, home] if sso and sso != home else [home]
+
+    def save_session(self, username=None):
+        """Remember an account's cookies on this host and on Accounts."""
+        key = (self.url, username if username else self.username)
+        jars = User.SESSIONS.setdefault(key, {})
+        for host in self.session_hosts():
+            self.visit_host(host)
+            jars[host] = self.driver.get_cookies()
+
+    def clear_session(self):
+        """Sign out by deleting the cookies here and on Accounts."""
+        for host in self.session_hosts():
+            self.visit_host(host)
+            self.driver.delete_all_cookies()
+
+    def whoami(self):
+        """Return the signed in username, '' if signed out, or None.
+
+        None means the site does not report a username.
+        """
+        try:
+            identity = self.driver.execute_script(User.IDENTITY_SCRIPT)
+        except WebDriverException:
+            return None
+        if not identity:
+            return ''
+        try:
+            return json.loads(identity).get('username')
+        except ValueError:
+            return None
+
+    def restore_session(self):
+        """Swap this account's saved cookies into the browser.
+
+        Returns True when the browser is signed in as this account.
+        """
+        jars = User.SESSIONS.get((self.url, self.username), {})
+        if urlparse(self.current_url()).netloc not in jars:
+            self.get(self.url)
+        host = urlparse(self.current_url()).netloc
+        if host not in jars:
+            return False
+        # the Accounts jar first, so the site is reloaded last
+        for other in sorted(jars, key=lambda name: name == host):
+            self.visit_host(other)
+            self.driver.delete_all_cookies()
+            for cookie in jars[other]:
+                cookie = dict(cookie)
+                if 'expiry' in cookie:
+                    cookie['expiry'] = int(cookie['expiry'])
+                self.driver.add_cookie(cookie)
+        self.driver.refresh()
+        self.page.page_changed()
+        return self.whoami() in (None, self.username)
+
+    def switch_account(self, username=None, password=None):
+        """Act as another account in the same browser.
+
+        The signed in account's cookies, on the site and on its Accounts
+        host, are kept so switching back is a cookie swap and reload; an
+        account without saved cookies logs in once through the UI.
+        """
+        identity = self.whoami()
+        if identity:
+            self.save_session(identity)
+        self.username = username if username else self.username
+        self.password = password if password else self.password
+        if self.restore_session():
+            LOG.info(self, 'Switched to %s', self.username)
+            return self
+        self.clear_session()
+        self.login()
+        identity = self.whoami()
+        if identity not in (None, self.username):
+            raise LoginError('Signed in as "%s" instead of "%s"' %
+                             (identity, self.username))
+        self.save_session()
+        LOG.info(self, 'Signed in as %s', self.username)
+        return self
+
+    def as_role(self, role, username=None, password=None, **kwargs):
+        """Return a role helper (Teacher, Student, ...) on this browser.
+
+        role (class): User subclass to act as
+        username, password (string): account; with neither, role's
+            use_env_vars account is used
+        """
+        identity = self.whoami()
+        if identity:
+            self.save_session(identity)
+        if username is None and password is None:
+            other = role(use_env_vars=True, existing_driver=self.driver,
+                         **kwargs)
+        else:
+            other = role(username=username, password=password, site=self.url,
+                         existing_driver=self.driver, **kwargs)
+        other.shared_driver = True
+        return other.switch_account()
+
+    @measured
     def goto_course_list(self):
         """Go to the course picker."""
         try:
             self.wait.until(
                 expect.presence_of_element_located(
-                    (By.ID, 'ox-react-root-container')
+                    LOCATORS.get('user.root')
                 )
             )
             if 'tutor' in self.current_url():
-                self.find(By.XPATH, '//a[contains(@href,"dashboard")]') \
-                    .click()
-                self.page.wait_for_page_load()
+                self.find(*LOCATORS.get('user.dashboard_link')).click()
+                self.wait.load()
             else:
                 raise HTTPError('Not currently on an OpenStax Tutor webpage:' +
                                 '%s' % self.current_url())
         except Exception as ex:
             raise ex
 
+    def course_index(self, refresh=False):
+        """Return this account's course listings from one page scrape.
+
+        Each listing is a dict of title, appearance, href, text and id. The
+        index is kept per site and account until refresh is requested; it
+        is read from the course picker, so an empty list means the account
+        went straight to its only course. Empty results are not kept.
+        """
+        key = self.course_key()
+        if not refresh and key in self.course_indexes:
+            return self.course_indexes[key]
+        if 'dashboard' not in self.current_url():
+            self.goto_course_list()
+            self.wait.load()
+        if 'dashboard' not in self.current_url():
+            return []
+        try:
+            self.wait.until(expect.presence_of_element_located(
+                LOCATORS.get('course.listing')))
+        except TimeoutException:
+            LOG.debug(self, 'No course listings on the dashboard')
+            return []
+        _, selector = LOCATORS.get('course.listing',
+                                   strategy=By.CSS_SELECTOR)
+        courses = self.driver.execute_script(User.COURSE_INDEX_SCRIPT,
+                                             selector) or []
+        for course in courses:
+            course['id'] = course_id_from_url(course['href']) \
+                if course['href'] else None
+        if courses:
+            self.course_indexes[key] = courses
+        return courses
+
+    def course_key(self):
+        """Return the (site, username) key of the course index cache."""
+        return (self.url, self.username)
+
     def get_course_list(self, closed=False):
-        """Return a list of available courses."""
-        courses = self.find_all(
-            By.CSS_SELECTOR,
-            'div.course-listing-current-section' + ' ' +
-            'div.course-listing-item'
-        )
-        for a, x in enumerate(courses):
-            print('%s : "%s"' % (a, x.get_attribute('data-title')))
+        """Return the available courses as course_index listings."""
+        courses = self.course_index()
+        if LOG.enabled(DEBUG):
+            for a, x in enumerate(courses):
+                LOG.debug(self, '%s : "%s"', a, x['title'])
         return courses
 
     def open_user_menu(self):
@@ -467,12 +790,12 @@ class User(Helper):
             # compressed window display on Tutor
             self.wait.until(
                 expect.visibility_of_element_located(
-                    (By.CLASS_NAME, 'navbar-toggle')
+                    LOCATORS.get('user.navbar_toggle')
                 )
             ).click()
         self.wait.until(
             expect.visibility_of_element_located(
-                (By.CLASS_NAME, 'dropdown-toggle')
+                LOCATORS.get('user.menu_toggle')
             )
         ).click()
 
@@ -481,47 +804,58 @@ class User(Helper):
         self.open_user_menu()
         self.wait.until(
             expect.visibility_of_element_located(
-                (By.XPATH, '//input[@aria-label="Log Out"]')
+                LOCATORS.get('user.logout')
             )
         ).click()
-        self.page.wait_for_page_load()
+        self.wait.load()
 
     def accounts_logout(self):
         """OS Accounts logout helper."""
-        self.find(By.LINK_TEXT, 'Log out').click()
-        self.page.wait_for_page_load()
+        self.find(*LOCATORS.get('accounts.logout')).click()
+        self.wait.load()
 
     def execises_logout(self):
         """Exercises logout helper."""
-        wait = WebDriverWait(self.driver, 3)
+        wait = EventWait(self.driver, 3)
         try:
             wait.until(
                 expect.element_to_be_clickable(
-                    (By.ID, 'navbar-dropdown')
+                    LOCATORS.get('exercises.menu')
                 )
             ).click()
             wait.until(
-                expect.element_to_be_clickable(
-                    (By.XPATH, '//input[@aria-label="Log Out"]')
-                )
+                expect.element_to_be_clickable(LOCATORS.get('user.logout'))
             ).click()
-            self.page.wait_for_page_load()
+            self.wait.load()
         except NoSuchElementException:
             # Different page, but uses the same logic and link text
             self.accounts_logout()
 
+    @measured
+    @capture_on_failure
     def select_course(self, title=None, appearance=None):
-        """Select course."""
-        print('Select course "%s" / "%s"' % (title, appearance))
-        print('Currently at: %s' % self.current_url())
-        if 'dashboard' not in self.current_url():
+        """Select course.
+
+        Known courses open directly from the cached course index.
+        """
+        current = self.current_url()
+        LOG.debug(self, 'Select course "%s" / "%s" from %s',
+                  title, appearance, current)
+        field, wanted = ('title', title) if title else \
+            ('appearance', appearance)
+        if wanted and self.open_listing(
+                self.course_indexes.get(self.course_key(), []), field,
+                wanted):
+            return self
+        if 'dashboard' not in current:
             # If not at the dashboard, try to load it
-            print('Go to course list')
+            LOG.debug(self, 'Go to course list')
             self.goto_course_list()
-            self.page.wait_for_page_load()
-        if 'dashboard' not in self.current_url():
+            self.wait.load()
+            current = self.current_url()
+        if 'dashboard' not in current:
             # Only has one course and the user is at the dashboard so return
-            print('Single course; select course complete')
+            LOG.debug(self, 'Single course; select course complete')
             return
         if title:
             uses_option = 'title'
@@ -532,35 +866,40 @@ class User(Helper):
         else:
             raise self.LoginError('Unknown course selection "%s"' %
                                   title if title else appearance)
-        print('//div[@data-%s="%s"]//a' % (uses_option, course))
-        select = self.wait.until(
-            expect.element_to_be_clickable(
-                (
-                    By.XPATH, '//div[@data-%s="%s"]//a' %
-                    (uses_option, course)
-                )
-            )
-        )
-        print('Course: %s - %s' % (title if title else appearance,
-                                   select.get_attribute('href')))
+        if self.open_listing(
+                self.course_index(
+                    refresh=self.course_key() in self.course_indexes),
+                uses_option, course):
+            return self
+        locator = LOCATORS.get('course.select',
+                               option=uses_option, value=course)
+        select = self.wait.until(expect.element_to_be_clickable(locator))
+        if LOG.enabled(DEBUG):
+            LOG.debug(self, 'Course: %s - %s', course,
+                      select.get_attribute('href'))
         select.click()
-        self.page.wait_for_page_load()
-        print('Select course complete')
+        self.wait.load()
+        LOG.info(self, 'Selected course %s', course)
         return self
 
+    def open_listing(self, courses, field, value):
+        """Open the first course index listing whose field matches."""
+        for listing in courses:
+            if listing[field] == value and listing['href']:
+                self.get(listing['href'])
+                LOG.info(self, 'Selected course %s', value)
+                return True
+        return False
+
     def view_reference_book(self):
         """Access the reference book."""
         try:
-            self.find(
-                By.XPATH, '//div/a[contains(@class,"view-reference-guide")]'
-            ).click()
+            self.find(*LOCATORS.get('reference.book')).click()
             return
         except:
             pass
         self.open_user_menu()
-        self.find(
-            By.XPATH, '//li/a[contains(@class,"view-reference-guide")]'
-        ).click()
+        self.find(*LOCATORS.get('reference.menu_book')).click()
 
 
 class LoginError(Exception):
@@ -603,8 +942,41 @@ class Teacher(User):
         self.username = username
         return self
 
+    def use_api(self, course_id=None):
+        """Create assignments through the Tutor API with this login.
+
+        course_id defaults to the course open in the browser.
+        """
+        self.assign.backend = AssignmentAPI.from_driver(
+            self.driver, course_id, base_url=self.url)
+        return self
+
+    def use_ui(self):
+        """Create assignments through the browser."""
+        self.assign.backend = None
+        return self
+
     def add_assignment(self, assignment, args):
-        """Add an assignment."""
+        """Add an assignment.
+
+        Uses the API backend set by use_api unless args['mode'] is 'ui';
+        returns the created plan record in API mode.
+        """
+        mode = args.get('mode', Assignment.API if self.assign.backend
+                        else Assignment.UI)
+        if mode == Assignment.API:
+            if self.assign.backend is None:
+                self.use_api()
+            return self.assign.backend.add(
+                assignment,
+                name=args['title'],
+                description=args.get('description', ''),
+                periods=args['periods'],
+                state=args['status'],
+                url=args.get('url'),
+                reading_list=args.get('reading_list'),
+                problems=args.get('problems'),
+                feedback=args.get('feedback'))
         self.assign.add[assignment](
             driver=self.driver,
             name=args['title'],
@@ -648,49 +1020,55 @@ class Teacher(User):
             feedback=args['feedback'] if 'feedback' in args else None,
         )
 
+    def cleanup(self, start, end, match=None, use_api=True, drivers=None):
+        """Delete every plan between two dates in one batch.
+
+        start, end: 'MM/DD/YYYY' or datetime.date
+        match: title regular expression or callable; None removes all
+        use_api: delete over HTTP; otherwise through this and any extra
+            logged-in drivers concurrently
+        """
+        return CourseCleanup.from_teacher(self, use_api=use_api,
+                                          drivers=drivers).run(start, end,
+                                                               match)
+
+    @measured
+    @traced
     def goto_menu_item(self, item):
         """Go to a specific user menu item."""
-        print('Enter: goto_menu_item')
         if 'courses' in self.current_url():
-            print('Open user menu')
+            LOG.debug(self, 'Select menu item %s', item)
             self.open_user_menu()
-            print('Select menu item %s' % item)
             self.wait.until(
                 expect.element_to_be_clickable((By.LINK_TEXT, item))
             ).click()
-            self.page.wait_for_page_load()
-        print('Exit: goto_menu_item')
+            self.wait.load()
 
+    @measured
+    @traced
     def goto_calendar(self):
         """Return the teacher to the calendar dashboard."""
-        print('Enter: goto_calendar')
         try:
-            print('Try to return to the calendar')
-            self.find(By.CSS_SELECTOR, 'ul.navbar-nav a.navbar-brand').click()
-            print('Succeeded')
-            self.page.wait_for_page_load()
+            self.find(*LOCATORS.get('calendar.brand')).click()
+            self.wait.load()
         except:
-            print('Failed, Try to return to the calendar using the Brand')
+            LOG.debug(self, 'Return to the calendar using the Brand')
             try:
-                self.find(
-                    By.CSS_SELECTOR,
-                    'div.navbar-header a.navbar-brand'
-                ).click()
-                print('Succeeded')
-                self.page.wait_for_page_load()
+                self.find(*LOCATORS.get('calendar.header_brand')).click()
+                self.wait.load()
             except:
-                print('Failed')
-                pass
-        print('Exit: goto_calendar')
+                LOG.warning(self, 'Unable to return to the calendar')
 
+    @measured
+    @traced
     def goto_performance_forecast(self):
         """Access the performance forecast page."""
-        print('Enter: goto_performance_forecast')
         self.goto_menu_item('Performance Forecast')
         timer = 0
         while timer < 10:
             try:
-                print('Wait for forecast load try %s of 10' % (timer + 1))
+                LOG.debug(self, 'Wait for forecast load try %s of 10',
+                          timer + 1)
                 self.wait.until(
                     expect.visibility_of_element_located(
                         (By.CLASS_NAME, 'guide-container')
@@ -699,95 +1077,83 @@ class Teacher(User):
                 timer = 10
             except:
                 timer = timer + 1
-        print('Exit: goto_performance_forecast')
 
+    @measured
+    @traced
     def goto_student_scores(self):
         """Access the student scores page."""
-        print('Enter: goto_student_scores')
         self.goto_menu_item('Student Scores')
-        print('Exit: goto_student_scores')
 
+    @measured
+    @traced
     def goto_course_roster(self):
         """Access the course roster page."""
-        print('Enter: goto_course_roster')
         self.goto_menu_item('Course Settings and Roster')
-        print('Exit: goto_course_roster')
 
+    @measured
     def goto_course_settings(self):
         """Access the course settings page."""
         self.goto_course_roster()
 
+    @traced
     def add_course_section(self, section_name):
         """Add a section to the course."""
-        print('Enter: add_course_section')
         if 'settings' not in self.current_url():
             self.goto_course_roster()
-        self.find(By.XPATH, '//button[i[contains(@class,"fa-plus")]]').click()
+        self.find(*LOCATORS.get('roster.add_section')).click()
         self.wait.until(
             expect.visibility_of_element_located(
-                (By.XPATH,
-                 '//div[contains(@class,"teacher-edit-period-form")]' +
-                 '//input[@type="text"]')
+                LOCATORS.get('roster.section_name')
             )
         ).send_keys(section_name)
         self.wait.until(
             expect.element_to_be_clickable(
-                (By.XPATH, '//button[contains(@class,"-edit-period-confirm")]')
+                LOCATORS.get('roster.confirm_section')
             )
         ).click()
-        print('Exit: add_course_section')
 
+    @traced
     def get_enrollment_code(self, section_name):
         """Return the enrollment code for a class section."""
-        print('Enter: get_enrollment_code')
         if 'settings' not in self.driver.current_url:
             self.goto_course_roster()
-        self.find(By.XPATH, '//a[text()="%s"]' % section_name).click()
+        self.find(*LOCATORS.get('roster.section_tab',
+                                name=section_name)).click()
         self.wait.until(
-            expect.element_to_be_clickable(
-                (By.CLASS_NAME, 'show-enrollment-code')
-            )
+            expect.element_to_be_clickable(LOCATORS.get('roster.show_code'))
         ).click()
         sleep(1)
         code = self.wait.until(
-            expect.presence_of_element_located(
-                (By.CLASS_NAME, 'code')
-            )
+            expect.presence_of_element_located(LOCATORS.get('roster.code'))
         )
-        print('Exit: get_enrollment_code')
         return '%s' % code.text.strip()
 
+    @traced
     def get_book_sections(self):
         """Return a list of book sections."""
-        print('Retrieve the book section list')
         self.goto_calendar()
-        self.page.wait_for_page_load()
+        self.wait.load()
         self.assign.open_assignment_menu(self.driver)
         self.wait.until(
             expect.element_to_be_clickable(
                 (By.LINK_TEXT, 'Add Reading')
             )
         ).click()
-        self.page.wait_for_page_load()
-        selector = self.find(By.ID, 'reading-select')
+        self.wait.load()
+        selector = self.find(*LOCATORS.get('reading.select'))
         Assignment.scroll_to(self.driver, selector)
         sleep(1.0)
         selector.click()
-        self.page.wait_for_page_load()
-        for chapter in self.find_all(By.CSS_SELECTOR,
-                                     'div.chapter-heading > a'):
+        self.wait.load()
+        for chapter in self.find_all(
+                *LOCATORS.get('reading.chapter_headings')):
             if chapter.get_attribute('aria-expanded') != 'true':
                 Assignment.scroll_to(self.driver, chapter)
                 sleep(0.25)
                 chapter.click()
-        sections = self.find_all(
-            By.CSS_SELECTOR, 'div.section span.chapter-section')
-        section_list = []
-        section_string = ''
-        for section in sections:
-            section_list.append(section.text)
-            section_string += ' %s' % section.text
-        print('Section options: %s' % section_string)
+        sections = self.find_all(*LOCATORS.get('reading.sections'))
+        section_list = [section.text for section in sections]
+        LOG.debug(self, 'Section options: %s', ' '.join(section_list))
         self.goto_calendar()
         return section_list
 
@@ -798,10 +1164,12 @@ class Teacher(User):
 
     def get_month_year(self):
         """Break a date string into a month year tuple."""
-        calendar_heading = self.find(By.CSS_SELECTOR,
-                                     'div.calendar-header-label')
-        Assignment.scroll_to(self.driver, calendar_heading)
-        calendar_date = calendar_heading.text
+        def read_heading(heading):
+            Assignment.scroll_to(self.driver, heading)
+            return heading.text
+
+        calendar_date = self.cache.use(LOCATORS.get('calendar.heading'),
+                                       read_heading)
         month, year = calendar_date.split(' ')
         return self.get_month_number(month), int(year)
 
@@ -814,19 +1182,19 @@ class Teacher(User):
             return
         cal_month, cal_year = self.get_month_year()
         while cal_year < target_date.year:
-            self.find(By.CLASS_NAME, 'fa-caret-right').click()
+            self.cache.click(LOCATORS.get('calendar.next'))
             sleep(0.2)
             cal_month, cal_year = self.get_month_year()
         while cal_month < target_date.month:
-            self.find(By.CLASS_NAME, 'fa-caret-right').click()
+            self.cache.click(LOCATORS.get('calendar.next'))
             sleep(0.2)
             cal_month, cal_year = self.get_month_year()
         while cal_year > target_date.year:
-            self.find(By.CLASS_NAME, 'fa-caret-left').click()
+            self.cache.click(LOCATORS.get('calendar.previous'))
             sleep(0.2)
             cal_month, cal_year = self.get_month_year()
         while cal_month > target_date.month:
-            self.find(By.CLASS_NAME, 'fa-caret-left').click()
+            self.cache.click(LOCATORS.get('calendar.previous'))
             sleep(0.2)
             cal_month, cal_year = self.get_month_year()
 
@@ -840,8 +1208,19 @@ class Student(User):
     def __init__(self,
                  use_env_vars=False,
                  existing_driver=None,
+                 think_time=None,
+                 pacer=None,
                  **kwargs):
-        """Student initialization with User pass-through."""
+        """Student initialization with User pass-through.
+
+        think_time (callable): think_time(step, default) returns the pause,
+            in seconds, used in place of the built-in step sleeps
+        pacer (staxing.load.Pacer): shared limiter awaited before each
+            question is loaded
+        """
+        self.think_time = think_time
+        self.pacer = pacer
+        self.latency = LatencyRecorder()
         if use_env_vars:
             if not kwargs:
                 kwargs = {}
@@ -854,17 +1233,25 @@ class Student(User):
         super(Student, self).__init__(existing_driver=existing_driver,
                                       **kwargs)
 
+    def think(self, step, default):
+        """Pause between steps for the configured think time."""
+        seconds = self.think_time(step, default) if self.think_time \
+            else default
+        if seconds > 0:
+            self.sleep(seconds)
+
+    @measured
+    @traced
     def goto_menu_item(self, item):
         """Go to a specific user menu item."""
-        print('Enter: goto_menu_item')
         if 'courses' in self.driver.current_url:
             self.open_user_menu()
             self.wait.until(
                 expect.element_to_be_clickable((By.LINK_TEXT, item))
             ).click()
-            self.page.wait_for_page_load()
-        print('Exit: goto_menu_item')
+            self.wait.load()
 
+    @measured
     def goto_dashboard(self):
         """Go to current work."""
         self.goto_menu_item('Dashboard')
@@ -878,14 +1265,16 @@ class Student(User):
         )
         raise NotImplementedError(inspect.currentframe().f_code.co_name)
 
+    @measured
     def goto_past_work(self):
         """View work for previous weeks."""
         self.goto_dashboard()
         self.wait.until(
             expect.element_to_be_clickable((By.LINK_TEXT, 'All Past Work'))
         ).click()
-        self.page.wait_for_page_load()
+        self.wait.load()
 
+    @measured
     def goto_performance_forecast(self):
         """View the student performance forecast."""
         self.goto_menu_item('Performance Forecast')
@@ -896,8 +1285,8 @@ class Student(User):
         self.goto_dashboard()
         # Wait for the student performance meters to load
         try:
-            print('Loading Performance Forecast')
-            WebDriverWait(self.driver, 60).until(
+            LOG.debug(self, 'Loading Performance Forecast')
+            EventWait(self.driver, 60).until(
                 expect.staleness_of(
                     (By.CLASS_NAME, 'is-loading')
                 )
@@ -905,25 +1294,21 @@ class Student(User):
         except:
             pass
         finally:
-            self.sleep(2)
+            self.think('forecast', 2)
         # Select a section or the weakest topic to practice
         options.append(
             self.wait.until(
                 expect.visibility_of_element_located(
-                    (By.CLASS_NAME, 'practice')
+                    LOCATORS.get('practice.button')
                 )
             )
         )
         if practice_set == 'weakest':
             options[0].click()
-            self.page.wait_for_page_load()
+            self.wait.load()
         else:
             try:
-                sections = self.find_all(
-                    By.XPATH,
-                    '//button[contains(@aria-describedby,' +
-                    '"progress-bar-tooltip-")]'
-                )
+                sections = self.find_all(*LOCATORS.get('practice.sections'))
                 if not isinstance(sections, list):
                     sections = [sections]
                 for section in sections:
@@ -932,11 +1317,11 @@ class Student(User):
                 pass
             finally:
                 options[randint(0, len(options) - 1)].click()
-                self.page.wait_for_page_load()
+                self.wait.load()
         # How many questions are there? (default = 5)
         breadbox = self.wait.until(
             expect.presence_of_element_located(
-                (By.CLASS_NAME, 'task-breadcrumbs')
+                LOCATORS.get('practice.breadcrumbs')
             )
         )
         crumbs = breadbox.find_elements(By.TAG_NAME, 'span')
@@ -946,56 +1331,59 @@ class Student(User):
         # Finish the practice
         self.wait.until(
             expect.element_to_be_clickable(
-                (By.XPATH, '//a[contains(text(),"Dashboard") and' +
-                 ' contains(@class,"btn")]')
+                LOCATORS.get('practice.dashboard')
             )
         ).click()
-        self.page.wait_for_page_load()
+        self.wait.load()
 
     def answer_assessment(self):
         """Answer a Tutor assessment."""
-        self.wait.until(
-            expect.presence_of_element_located(
-                (By.CLASS_NAME, 'openstax-question')
+        if self.pacer:
+            self.pacer.wait()
+        with self.latency.time('question load'):
+            self.wait.until(
+                expect.presence_of_element_located(
+                    LOCATORS.get('question.body')
+                )
             )
-        )
         text = chomsky(1, 500)
         wt = self.wait_time
         try:
             self.change_wait_time(3)
-            text_block = self.find(By.XPATH, '//textarea')
+            text_block = self.find(*LOCATORS.get('question.free_response'))
             self.change_wait_time(wt)
-            print('Enter free response')
+            LOG.debug(self, 'Enter free response')
             Assignment.send_keys(self.driver, text_block, text)
-            self.find(By.CLASS_NAME, 'continue').click()
+            self.find(*LOCATORS.get('question.continue')).click()
         except Exception:
             self.change_wait_time(wt)
-            print('Skip free response')
+            LOG.debug(self, 'Skip free response')
         finally:
-            self.page.wait_for_page_load()
-        answers = self.find_all(By.CLASS_NAME, 'answer-letter')
-        self.sleep(0.8)
+            self.wait.load()
+        answers = self.find_all(*LOCATORS.get('question.answers'))
+        self.think('read', 0.8)
         rand = randint(0, len(answers) - 1)
         answer = chr(ord('a') + rand)
-        print('Selecting %s' % answer)
+        LOG.debug(self, 'Selecting %s', answer)
         Assignment.scroll_to(self.driver, answers[0])
         if answer == 'a':
             self.driver.execute_script('window.scrollBy(0, -160);')
         elif answer == 'd':
             self.driver.execute_script('window.scrollBy(0, 160);')
         answers[rand].click()
-        self.sleep(1.0)
-        self.wait.until(
-            expect.element_to_be_clickable(
-                (By.XPATH, '//button[span[text()="Submit"]]')
-            )
-        ).click()
-        self.wait.until(
-            expect.element_to_be_clickable(
-                (By.CLASS_NAME, 'continue')
+        self.think('answer', 1.0)
+        with self.latency.time('submit'):
+            self.wait.until(
+                expect.element_to_be_clickable(
+                    LOCATORS.get('question.submit'))
+            ).click()
+            next_step = self.wait.until(
+                expect.element_to_be_clickable(
+                    LOCATORS.get('question.continue'))
             )
-        ).click()
-        self.page.wait_for_page_load()
+        with self.latency.time('continue'):
+            next_step.click()
+            self.wait.load()
 
 
 class Admin(User):
@@ -1020,74 +1408,129 @@ class Admin(User):
         extension = '' if self.url.endswith('/') else '/'
         self.base = self.url + extension + 'admin'
 
+    @measured
     def goto_admin_control(self):
         """Access the administrator controls."""
         self.get('%s' % self.base)
 
+    @measured
     def goto_catalog_offerings(self):
         """Access the catalog."""
         self.get('%s%s' % (self.base, '/catalog_offerings'))
 
+    @measured
     def goto_course_list(self):
         """Access the course list."""
         self.get('%s%s' % (self.base, '/courses'))
 
+    @measured
     def goto_school_list(self):
         """Access the school list."""
-        self.get('%s%s' % (self.base, '/school'))
+        self.get('%s%s' % (self.base, '/schools'))
 
+    @measured
     def goto_district_list(self):
         """Access the district list."""
         self.get('%s%s' % (self.base, '/districts'))
 
+    @measured
     def goto_tag_list(self):
         """Access the tag list."""
         self.get('%s%s' % (self.base, '/tags'))
 
+    @measured
     def goto_ecosystems(self):
         """Access the ecosystem list."""
         self.get('%s%s' % (self.base, '/ecosystems'))
 
+    @measured
     def goto_terms_and_contracts(self):
         """Access the terms and contracts list."""
         self.get('%s%s' % (self.url, '/fine_print'))
 
+    @measured
     def goto_contracts(self):
         """Access the targeted contracts."""
         self.get('%s%s' % (self.base, '/targeted_contracts'))
 
+    @measured
     def goto_course_stats(self):
         """Access the course stats."""
         self.get('%s%s' % (self.base, '/stats/courses'))
 
+    @measured
     def goto_concept_coach_stats(self):
         """Access the Concept Coach stats."""
         self.get('%s%s' % (self.base, '/stats/concept_coach'))
 
+    @measured
     def goto_user_list(self):
         """Access the user list."""
         self.get('%s%s' % (self.base, '/users'))
 
+    @measured
     def goto_jobs(self):
         """Access the jobs list."""
         self.get('%s%s' % (self.base, '/jobs'))
 
+    @measured
     def goto_research_data(self):
         """Access the researcher data."""
         self.get('%s%s' % (self.base, '/research_data'))
 
+    @measured
     def goto_salesforce_control(self):
         """Access the Salesforce controls."""
         self.get('%s%s' % (self.base, '/salesforce'))
 
+    @measured
     def goto_system_settings(self):
         """Access the system settings."""
         self.get('%s%s' % (self.base, '/settings'))
 
+    @measured
     def goto_system_notifications(self):
         """Access the system notifications."""
         self.get('%s%s' % (self.base, '/notifications'))
 
+    def job_watcher(self, **kwargs):
+        """Return a watcher polling background jobs with this login."""
+        return JobWatcher.from_driver(self.driver, self.url, **kwargs)
+
+    def wait_for_jobs(self, job_ids, timeout=600, **kwargs):
+        """Wait for background jobs to finish; return {job id: status}."""
+        return self.job_watcher(**kwargs).wait(job_ids, timeout)
+
+    def table(self, path, filters=None, **kwargs):
+        """Return a lazy row iterator for an admin list page.
+
+        path (string): list path below the admin base, e.g. '/users'
+        filters (dict): query string parameters, e.g. {'query': 'qa_'}
+        """
+        session = session_from_driver(self.driver)
+        return AdminTable(session, '%s%s' % (self.base, path), filters,
+                          **kwargs)
+
+    def users(self, **filters):
+        """Stream the user list."""
+        return self.table('/users', filters)
+
+    def courses(self, **filters):
+        """Stream the course list."""
+        return self.table('/courses', filters)
+
+    def schools(self, **filters):
+        """Stream the school list."""
+        return self.table('/schools', filters)
+
+    def districts(self, **filters):
+        """Stream the district list."""
+        return self.table('/districts', filters)
+
+    def jobs(self, **filters):
+        """Stream the jobs list."""
+        return self.table('/jobs', filters)
+
 
 class ContentQA(User):
     """User extention for content users."""
@@ -1109,31 +1552,118 @@ class ContentQA(User):
         super(ContentQA, self).__init__(existing_driver=existing_driver,
                                         **kwargs)
 
+    def crawl_book(self, book, report=None, site='https://demo.cnx.org/',
+                   archive='https://archive.cnx.org/', index=None,
+                   **kwargs):
+        """Check every page of a book over HTTP; return the summary.
 
-class Webview(object):
-    """Webview navigation and control."""
+        book (string): book uuid@version
+        report (string): JSON lines file receiving one line per page
+        index (string): ContentIndex database; only pages changed since the
+            last crawl with the same index are checked again
+        kwargs: BookCrawler options (checks, workers, timeout)
+        """
+        toc = BookTOC(book, site, archive)
+        index = ContentIndex(index) if index else None
+        try:
+            return BookCrawler(toc, index=index, **kwargs).run(report)
+        finally:
+            if index is not None:
+                index.close()
 
-    def __init__(self, driver, wait_time=30, site='https://demo.cnx.org/'):
-        """Webview constructor."""
+
+class Webview(object):
+    """Webview navigation and control.
+
+    Pages are resolved from the book's table of contents, which is fetched
+    from the archive once per book version and cached on disk.
+    """
+
+    PREFETCH_SCRIPT = '''
+        var link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.href = arguments[0];
+        document.head.appendChild(link);
+    '''
+
+    def __init__(self, driver, wait_time=30, site='https://demo.cnx.org/',
+                 book=None, archive='https://archive.cnx.org/',
+                 cache_dir=None, prefetch=True):
+        """Webview constructor.
+
+        book (string): book uuid@version; defaults to the open book
+        archive (string): archive serving the book's table of contents
+        cache_dir (string): table of contents cache directory
+        prefetch (bool): have the browser fetch the next page in advance
+        """
         self.driver = driver
         self.wait = WebDriverWait(driver, wait_time)
         self.site = site
+        self.book = book
+        self.archive = archive
+        self.cache_dir = cache_dir
+        self.prefetch = prefetch
+        self.position = None
+        self._toc = None
+
+    @property
+    def toc(self):
+        """Return the book's table of contents."""
+        if self._toc is None:
+            book = self.book if self.book else \
+                book_from_url(self.driver.current_url)[0]
+            if book is None:
+                raise ValueError('No book open at %s' %
+                                 self.driver.current_url)
+            self._toc = BookTOC(book, self.site, self.archive,
+                                self.cache_dir)
+        return self._toc
+
+    def _index(self):
+        """Return the reading order position of the current page."""
+        entry = self.toc.locate(self.driver.current_url)
+        return entry.index if entry is not None else self.position
+
+    def _open(self, entry):
+        """Load a page and hint the browser to fetch the one after it."""
+        self.driver.get(entry.url)
+        self.position = entry.index
+        if self.prefetch and entry.index + 1 < len(self.toc):
+            try:
+                self.driver.execute_script(Webview.PREFETCH_SCRIPT,
+                                           self.toc[entry.index + 1].url)
+            except WebDriverException as err:
+                LOG.debug(self, 'Prefetch skipped: %s', err)
+        return entry
 
     def goto_section(self, section_name=None, section_number=None):
         """Go to a specific page module."""
-        raise NotImplementedError(inspect.currentframe().f_code.co_name)
+        return self._open(self.toc.find(section_name, section_number))
 
     def next(self):
         """Go to the next page module."""
-        raise NotImplementedError(inspect.currentframe().f_code.co_name)
+        index = self._index()
+        index = 0 if index is None else index + 1
+        if index >= len(self.toc):
+            raise IndexError('Already on the last page')
+        return self._open(self.toc[index])
 
     def previous(self):
         """Go to the previous page module."""
-        raise NotImplementedError(inspect.currentframe().f_code.co_name)
+        index = self._index()
+        if not index:
+            raise IndexError('Already on the first page')
+        return self._open(self.toc[index - 1])
 
     def goto_concept_coach(self):
         """Go to the Concept Coach widget."""
-        raise NotImplementedError(inspect.currentframe().f_code.co_name)
+        coach = self.wait.until(
+            expect.presence_of_element_located(
+                LOCATORS.get('webview.concept_coach')
+            )
+        )
+        self.driver.execute_script('arguments[0].scrollIntoView();', coach)
+        return coach
 
 
 if __name__ == '__main__':
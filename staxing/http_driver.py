@@ -0,0 +1,667 @@
+"""Browserless WebDriver stand-in for server-rendered pages.
+
+HTTPDriver implements the part of the WebDriver interface the helpers use
+on the Tutor admin and OpenStax Accounts pages: navigation, element lookup
+by ID, name, class, tag, CSS, link text and a subset of XPath, element
+text and attributes, typing and form submission. There is no JavaScript;
+pages are fetched with requests and parsed with BeautifulSoup.
+"""
+
+import re
+import uuid
+
+from urllib.parse import urljoin
+
+import requests
+
+from bs4 import BeautifulSoup, NavigableString
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+__version__ = '0.0.1'
+
+XPATH_STEP = re.compile(r'(//|/)?(\.\.|\.|[\w*-]+)((?:\[[^\]]*\])*)')
+PREDICATE = re.compile(r'\[([^\]]*)\]')
+QUOTED = r'(["\'])(.*?)\{0}'
+OPERAND = r'(@[\w:-]+|text\(\)|\.|normalize-space\(\.?\))'
+COMPARE = re.compile(r'^%s\s*=\s*%s$' % (OPERAND, QUOTED.format(2)))
+FUNCTION = re.compile(r'^(contains|starts-with)\(\s*%s\s*,\s*%s\s*\)$' %
+                      (OPERAND, QUOTED.format(3)))
+HAS_ATTRIBUTE = re.compile(r'^@([\w:-]+)$')
+POSITION = re.compile(r'^(\d+|last\(\))$')
+BOOLEAN_ATTRIBUTES = ('checked', 'selected', 'disabled', 'readonly',
+                      'required', 'multiple', 'hidden')
+FIELDS = ('input', 'select', 'textarea', 'button')
+READY_STATE = re.compile(r'^\s*return\s+document\.readyState\s*;?\s*$')
+
+
+def text_of(node):
+    """Return an element's text with whitespace collapsed, like .text."""
+    return ' '.join(node.get_text(' ').split())
+
+
+def _operand(node, operand):
+    """Return the string value of an XPath operand for a node."""
+    if operand.startswith('@'):
+        value = node.get(operand[1:])
+        return ' '.join(value) if isinstance(value, list) else value
+    if operand == 'text()':
+        return ''.join(child for child in node.children
+                       if isinstance(child, NavigableString))
+    return text_of(node)
+
+
+def _matches(node, condition):
+    """Return True if a node satisfies one XPath predicate clause."""
+    condition = condition.strip()
+    found = HAS_ATTRIBUTE.match(condition)
+    if found:
+        return node.has_attr(found.group(1))
+    found = COMPARE.match(condition)
+    if found:
+        value = _operand(node, found.group(1))
+        if found.group(1).startswith('normalize'):
+            value = ' '.join((value or '').split())
+        return value == found.group(3)
+    found = FUNCTION.match(condition)
+    if found:
+        value = _operand(node, found.group(2)) or ''
+        if found.group(1) == 'contains':
+            return found.group(4) in value
+        return value.startswith(found.group(4))
+    if condition.startswith('not(') and condition.endswith(')'):
+        return not _matches(node, condition[4:-1])
+    raise InvalidSelectorException('Unsupported XPath predicate: [%s]' %
+                                   condition)
+
+
+def _filter(nodes, predicate):
+    """Apply one bracketed XPath predicate to a step's nodes."""
+    position = POSITION.match(predicate.strip())
+    if position:
+        index = len(nodes) if position.group(1) == 'last()' else \
+            int(position.group(1))
+        return nodes[index - 1:index] if 0 < index <= len(nodes) else []
+    clauses = re.split(r'\s+and\s+', predicate)
+    return [node for node in nodes
+            if all(_matches(node, clause) for clause in clauses)]
+
+
+def xpath(document, context, expression):
+    """Evaluate the supported XPath subset and return matching nodes.
+
+    Steps use '/', '//', '.', '..', a tag name or '*'; predicates are a
+    position, last(), @attr, comparisons of @attr, text(), '.' or
+    normalize-space() with a quoted string, contains(), starts-with(),
+    not() and 'and'.
+    """
+    expression = expression.strip()
+    if expression.startswith('(') or '|' in expression:
+        raise InvalidSelectorException('Unsupported XPath: %s' % expression)
+    if expression.startswith('/'):
+        current = [document]
+    else:
+        current = [context]
+        if expression.startswith('.') and not expression.startswith('..'):
+            expression = expression[1:]
+        if expression and not expression.startswith('/'):
+            expression = '/' + expression
+    position = 0
+    while position < len(expression):
+        step = XPATH_STEP.match(expression, position)
+        if step is None or step.end() == position:
+            raise InvalidSelectorException('Unsupported XPath: %s' %
+                                           expression)
+        position = step.end()
+        axis, name, predicates = step.groups()
+        selected = []
+        seen = set()
+        for node in current:
+            if name == '.':
+                found = [node]
+            elif name == '..':
+                found = [node.parent] if node.parent is not None else []
+            else:
+                found = node.find_all(True if name == '*' else name,
+                                      recursive=axis == '//')
+            for predicate in PREDICATE.findall(predicates):
+                found = _filter(found, predicate)
+            for match in found:
+                if id(match) not in seen:
+                    seen.add(id(match))
+                    selected.append(match)
+        current = selected
+    return [node for node in current if node is not document]
+
+
+class HTTPElement(object):
+    """WebElement stand-in bound to one parsed page."""
+
+    def __init__(self, parent, node, generation):
+        """Element constructor."""
+        self._parent = parent
+        self.node = node
+        self.generation = generation
+        self._id = uuid.uuid4().hex
+
+    def __repr__(self):
+        """Return the tag and element id."""
+        return '<HTTPElement %s %s>' % (self.node.name, self._id)
+
+    def __eq__(self, other):
+        """Elements are equal when they wrap the same node."""
+        return isinstance(other, HTTPElement) and other.node is self.node
+
+    def __hash__(self):
+        """Hash on the wrapped node."""
+        return id(self.node)
+
+    @property
+    def parent(self):
+        """Return the owning driver."""
+        return self._parent
+
+    @property
+    def id(self):
+        """Return the element id."""
+        return self._id
+
+    def _execute(self, command, params=None):
+        """Send an element command through the driver."""
+        params = dict(params or {})
+        params['id'] = self
+        return self._parent.execute(command, params)['value']
+
+    def _live(self):
+        """Return the node, or raise if the page has since changed."""
+        if self.generation != self._parent.generation:
+            raise StaleElementReferenceException(
+                'Element is not attached to the current page')
+        return self.node
+
+    @property
+    def tag_name(self):
+        """Return the element's tag name."""
+        return self._live().name
+
+    @property
+    def text(self):
+        """Return the element's text."""
+        return self._execute(Command.GET_ELEMENT_TEXT)
+
+    def get_attribute(self, name):
+        """Return an attribute or property value, like WebElement."""
+        return self._execute(Command.GET_ELEMENT_ATTRIBUTE, {'name': name})
+
+    def get_property(self, name):
+        """Return a property value."""
+        return self.get_attribute(name)
+
+    def is_displayed(self):
+        """Return False for hidden inputs and hidden or display:none trees."""
+        return self._execute(Command.IS_ELEMENT_DISPLAYED)
+
+    def is_enabled(self):
+        """Return False for disabled form fields."""
+        return self._execute(Command.IS_ELEMENT_ENABLED)
+
+    def is_selected(self):
+        """Return True for checked boxes and selected options."""
+        return self._execute(Command.IS_ELEMENT_SELECTED)
+
+    def clear(self):
+        """Empty a text field."""
+        self._execute(Command.CLEAR_ELEMENT)
+
+    def send_keys(self, *value):
+        """Type into a text field."""
+        self._execute(Command.SEND_KEYS_TO_ELEMENT,
+                      {'text': ''.join(str(part) for part in value)})
+
+    def click(self):
+        """Follow a link, submit a form, or toggle a box or option."""
+        self._execute(Command.CLICK_ELEMENT)
+
+    def submit(self):
+        """Submit the element's form."""
+        self._execute(Command.SUBMIT_ELEMENT)
+
+    def find_element(self, by=By.ID, value=None):
+        """Find the first matching descendant."""
+        return self._execute(Command.FIND_CHILD_ELEMENT,
+                             {'using': by, 'value': value})
+
+    def find_elements(self, by=By.ID, value=None):
+        """Find every matching descendant."""
+        return self._execute(Command.FIND_CHILD_ELEMENTS,
+                             {'using': by, 'value': value})
+
+    def find_element_by_id(self, id_):
+        """Find a descendant by id."""
+        return self.find_element(By.ID, id_)
+
+    def find_element_by_css_selector(self, css_selector):
+        """Find a descendant by CSS selector."""
+        return self.find_element(By.CSS_SELECTOR, css_selector)
+
+    def find_element_by_xpath(self, xpath):
+        """Find a descendant by XPath."""
+        return self.find_element(By.XPATH, xpath)
+
+    def find_element_by_tag_name(self, name):
+        """Find a descendant by tag name."""
+        return self.find_element(By.TAG_NAME, name)
+
+    def find_elements_by_css_selector(self, css_selector):
+        """Find descendants by CSS selector."""
+        return self.find_elements(By.CSS_SELECTOR, css_selector)
+
+    def find_elements_by_tag_name(self, name):
+        """Find descendants by tag name."""
+        return self.find_elements(By.TAG_NAME, name)
+
+
+class HTTPDriver(object):
+    """requests-backed WebDriver for pages that need no JavaScript.
+
+    session (requests.Session): session to reuse, e.g. with login cookies
+    timeout (float): seconds to wait for each HTTP response
+    """
+
+    name = 'http'
+
+    def __init__(self, session=None, timeout=30):
+        """Driver constructor."""
+        self.http_session = session if session is not None else \
+            requests.Session()
+        self.timeout = timeout
+        self.session_id = uuid.uuid4().hex
+        self.capabilities = {'browserName': 'http',
+                             'javascriptEnabled': False}
+        self.w3c = False
+        self.generation = 0
+        self.window = {'width': 1280, 'height': 1024}
+        self.history = []
+        self.index = -1
+        self.response = None
+        self.document = BeautifulSoup('', 'html.parser')
+        self._url = 'about:blank'
+        self.handlers = {
+            Command.GET: lambda params: self._open(params['url']),
+            Command.GO_BACK: lambda params: self._step(-1),
+            Command.GO_FORWARD: lambda params: self._step(1),
+            Command.REFRESH: lambda params: self._step(0),
+            Command.GET_CURRENT_URL: lambda params: self._url,
+            Command.GET_TITLE: lambda params: self._title(),
+            Command.GET_PAGE_SOURCE: lambda params: str(self.document),
+            Command.FIND_ELEMENT: lambda params: self._find(
+                self.document, params['using'], params['value'], True),
+            Command.FIND_ELEMENTS: lambda params: self._find(
+                self.document, params['using'], params['value'], False),
+            Command.FIND_CHILD_ELEMENT: lambda params: self._find(
+                params['id']._live(), params['using'], params['value'],
+                True),
+            Command.FIND_CHILD_ELEMENTS: lambda params: self._find(
+                params['id']._live(), params['using'], params['value'],
+                False),
+            Command.GET_ELEMENT_TEXT: lambda params: text_of(
+                params['id']._live()),
+            Command.GET_ELEMENT_ATTRIBUTE: lambda params: self._attribute(
+                params['id']._live(), params['name']),
+            Command.IS_ELEMENT_DISPLAYED: lambda params: self._displayed(
+                params['id']._live()),
+            Command.IS_ELEMENT_ENABLED: lambda params: not params[
+                'id']._live().has_attr('disabled'),
+            Command.IS_ELEMENT_SELECTED: lambda params: self._selected(
+                params['id']._live()),
+            Command.CLEAR_ELEMENT: lambda params: self._type(
+                params['id']._live(), None),
+            Command.SEND_KEYS_TO_ELEMENT: lambda params: self._type(
+                params['id']._live(), params['text']),
+            Command.CLICK_ELEMENT: lambda params: self._click(
+                params['id']._live()),
+            Command.SUBMIT_ELEMENT: lambda params: self._submit(
+                params['id']._live()),
+            Command.GET_ALL_COOKIES: lambda params: [
+                {'name': cookie.name, 'value': cookie.value,
+                 'domain': cookie.domain, 'path': cookie.path}
+                for cookie in self.http_session.cookies],
+            Command.DELETE_ALL_COOKIES: lambda params:
+                self.http_session.cookies.clear(),
+            Command.GET_WINDOW_SIZE: lambda params: dict(self.window),
+            Command.SET_WINDOW_SIZE: lambda params: self.window.update(
+                width=params['width'], height=params['height']),
+            Command.QUIT: lambda params: self.http_session.close(),
+        }
+
+    def execute(self, driver_command, params=None):
+        """Run a WebDriver command and return {'value': result}."""
+        handler = self.handlers.get(driver_command)
+        if handler is None:
+            raise WebDriverException('%s is not supported by the HTTP driver'
+                                     % driver_command)
+        return {'value': handler(params or {})}
+
+    def _load(self, response):
+        """Parse a response as the current page."""
+        response.raise_for_status()
+        self.response = response
+        self._url = response.url
+        self.document = BeautifulSoup(response.text, 'html.parser')
+        self.generation += 1
+
+    def _open(self, url, method='GET', data=None):
+        """Request a page, record it in the history and load it."""
+        url = urljoin(self._url, url)
+        if method == 'GET':
+            response = self.http_session.get(url, params=data,
+                                             timeout=self.timeout)
+        else:
+            response = self.http_session.post(url, data=data,
+                                              timeout=self.timeout)
+        self.history = self.history[:self.index + 1] + [response.url]
+        self.index = len(self.history) - 1
+        self._load(response)
+
+    def _step(self, offset):
+        """Move through the history, reloading the target page."""
+        index = min(max(self.index + offset, 0), len(self.history) - 1)
+        if index < 0:
+            return
+        self.index = index
+        self._load(self.http_session.get(self.history[index],
+                                         timeout=self.timeout))
+
+    def _title(self):
+        """Return the page title."""
+        title = self.document.find('title')
+        return text_of(title) if title is not None else ''
+
+    def _wrap(self, nodes):
+        """Wrap parsed nodes for the current page."""
+        return [HTTPElement(self, node, self.generation) for node in nodes]
+
+    def _find(self, root, by, value, first):
+        """Locate nodes below root with a Selenium strategy."""
+        if by == By.ID:
+            nodes = root.find_all(id=value)
+        elif by == By.NAME:
+            nodes = root.find_all(attrs={'name': value})
+        elif by == By.CLASS_NAME:
+            nodes = root.find_all(class_=value)
+        elif by == By.TAG_NAME:
+            nodes = root.find_all(value)
+        elif by == By.CSS_SELECTOR:
+            try:
+                nodes = root.select(value)
+            except Exception as err:
+                raise InvalidSelectorException(str(err))
+        elif by == By.XPATH:
+            nodes = xpath(self.document, root, value)
+        elif by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+            nodes = [link for link in root.find_all('a')
+                     if (text_of(link) == value if by == By.LINK_TEXT
+                         else value in text_of(link))]
+        else:
+            raise InvalidSelectorException('Unsupported strategy: %s' % by)
+        elements = self._wrap(nodes)
+        if not first:
+            return elements
+        if not elements:
+            raise NoSuchElementException('Unable to locate %s "%s" on %s' %
+                                         (by, value, self._url))
+        return elements[0]
+
+    def _attribute(self, node, name):
+        """Return an attribute the way WebElement.get_attribute does."""
+        if name == 'value' and node.name == 'textarea':
+            return node.get_text()
+        if name == 'value' and node.name == 'select':
+            option = self._option(node)
+            return option.get('value', text_of(option)) if option else None
+        if name in ('textContent', 'innerText'):
+            return node.get_text() if name == 'textContent' else \
+                text_of(node)
+        if name == 'innerHTML':
+            return node.decode_contents()
+        if name == 'outerHTML':
+            return str(node)
+        if name in BOOLEAN_ATTRIBUTES:
+            return 'true' if node.has_attr(name) else None
+        if name == 'href' and node.has_attr('href'):
+            return urljoin(self._url, node['href'])
+        value = node.get(name)
+        if value is None and name == 'value' and node.name == 'input':
+            return ''
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def _displayed(self, node):
+        """Return True unless the node or an ancestor is hidden."""
+        if node.name == 'input' and node.get('type', '').lower() == 'hidden':
+            return False
+        while node is not None and node is not self.document:
+            style = (node.get('style') or '').replace(' ', '').lower()
+            if node.has_attr('hidden') or 'display:none' in style or \
+                    node.name in ('head', 'script', 'style', 'template'):
+                return False
+            node = node.parent
+        return True
+
+    def _selected(self, node):
+        """Return True for checked inputs and selected options."""
+        return node.has_attr('checked') or node.has_attr('selected')
+
+    def _type(self, node, text):
+        """Append text to a field, or clear it when text is None."""
+        if node.name == 'textarea':
+            node.string = '' if text is None else node.get_text() + text
+        elif node.name == 'input':
+            node['value'] = '' if text is None else \
+                node.get('value', '') + text
+        else:
+            raise WebDriverException('Element <%s> is not editable' %
+                                     node.name)
+
+    def _option(self, select):
+        """Return the selected option of a select, or its first option."""
+        options = select.find_all('option')
+        for option in options:
+            if option.has_attr('selected'):
+                return option
+        return options[0] if options else None
+
+    def _click(self, node):
+        """Act on a click the way the browser would without scripts."""
+        kind = node.get('type', '').lower()
+        if node.name == 'a' and node.get('href') and \
+                not node['href'].startswith(('#', 'javascript:')):
+            self._open(node['href'])
+        elif node.name == 'option':
+            select = node.find_parent('select')
+            if select is not None and not select.has_attr('multiple'):
+                for option in select.find_all('option'):
+                    del option['selected']
+            node['selected'] = 'selected'
+        elif node.name == 'input' and kind == 'checkbox':
+            if node.has_attr('checked'):
+                del node['checked']
+            else:
+                node['checked'] = 'checked'
+        elif node.name == 'input' and kind == 'radio':
+            form = node.find_parent('form') or self.document
+            for other in form.find_all('input', attrs={
+                    'type': 'radio', 'name': node.get('name')}):
+                del other['checked']
+            node['checked'] = 'checked'
+        elif (node.name == 'input' and kind in ('submit', 'image')) or \
+                (node.name == 'button' and kind in ('', 'submit')):
+            self._submit(node, submitter=node)
+
+    def _fields(self, form, submitter):
+        """Return the form's successful controls as (name, value) pairs."""
+        data = []
+        for field in form.find_all(FIELDS):
+            name = field.get('name')
+            kind = field.get('type', '').lower()
+            if not name or field.has_attr('disabled'):
+                continue
+            if field.name == 'button' or kind in ('submit', 'image',
+                                                  'button', 'reset'):
+                if field is submitter:
+                    data.append((name, field.get('value', '')))
+            elif kind in ('checkbox', 'radio'):
+                if field.has_attr('checked'):
+                    data.append((name, field.get('value', 'on')))
+            elif field.name == 'select':
+                option = self._option(field)
+                if option is not None:
+                    data.append((name, option.get('value', text_of(option))))
+            else:
+                data.append((name, self._attribute(field, 'value')))
+        return data
+
+    def _submit(self, node, submitter=None):
+        """Send the node's form and load the response."""
+        form = node if node.name == 'form' else node.find_parent('form')
+        if form is None:
+            raise NoSuchElementException('Element <%s> is not in a form' %
+                                         node.name)
+        action = (submitter.get('formaction') if submitter else None) or \
+            form.get('action') or self._url
+        method = form.get('method', 'get').upper()
+        self._open(action, 'POST' if method == 'POST' else 'GET',
+                   self._fields(form, submitter))
+
+    def get(self, url):
+        """Load a page."""
+        self.execute(Command.GET, {'url': url})
+
+    def back(self):
+        """Go back one page."""
+        self.execute(Command.GO_BACK)
+
+    def forward(self):
+        """Go forward one page."""
+        self.execute(Command.GO_FORWARD)
+
+    def refresh(self):
+        """Reload the current page."""
+        self.execute(Command.REFRESH)
+
+    @property
+    def current_url(self):
+        """Return the current URL."""
+        return self.execute(Command.GET_CURRENT_URL)['value']
+
+    @property
+    def title(self):
+        """Return the page title."""
+        return self.execute(Command.GET_TITLE)['value']
+
+    @property
+    def page_source(self):
+        """Return the page HTML, including typed field values."""
+        return self.execute(Command.GET_PAGE_SOURCE)['value']
+
+    def find_element(self, by=By.ID, value=None):
+        """Find the first matching element."""
+        return self.execute(Command.FIND_ELEMENT,
+                            {'using': by, 'value': value})['value']
+
+    def find_elements(self, by=By.ID, value=None):
+        """Find every matching element."""
+        return self.execute(Command.FIND_ELEMENTS,
+                            {'using': by, 'value': value})['value']
+
+    def find_element_by_id(self, id_):
+        """Find an element by id."""
+        return self.find_element(By.ID, id_)
+
+    def find_element_by_name(self, name):
+        """Find an element by name."""
+        return self.find_element(By.NAME, name)
+
+    def find_element_by_css_selector(self, css_selector):
+        """Find an element by CSS selector."""
+        return self.find_element(By.CSS_SELECTOR, css_selector)
+
+    def find_element_by_xpath(self, xpath):
+        """Find an element by XPath."""
+        return self.find_element(By.XPATH, xpath)
+
+    def find_element_by_link_text(self, link_text):
+        """Find a link by its text."""
+        return self.find_element(By.LINK_TEXT, link_text)
+
+    def find_element_by_tag_name(self, name):
+        """Find an element by tag name."""
+        return self.find_element(By.TAG_NAME, name)
+
+    def find_elements_by_css_selector(self, css_selector):
+        """Find elements by CSS selector."""
+        return self.find_elements(By.CSS_SELECTOR, css_selector)
+
+    def find_elements_by_xpath(self, xpath):
+        """Find elements by XPath."""
+        return self.find_elements(By.XPATH, xpath)
+
+    def find_elements_by_tag_name(self, name):
+        """Find elements by tag name."""
+        return self.find_elements(By.TAG_NAME, name)
+
+    def execute_script(self, script, *args):
+        """Answer readiness checks; there is no JavaScript otherwise."""
+        if READY_STATE.match(script):
+            return 'complete'
+        raise WebDriverException('JavaScript is not available in the HTTP '
+                                 'driver')
+
+    def get_cookies(self):
+        """Return the session cookies."""
+        return self.execute(Command.GET_ALL_COOKIES)['value']
+
+    def delete_all_cookies(self):
+        """Drop every session cookie."""
+        self.execute(Command.DELETE_ALL_COOKIES)
+
+    def get_window_size(self, windowHandle='current'):
+        """Return the nominal window size."""
+        return self.execute(Command.GET_WINDOW_SIZE)['value']
+
+    def set_window_size(self, width, height, windowHandle='current'):
+        """Set the nominal window size."""
+        self.execute(Command.SET_WINDOW_SIZE,
+                     {'width': width, 'height': height})
+
+    def maximize_window(self):
+        """Nothing to maximize."""
+
+    def set_window_position(self, x, y, windowHandle='current'):
+        """Nothing to move."""
+
+    def implicitly_wait(self, time_to_wait):
+        """Pages are complete on arrival, so there is nothing to wait for."""
+
+    def set_page_load_timeout(self, time_to_wait):
+        """Use time_to_wait as the HTTP timeout."""
+        self.timeout = time_to_wait
+
+    def get_screenshot_as_png(self):
+        """There is nothing to screenshot."""
+        raise WebDriverException('The HTTP driver cannot take screenshots')
+
+    def get_log(self, log_type):
+        """There are no browser logs."""
+        return []
+
+    def close(self):
+        """Close the only window."""
+        self.quit()
+
+    def quit(self):
+        """Close the HTTP session."""
+        self.execute(Command.QUIT)
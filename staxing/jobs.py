@@ -0,0 +1,188 @@
+"""Wait on Tutor background jobs without reloading the admin jobs page."""
+
+import random
+import time
+
+from urllib.parse import urljoin
+
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+try:
+    from staxing.latency import LatencyRecorder
+except ImportError:
+    from latency import LatencyRecorder
+try:
+    from staxing.tutor_api import TutorAPI
+except ImportError:
+    from tutor_api import TutorAPI
+
+__version__ = '0.0.1'
+
+DONE = ('succeeded', 'failed', 'killed')
+RUNNING = ('started', 'working')
+
+
+class Job(object):
+    """Last known state and poll schedule of one background job."""
+
+    def __init__(self, job_id, interval):
+        """Job constructor."""
+        self.id = job_id
+        self.status = None
+        self.progress = None
+        self.data = {}
+        self.etag = None
+        self.interval = interval
+        self.next_poll = 0.0
+        self.added = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.polls = 0
+
+    @property
+    def done(self):
+        """Return True once the job reached a final state."""
+        return self.status in DONE
+
+    def summary(self):
+        """Return the job's status and timings."""
+        return {
+            'id': self.id,
+            'status': self.status,
+            'progress': self.progress,
+            'polls': self.polls,
+            'seconds': round(self.finished - self.added, 3)
+            if self.finished else None,
+            'errors': self.data.get('errors', []),
+        }
+
+
+class JobWatcher(object):
+    """Poll many background jobs from one loop.
+
+    Each job is polled on its own schedule: the delay grows by backoff
+    while the job reports no change (or the server answers 304 Not
+    Modified) and drops back to interval when it moves. Jitter spreads
+    the requests so many watchers do not poll in lockstep.
+
+    api (TutorAPI): client holding the admin login
+    interval (float): first and post-change poll delay in seconds
+    max_interval (float): longest poll delay
+    backoff (float): delay multiplier while a job is unchanged
+    jitter (float): random fraction added to or removed from each delay
+    """
+
+    def __init__(self, api, interval=0.5, max_interval=15.0, backoff=1.6,
+                 jitter=0.2):
+        """Watcher constructor."""
+        self.api = api
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.jobs = {}
+        self.latency = LatencyRecorder()
+        self.requests = 0
+        self.not_modified = 0
+        self.started = None
+
+    @classmethod
+    def from_driver(cls, driver, base_url, **kwargs):
+        """Build a watcher using the browser's admin login."""
+        return cls(TutorAPI.from_driver(driver, base_url), **kwargs)
+
+    def add(self, *job_ids):
+        """Start watching jobs."""
+        if self.started is None:
+            self.started = time.monotonic()
+        for job_id in job_ids:
+            if job_id not in self.jobs:
+                self.jobs[job_id] = Job(job_id, self.interval)
+        return self
+
+    def _delay(self, job):
+        """Return the job's next poll delay with jitter applied."""
+        return job.interval * random.uniform(1 - self.jitter,
+                                             1 + self.jitter)
+
+    def poll(self, job):
+        """Request one job's status and reschedule it."""
+        headers = {'If-None-Match': job.etag} if job.etag else {}
+        with self.latency.time('poll'):
+            response = self.api.session.get(
+                urljoin(self.api.base_url, 'api/jobs/%s' % job.id),
+                headers=headers, timeout=self.api.timeout)
+        self.requests += 1
+        job.polls += 1
+        now = time.monotonic()
+        changed = False
+        if response.status_code == 304:
+            self.not_modified += 1
+        else:
+            response.raise_for_status()
+            job.etag = response.headers.get('ETag')
+            data = response.json()
+            changed = (data.get('status'), data.get('progress')) != \
+                (job.status, job.progress)
+            job.data = data
+            job.status = data.get('status')
+            job.progress = data.get('progress')
+        if job.started is None and (job.status in RUNNING or job.done):
+            job.started = now
+            self.latency.record('queued', now - job.added)
+        if job.done and job.finished is None:
+            job.finished = now
+            self.latency.record('completed', now - job.added)
+            LOG.debug(self, 'Job %s %s after %s polls', job.id, job.status,
+                      job.polls)
+        job.interval = self.interval if changed else \
+            min(self.max_interval, job.interval * self.backoff)
+        job.next_poll = now + self._delay(job)
+        return job
+
+    def wait(self, job_ids=None, timeout=600):
+        """Poll until the jobs finish and return {job id: status}.
+
+        Raises TimeoutError listing the jobs still running.
+        """
+        if job_ids:
+            self.add(*job_ids)
+        watched = [self.jobs[job_id] for job_id in job_ids] if job_ids \
+            else list(self.jobs.values())
+        deadline = time.monotonic() + timeout
+        while True:
+            pending = [job for job in watched if not job.done]
+            if not pending:
+                break
+            now = time.monotonic()
+            if now > deadline:
+                raise TimeoutError('Jobs still running: %s' % ', '.join(
+                    str(job.id) for job in pending))
+            for job in pending:
+                if job.next_poll <= now:
+                    self.poll(job)
+            waiting = [job.next_poll for job in pending if not job.done]
+            if waiting:
+                time.sleep(max(0.0, min(min(waiting), deadline) -
+                               time.monotonic()))
+        return {job.id: job.status for job in watched}
+
+    def report(self):
+        """Return job throughput, latency and polling cost."""
+        finished = [job for job in self.jobs.values() if job.finished]
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        statuses = {}
+        for job in self.jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            'jobs': len(self.jobs),
+            'statuses': statuses,
+            'throughput_per_minute': round(len(finished) * 60.0 / elapsed, 2)
+            if elapsed else 0.0,
+            'requests': self.requests,
+            'not_modified': self.not_modified,
+            'latency': self.latency.summary(),
+            'detail': [job.summary() for job in self.jobs.values()],
+        }
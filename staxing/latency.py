@@ -0,0 +1,129 @@
+"""Latency histograms for timed helper steps."""
+
+import math
+import threading
+import time
+
+from contextlib import contextmanager
+
+__version__ = '0.0.1'
+
+
+class LatencyHistogram(object):
+    """Log-bucketed latency histogram, safe to share between threads.
+
+    Buckets grow by ten percent so percentiles are accurate to within
+    that step while memory stays constant regardless of sample count.
+    """
+
+    GROWTH = 1.1
+    FLOOR = 0.001  # seconds
+
+    def __init__(self):
+        """Histogram constructor."""
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.lock = threading.Lock()
+
+    def _bucket(self, seconds):
+        """Return the bucket index for a duration."""
+        if seconds <= self.FLOOR:
+            return 0
+        return int(math.log(seconds / self.FLOOR, self.GROWTH)) + 1
+
+    def _bound(self, bucket):
+        """Return the upper bound, in seconds, of a bucket."""
+        return self.FLOOR * self.GROWTH ** bucket
+
+    def record(self, seconds):
+        """Add one sample."""
+        bucket = self._bucket(seconds)
+        with self.lock:
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+            self.count += 1
+            self.total += seconds
+            if self.minimum is None or seconds < self.minimum:
+                self.minimum = seconds
+            if self.maximum is None or seconds > self.maximum:
+                self.maximum = seconds
+
+    def merge(self, other):
+        """Fold another histogram's samples into this one."""
+        with self.lock:
+            for bucket, count in other.buckets.items():
+                self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+            self.count += other.count
+            self.total += other.total
+            for value in (other.minimum, other.maximum):
+                if value is None:
+                    continue
+                if self.minimum is None or value < self.minimum:
+                    self.minimum = value
+                if self.maximum is None or value > self.maximum:
+                    self.maximum = value
+
+    def percentile(self, percent):
+        """Return the approximate duration at a percentile (0-100)."""
+        if not self.count:
+            return None
+        target = max(1, int(math.ceil(self.count * percent / 100.0)))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(self._bound(bucket), self.maximum)
+        return self.maximum
+
+    def summary(self):
+        """Return count, mean, min, max and common percentiles."""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.minimum,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.maximum,
+        }
+
+
+class LatencyRecorder(object):
+    """Named latency histograms for the steps of a flow."""
+
+    def __init__(self):
+        """Recorder constructor."""
+        self.steps = {}
+        self.lock = threading.Lock()
+
+    def histogram(self, step):
+        """Return the histogram for a step, creating it if needed."""
+        with self.lock:
+            if step not in self.steps:
+                self.steps[step] = LatencyHistogram()
+            return self.steps[step]
+
+    def record(self, step, seconds):
+        """Add one sample to a step."""
+        self.histogram(step).record(seconds)
+
+    @contextmanager
+    def time(self, step):
+        """Time the enclosed block as one sample of a step."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(step, time.perf_counter() - start)
+
+    def merge(self, other):
+        """Fold another recorder's histograms into this one."""
+        for step, histogram in list(other.steps.items()):
+            self.histogram(step).merge(histogram)
+
+    def summary(self):
+        """Return a summary per step."""
+        return {step: histogram.summary()
+                for step, histogram in sorted(self.steps.items())}
@@ -0,0 +1,157 @@
+"""Concurrent student practice load generator."""
+
+import random
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from staxing.helper import Student
+except ImportError:
+    from helper import Student
+try:
+    from staxing.latency import LatencyRecorder
+except ImportError:
+    from latency import LatencyRecorder
+
+__version__ = '0.0.1'
+
+
+def constant(seconds):
+    """Think for the same time at every step."""
+    return lambda step, default: seconds
+
+
+def uniform(low, high):
+    """Think for a uniformly random time between low and high seconds."""
+    return lambda step, default: random.uniform(low, high)
+
+
+def exponential(mean):
+    """Think for an exponentially distributed time with the given mean."""
+    return lambda step, default: random.expovariate(1.0 / mean)
+
+
+def lognormal(median, sigma=0.5):
+    """Think for a log-normally distributed time around a median."""
+    return lambda step, default: median * random.lognormvariate(0, sigma)
+
+
+def scaled(factor):
+    """Scale each step's built-in pause (0 removes the pauses)."""
+    return lambda step, default: default * factor
+
+
+class Pacer(object):
+    """Shared arrival-rate limiter for questions across student threads.
+
+    rate (float): target questions per second across all students
+    poisson (bool): use exponential gaps instead of evenly spaced slots
+    """
+
+    def __init__(self, rate, poisson=True):
+        """Pacer constructor."""
+        if rate <= 0:
+            raise ValueError('Arrival rate must be above zero.')
+        self.rate = rate
+        self.poisson = poisson
+        self.next_slot = time.monotonic()
+        self.issued = 0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller's arrival slot."""
+        with self.lock:
+            now = time.monotonic()
+            gap = random.expovariate(self.rate) if self.poisson \
+                else 1.0 / self.rate
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + gap
+            self.issued += 1
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class PracticeLoad(object):
+    """Run many students through practice at a target question rate.
+
+    students ([dict]): Student keyword arguments per account, at least
+        'username' and 'password'; shared settings go in student_kwargs
+    rate (float): target questions per second across all students
+    think (callable): think(step, default_seconds) -> seconds; use the
+        distributions in this module, defaults to the built-in pauses
+    course (string): course title to select after login
+    practice_set (string): 'weakest' or any other value for a random topic
+    student_kwargs (dict): arguments applied to every Student
+    """
+
+    def __init__(self, students, rate=1.0, think=None, course=None,
+                 practice_set='weakest', student_kwargs=None):
+        """Load generator constructor."""
+        self.students = students
+        self.pacer = Pacer(rate)
+        self.think = think
+        self.course = course
+        self.practice_set = practice_set
+        self.student_kwargs = student_kwargs if student_kwargs else {}
+        self.latency = LatencyRecorder()
+        self.errors = []
+        self.sessions = 0
+        self.lock = threading.Lock()
+
+    def _worker(self, account, deadline, sessions):
+        """Log one student in and practice until the deadline or count."""
+        kwargs = dict(self.student_kwargs)
+        kwargs.update(account)
+        student = None
+        completed = 0
+        try:
+            student = Student(think_time=self.think, pacer=self.pacer,
+                              **kwargs)
+            with student.latency.time('login'):
+                student.login()
+            if self.course:
+                student.select_course(title=self.course)
+            while (sessions is None or completed < sessions) and \
+                    (deadline is None or time.monotonic() < deadline):
+                with student.latency.time('practice'):
+                    student.practice(self.practice_set)
+                completed += 1
+        except Exception as err:
+            with self.lock:
+                self.errors.append((account.get('username'), repr(err)))
+        finally:
+            if student is not None:
+                self.latency.merge(student.latency)
+                student.delete()
+            with self.lock:
+                self.sessions += completed
+
+    def run(self, duration=None, sessions=1):
+        """Start every student concurrently and return a report.
+
+        duration (float): seconds to keep practicing; None for no limit
+        sessions (int): practice sessions per student; None for no limit
+        """
+        if duration is None and sessions is None:
+            raise ValueError('Set a duration, a session count, or both.')
+        start = time.monotonic()
+        deadline = start + duration if duration else None
+        # the pool rejects zero workers; an empty run just reports nothing
+        workers = max(1, len(self.students))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for account in self.students:
+                pool.submit(self._worker, account, deadline, sessions)
+        elapsed = time.monotonic() - start
+        return {
+            'students': len(self.students),
+            'elapsed': elapsed,
+            'sessions': self.sessions,
+            'questions': self.pacer.issued,
+            'target_rate': self.pacer.rate,
+            'achieved_rate': self.pacer.issued / elapsed if elapsed else 0,
+            'errors': list(self.errors),
+            'latency': self.latency.summary(),
+        }
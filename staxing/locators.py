@@ -0,0 +1,408 @@
+"""Named element locators shared by the staxing helpers."""
+
+import time
+
+from functools import lru_cache
+from selenium.webdriver.common.by import By
+
+__version__ = '0.0.2'
+
+
+@lru_cache(maxsize=1024)
+def _format(template, params):
+    """Return a template filled from sorted (field, value) pairs."""
+    return template.format(**dict(params))
+
+
+class Locator(object):
+    """A named, versioned element locator.
+
+    name (string): registry key, dotted by page area (ex. 'plan.publish')
+    css (string): CSS selector template; preferred when present
+    xpath (string): XPath template used when no CSS equivalent exists
+    by (string): any other Selenium strategy (ID, LINK_TEXT, CLASS_NAME)
+    value (string): template for the 'by' strategy
+    scope (string): name of a container locator to search within
+    version (int): locator revision; newer versions replace older ones
+    sample (dict): example template parameters used when benchmarking
+
+    Templates use str.format fields, ex. 'div[data-{option}="{value}"] a'.
+    Scoped XPath templates should be relative ('.//...') so they work
+    against both the document and a container element.
+    """
+
+    def __init__(self, name, css=None, xpath=None, by=None, value=None,
+                 scope=None, version=1, sample=None):
+        """Locator constructor."""
+        if not (css or xpath or (by and value)):
+            raise ValueError('Locator "%s" needs a selector' % name)
+        self.name = name
+        self.css = css
+        self.xpath = xpath
+        self.by = by
+        self.value = value
+        self.scope = scope
+        self.version = version
+        self.sample = sample if sample is not None else {}
+
+    def __repr__(self):
+        """Return the locator name, version and preferred strategy."""
+        return 'Locator(%s v%s: %s)' % (
+            self.name, self.version, self.strategies()[0])
+
+    def strategies(self):
+        """Return the available (by, template) pairs, fastest first."""
+        available = []
+        if self.by and self.value:
+            available.append((self.by, self.value))
+        if self.css:
+            available.append((By.CSS_SELECTOR, self.css))
+        if self.xpath:
+            available.append((By.XPATH, self.xpath))
+        return available
+
+    def compile(self, strategy=None, **params):
+        """Return a (by, value) tuple ready for find_element.
+
+        Formatted selectors are memoized in a bounded cache shared by
+        every locator, so repeat lookups skip the string building while
+        one-off parameters (ex. random titles) age out.
+        """
+        for by, template in self.strategies():
+            if strategy is None or strategy == by:
+                return by, _format(template, tuple(sorted(params.items())))
+        raise KeyError('Locator "%s" has no %s strategy' %
+                       (self.name, strategy))
+
+
+class LocatorTiming(object):
+    """Benchmark result for one locator strategy."""
+
+    def __init__(self, name, by, value, seconds, matches, threshold):
+        """Timing constructor."""
+        self.name = name
+        self.by = by
+        self.value = value
+        self.seconds = seconds
+        self.matches = matches
+        self.slow = seconds > threshold
+
+    def __repr__(self):
+        """Return a one line report entry."""
+        return '%s %-40s %-14s %8.2fms %4d match(es)' % (
+            'SLOW' if self.slow else '    ',
+            self.name, self.by, self.seconds * 1000, self.matches)
+
+
+class LocatorRegistry(object):
+    """Central lookup table for element locators."""
+
+    def __init__(self):
+        """Registry constructor."""
+        self.locators = {}
+        self.history = {}
+
+    def __contains__(self, name):
+        """Return True if the locator name is registered."""
+        return name in self.locators
+
+    def __getitem__(self, name):
+        """Return the current Locator for a name."""
+        return self.locators[name]
+
+    def __iter__(self):
+        """Iterate over the current locators in name order."""
+        for name in sorted(self.locators):
+            yield self.locators[name]
+
+    def register(self, locator):
+        """Add a locator, keeping older versions available."""
+        versions = self.history.setdefault(locator.name, {})
+        versions[locator.version] = locator
+        current = self.locators.get(locator.name)
+        if current is None or locator.version >= current.version:
+            self.locators[locator.name] = locator
+        return locator
+
+    def get(self, name, version=None, strategy=None, **params):
+        """Return the (by, value) tuple for a named locator."""
+        locator = self.locators[name] if version is None \
+            else self.history[name][version]
+        return locator.compile(strategy, **params)
+
+    def root(self, driver, name):
+        """Return the container element for a scoped locator."""
+        scope = self.locators[name].scope
+        if not scope:
+            return driver
+        return driver.find_element(*self.get(scope))
+
+    def find(self, driver, name, root=None, **params):
+        """Find one element, searching inside its scope when it has one."""
+        start = root if root is not None else self.root(driver, name)
+        return start.find_element(*self.get(name, **params))
+
+    def find_all(self, driver, name, root=None, **params):
+        """Find all matching elements inside the locator scope."""
+        start = root if root is not None else self.root(driver, name)
+        return start.find_elements(*self.get(name, **params))
+
+    def benchmark(self, driver, repeat=5, threshold=0.05, names=None):
+        """Time every locator strategy against the currently loaded DOM.
+
+        driver (WebDriver): browser already showing the fixture page
+        repeat (int): lookups per strategy; the median time is reported
+        threshold (float): seconds above which a lookup is flagged slow
+        names ([string]): limit the run to specific locators
+
+        Locators with template fields are measured with their sample
+        parameters and skipped when they have none.
+        """
+        results = []
+        for locator in self:
+            if names and locator.name not in names:
+                continue
+            for by, _ in locator.strategies():
+                try:
+                    by, value = locator.compile(by, **locator.sample)
+                except (KeyError, IndexError):
+                    continue
+                times = []
+                matches = 0
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    matches = len(driver.find_elements(by, value))
+                    times.append(time.perf_counter() - start)
+                times.sort()
+                results.append(
+                    LocatorTiming(locator.name, by, value,
+                                  times[len(times) // 2], matches, threshold)
+                )
+        return results
+
+
+LOCATORS = LocatorRegistry()
+
+for _locator in [
+    # login and navigation
+    Locator('login.menu_toggle', css='button.navbar-toggle'),
+    Locator('login.accounts_link', css='a[href*="/accounts/login"]',
+            xpath='//a[contains(@href,"/accounts/login")]'),
+    Locator('login.tutor_link', by=By.LINK_TEXT, value='Log in'),
+    Locator('login.exercises_link', by=By.LINK_TEXT, value='Sign in'),
+    Locator('login.username', by=By.ID, value='login_username_or_email'),
+    Locator('login.next', css='input[value="Next"]',
+            xpath='//input[@value="Next"]'),
+    Locator('login.password', by=By.ID, value='login_password'),
+    Locator('login.submit', css='input[value="Login"]',
+            xpath='//input[@value="Login"]'),
+    Locator('login.reset_password', by=By.ID,
+            value='reset_password_password'),
+    Locator('login.reset_confirmation', by=By.ID,
+            value='reset_password_password_confirmation'),
+    Locator('login.reset_submit', css='input[value="Reset Password"]',
+            xpath='//input[@value="Reset Password"]'),
+    Locator('login.reset_continue', css='input[value="Continue"]',
+            xpath='//input[@value="Continue"]'),
+    Locator('contract.submit', by=By.ID, value='agreement_submit'),
+    Locator('user.root', by=By.ID, value='ox-react-root-container'),
+    Locator('user.dashboard_link', css='a[href*="dashboard"]',
+            xpath='//a[contains(@href,"dashboard")]'),
+    Locator('user.menu_toggle', by=By.CLASS_NAME, value='dropdown-toggle'),
+    Locator('user.navbar_toggle', by=By.CLASS_NAME, value='navbar-toggle'),
+    Locator('user.logout', css='input[aria-label="Log Out"]',
+            xpath='//input[@aria-label="Log Out"]'),
+    Locator('accounts.logout', by=By.LINK_TEXT, value='Log out'),
+    Locator('exercises.menu', by=By.ID, value='navbar-dropdown'),
+    Locator('reference.book', css='div > a[class*="view-reference-guide"]',
+            xpath='//div/a[contains(@class,"view-reference-guide")]'),
+    Locator('reference.menu_book',
+            css='li > a[class*="view-reference-guide"]',
+            xpath='//li/a[contains(@class,"view-reference-guide")]'),
+    # course picker
+    Locator('course.listing',
+            css='div.course-listing-current-section div.course-listing-item'),
+    Locator('course.select', css='div[data-{option}="{value}"] a',
+            xpath='//div[@data-{option}="{value}"]//a',
+            sample={'option': 'title', 'value': 'Biology'}),
+    # teacher calendar
+    Locator('calendar.brand', css='ul.navbar-nav a.navbar-brand'),
+    Locator('calendar.header_brand', css='div.navbar-header a.navbar-brand'),
+    Locator('calendar.home', css='ul > a[class*="navbar-brand"]',
+            xpath='//ul/a[contains(@class,"navbar-brand")]'),
+    Locator('calendar.heading', css='div.calendar-header-label'),
+    Locator('calendar.next', by=By.CLASS_NAME, value='fa-caret-right'),
+    Locator('calendar.previous', by=By.CLASS_NAME, value='fa-caret-left'),
+    Locator('calendar.plan', xpath='//a[label[text()="{title}"]]',
+            sample={'title': 'Reading'}),
+    Locator('calendar.plans', xpath='//a[label]'),
+    Locator('calendar.sidebar_toggle', css='button.sidebar-toggle'),
+    Locator('calendar.edit_plan', by=By.CLASS_NAME, value='-edit-assignment'),
+    # course settings
+    Locator('roster.add_section', xpath='//button[i[contains(@class,'
+                                        '"fa-plus")]]'),
+    Locator('roster.section_name',
+            css='div[class*="teacher-edit-period-form"] input[type="text"]',
+            xpath='//div[contains(@class,"teacher-edit-period-form")]'
+                  '//input[@type="text"]'),
+    Locator('roster.confirm_section',
+            css='button[class*="-edit-period-confirm"]',
+            xpath='//button[contains(@class,"-edit-period-confirm")]'),
+    Locator('roster.section_tab', xpath='//a[text()="{name}"]',
+            sample={'name': '1st'}),
+    Locator('roster.show_code', by=By.CLASS_NAME,
+            value='show-enrollment-code'),
+    Locator('roster.code', by=By.CLASS_NAME, value='code'),
+    # assignment builder
+    Locator('plan.title', by=By.ID, value='reading-title'),
+    Locator('plan.description',
+            css='div[class*="assignment-description"] '
+                'textarea[class*="form-control"]',
+            xpath='//div[contains(@class,"assignment-description")]'
+                  '//textarea[contains(@class,"form-control")]'),
+    Locator('plan.all_periods', by=By.ID, value='hide-periods-radio'),
+    Locator('plan.each_period', by=By.ID, value='show-periods-radio'),
+    Locator('plan.period_toggles', css='input[id*="period-toggle-period"]',
+            xpath='//input[contains(@id,"period-toggle-period")]'),
+    Locator('plan.period_label', css='label[for="{id}"]',
+            xpath='//label[@for="{id}"]', sample={'id': 'period-toggle-1'}),
+    Locator('plan.row_time', xpath='../..//div[contains(@class,'
+                                   '"-{target}-time")]//input',
+            sample={}),
+    Locator('plan.all_time', css='div[class*="-{target}-time"] input',
+            xpath='//div[contains(@class,"-{target}-time")]//input',
+            sample={'target': 'due'}),
+    Locator('plan.row_date', xpath='../..//div[contains(@class,'
+                                   '"-{target}-date")]//div[contains(@class,'
+                                   '"react-datepicker__input")]//input',
+            sample={}),
+    Locator('plan.all_date',
+            css='div[class*="-{target}-date"] '
+                'div[class*="react-datepicker__input"] input',
+            xpath='//div[contains(@class,"-{target}-date")]'
+                  '//div[contains(@class,"react-datepicker__input")]//input',
+            sample={'target': 'due'}),
+    Locator('plan.footer', css='div[class*="footer"]',
+            xpath='//div[contains(@class,"footer")]'),
+    Locator('plan.publish', css='button[class*="-publish"]',
+            xpath='//button[contains(@class,"-publish")]'),
+    Locator('plan.save', css='button[class*=" -save"]',
+            xpath='//button[contains(@class," -save")]'),
+    Locator('plan.cancel',
+            xpath='//button[contains(text(),"Cancel") and @type="button"]'),
+    Locator('plan.delete', xpath='//button[contains(text(),"Delete")]'),
+    Locator('plan.confirm', css='button[class*="ok"]',
+            xpath='//button[contains(@class,"ok")]'),
+    Locator('plan.delete_link', by=By.CLASS_NAME, value='delete-link'),
+    Locator('plan.delete_confirm',
+            xpath='//div[@class="controls"]/button[text()="Yes"]'),
+    Locator('plan.feedback', by=By.ID, value='feedback-select'),
+    Locator('plan.feedback_option', css='option[value="{value}"]',
+            xpath='//option[@value="{value}"]',
+            sample={'value': 'immediate'}),
+    Locator('plan.external_url', by=By.ID, value='external-url'),
+    # date picker
+    Locator('datepicker.next', by=By.CLASS_NAME,
+            value='react-datepicker__navigation--next'),
+    Locator('datepicker.previous', by=By.CLASS_NAME,
+            value='react-datepicker__navigation--previous'),
+    Locator('datepicker.month', by=By.CLASS_NAME,
+            value='react-datepicker__current-month'),
+    Locator('datepicker.day', xpath='//div[contains(@class,'
+                                    '"react-datepicker__day") and not('
+                                    'contains(@class,"disabled")) and '
+                                    'text()="{day}"]',
+            sample={'day': 15}),
+    # readings and exercises
+    Locator('reading.select', by=By.ID, value='reading-select'),
+    Locator('reading.plan', css='div[class*="reading-plan"]',
+            xpath='//div[contains(@class,"reading-plan")]'),
+    Locator('reading.add', xpath='//button[text()="Add Readings"]'),
+    Locator('reading.chapter_headings', css='div.chapter-heading > a'),
+    Locator('reading.sections', css='div.section span.chapter-section'),
+    Locator('reading.chapter', css='div[data-chapter-section="{chapter}"] > a',
+            xpath='//div[@data-chapter-section="{chapter}"]/a',
+            sample={'chapter': 1}),
+    Locator('reading.chapter_checkbox',
+            css='div[data-chapter-section="{chapter}"] i[class*="tutor-icon"]',
+            xpath='//div[@data-chapter-section="{chapter}"]'
+                  '//i[contains(@class,"tutor-icon")]',
+            sample={'chapter': 1}),
+    Locator('reading.section_checkbox',
+            xpath='//span[contains(@data-chapter-section,"{section}") and '
+                  'text()="{section}"]/preceding-sibling::span/input',
+            sample={'section': '1.1'}),
+    Locator('homework.select', by=By.ID, value='problems-select'),
+    Locator('homework.plan', css='div[class*="homework-plan"]',
+            xpath='//div[contains(@class,"homework-plan")]'),
+    Locator('homework.topics',
+            css='div[class="homework-plan-exercise-select-topics"]',
+            xpath='//div[@class="homework-plan-exercise-select-topics"]'),
+    Locator('homework.show_problems', css='button[class*="-show-problems"]',
+            xpath='//button[contains(@class,"-show-problems")]'),
+    Locator('homework.loading', xpath='//span[text()="Loading..."]'),
+    Locator('homework.sections', css='div[class*="exercise-sections"]',
+            xpath='//div[contains(@class,"exercise-sections")]'),
+    Locator('homework.section_ids',
+            xpath='.//div[@class="exercises"]//span[contains(text(),"ID:")]',
+            scope='homework.sections'),
+    Locator('homework.section_name',
+            css=':scope > label > span[class="chapter-section"]',
+            xpath='./label/span[@class="chapter-section"]',
+            scope='homework.sections'),
+    Locator('homework.tutor_count', css='div[class="tutor-selections"] h2',
+            xpath='//div[@class="tutor-selections"]//h2'),
+    Locator('homework.tutor_more',
+            css='div[class="tutor-selections"] '
+                'button[class*="-move-exercise-down"]',
+            xpath='//div[@class="tutor-selections"]'
+                  '//button[contains(@class,"-move-exercise-down")]'),
+    Locator('homework.tutor_fewer',
+            css='div[class="tutor-selections"] '
+                'button[class*="-move-exercise-up"]',
+            xpath='//div[@class="tutor-selections"]'
+                  '//button[contains(@class,"-move-exercise-up")]'),
+    Locator('homework.add_exercise',
+            xpath='//span[contains(text(),"{exercise}")]'
+                  '/../../div[@class="controls-overlay"]',
+            sample={'exercise': '1@1'}),
+    Locator('homework.next', xpath='//*[text()="Next"]'),
+    # student work
+    Locator('practice.button', by=By.CLASS_NAME, value='practice'),
+    Locator('practice.sections',
+            css='button[aria-describedby*="progress-bar-tooltip-"]',
+            xpath='//button[contains(@aria-describedby,'
+                  '"progress-bar-tooltip-")]'),
+    Locator('practice.breadcrumbs', by=By.CLASS_NAME,
+            value='task-breadcrumbs'),
+    Locator('practice.dashboard',
+            xpath='//a[contains(text(),"Dashboard") and '
+                  'contains(@class,"btn")]'),
+    Locator('question.body', by=By.CLASS_NAME, value='openstax-question'),
+    Locator('question.free_response', css='textarea',
+            xpath='//textarea'),
+    Locator('question.answers', by=By.CLASS_NAME, value='answer-letter'),
+    Locator('question.submit', xpath='//button[span[text()="Submit"]]'),
+    Locator('question.continue', by=By.CLASS_NAME, value='continue'),
+    # webview
+    Locator('webview.concept_coach', css='.concept-coach-launcher'),
+]:
+    LOCATORS.register(_locator)
+
+
+if __name__ == '__main__':
+    # benchmark every locator against a page showing the Tutor UI
+    import sys
+    from selenium import webdriver
+
+    if len(sys.argv) < 2:
+        sys.exit('usage: python -m staxing.locators URL\n'
+                 'URL: saved or live Tutor page holding the elements')
+    fixture = sys.argv[1]
+    driver = webdriver.Chrome()
+    try:
+        driver.get(fixture)
+        for timing in LOCATORS.benchmark(driver):
+            print(timing)
+    finally:
+        driver.quit()
@@ -0,0 +1,239 @@
+"""Front-end performance samples collected after each navigation.
+
+Collection is opt-in: set STAXING_METRICS=1 or call
+Helper.enable_metrics(). One script per navigation reads Navigation
+Timing, the resources loaded since the previous sample and the long tasks
+seen by a PerformanceObserver, and the samples are aggregated by route.
+"""
+
+import functools
+import json
+import re
+import threading
+import time
+
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+try:
+    from staxing.budget import Budget, BudgetExceeded
+except ImportError:
+    from budget import Budget, BudgetExceeded
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+try:
+    from staxing.latency import LatencyRecorder
+except ImportError:
+    from latency import LatencyRecorder
+
+__version__ = '0.0.1'
+
+METRICS_SCRIPT = '''
+    var seen = window.__staxingMetrics;
+    var soft = !!seen;
+    if (!seen) {
+        seen = window.__staxingMetrics = {tasks: 0};
+        try {
+            new PerformanceObserver(function (list) {
+                seen.tasks += list.getEntries().length;
+            }).observe({entryTypes: ['longtask']});
+        } catch (error) {}
+    }
+    var timing = null;
+    if (!soft) {
+        var nav = performance.getEntriesByType ?
+            performance.getEntriesByType('navigation')[0] : null;
+        var legacy = performance.timing;
+        timing = nav ? {
+            ttfb: nav.responseStart,
+            dom_content_loaded: nav.domContentLoadedEventEnd,
+            load: nav.loadEventEnd,
+            transfer: nav.transferSize
+        } : {
+            ttfb: legacy.responseStart - legacy.navigationStart,
+            dom_content_loaded:
+                legacy.domContentLoadedEventEnd - legacy.navigationStart,
+            load: legacy.loadEventEnd - legacy.navigationStart,
+            transfer: null
+        };
+    }
+    var resources = performance.getEntriesByType ?
+        performance.getEntriesByType('resource') : [];
+    var bytes = 0, slowest = 0, kinds = {};
+    for (var i = 0; i < resources.length; i++) {
+        bytes += resources[i].transferSize || 0;
+        slowest = Math.max(slowest, resources[i].duration);
+        kinds[resources[i].initiatorType] =
+            (kinds[resources[i].initiatorType] || 0) + 1;
+    }
+    if (performance.clearResourceTimings) {
+        performance.clearResourceTimings();
+    }
+    var tasks = seen.tasks;
+    seen.tasks = 0;
+    return {url: location.href, soft: soft, timing: timing,
+            resources: resources.length, bytes: bytes, kinds: kinds,
+            slowest: slowest, long_tasks: tasks};
+'''
+# numeric ids, dates and uuids become placeholders so visits share a route
+ROUTE_PARTS = [
+    (re.compile(r'^\d{4}-\d{2}-\d{2}$'), ':date'),
+    (re.compile(r'^[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}(@[\d.]+)?$',
+                re.IGNORECASE), ':uuid'),
+    (re.compile(r'^\d+$'), ':id'),
+]
+
+
+def route(url):
+    """Return the route pattern of a URL, e.g. '/course/:id/t/calendar'."""
+    parts = []
+    for part in urlparse(url).path.split('/'):
+        for pattern, name in ROUTE_PARTS:
+            if pattern.match(part):
+                part = name
+                break
+        parts.append(part)
+    return '/'.join(parts) or '/'
+
+
+class RouteMetrics(object):
+    """Aggregated samples for one route."""
+
+    def __init__(self):
+        """Route aggregate constructor."""
+        self.latency = LatencyRecorder()
+        self.visits = 0
+        self.soft = 0
+        self.resources = 0
+        self.bytes = 0
+        self.long_tasks = 0
+        self.slowest = 0.0
+
+    def add(self, sample, action=None, elapsed=None):
+        """Fold one sample into the aggregate."""
+        self.visits += 1
+        self.soft += bool(sample.get('soft'))
+        timing = sample.get('timing') or {}
+        for step in ('ttfb', 'dom_content_loaded', 'load'):
+            if timing.get(step):
+                self.latency.record(step, timing[step] / 1000.0)
+        if elapsed is not None:
+            self.latency.record(action or 'action', elapsed)
+        self.resources += sample.get('resources') or 0
+        self.bytes += sample.get('bytes') or 0
+        self.long_tasks += sample.get('long_tasks') or 0
+        self.slowest = max(self.slowest,
+                           (sample.get('slowest') or 0) / 1000.0)
+
+    def summary(self):
+        """Return the route's timings and totals."""
+        return {
+            'visits': self.visits,
+            'soft_navigations': self.soft,
+            'timing': self.latency.summary(),
+            'resources': self.resources,
+            'kilobytes': round(self.bytes / 1024.0, 1),
+            'long_tasks': self.long_tasks,
+            'slowest_resource': round(self.slowest, 3),
+        }
+
+
+class PageMetrics(object):
+    """Collect front-end timings after navigations, grouped by route.
+
+    budget (Budget|string): limits checked against every sample
+    strict (bool): raise BudgetExceeded as soon as a sample breaks the
+        budget instead of collecting the violation
+    """
+
+    def __init__(self, budget=None, strict=False):
+        """Metrics constructor."""
+        self.routes = {}
+        self.samples = 0
+        self.lock = threading.Lock()
+        self.budget = Budget.load(budget) if isinstance(budget, str) \
+            else budget
+        self.strict = strict
+        self.violations = []
+
+    def collect(self, driver, action=None, elapsed=None):
+        """Sample the current page and return the raw sample or None."""
+        try:
+            sample = driver.execute_script(METRICS_SCRIPT)
+        except WebDriverException as err:
+            LOG.debug(self, 'Metrics unavailable: %s', err)
+            return None
+        if not sample:
+            return None
+        path = route(sample.get('url') or driver.current_url)
+        with self.lock:
+            self.samples += 1
+            if path not in self.routes:
+                self.routes[path] = RouteMetrics()
+            self.routes[path].add(sample, action, elapsed)
+        if self.budget is not None:
+            violations = self.budget.check_sample(path, sample)
+            if violations:
+                with self.lock:
+                    self.violations += violations
+                LOG.warning(self, 'Budget exceeded on %s: %s', path,
+                            ', '.join('%s=%s' % (violation.metric,
+                                                 violation.value)
+                                      for violation in violations))
+                if self.strict:
+                    raise BudgetExceeded(violations)
+        return sample
+
+    def assert_budget(self):
+        """Raise BudgetExceeded if any sample broke the budget."""
+        if self.violations:
+            raise BudgetExceeded(self.violations)
+        return self
+
+    def report(self):
+        """Return the route summary checked against the budget."""
+        summary = self.summary()
+        report = self.budget.report(summary) if self.budget is not None \
+            else {'passed': True, 'violations': [], 'routes': {}}
+        report['navigation_violations'] = [
+            violation._asdict() for violation in self.violations]
+        report['summary'] = summary
+        return report
+
+    def summary(self):
+        """Return {route: aggregate} for every route sampled."""
+        with self.lock:
+            return {path: metrics.summary()
+                    for path, metrics in sorted(self.routes.items())}
+
+    def save(self, path):
+        """Write the summary as JSON and return the path."""
+        with open(path, 'w') as report:
+            json.dump(self.summary(), report, indent=2, sort_keys=True)
+        return path
+
+
+def measured(method):
+    """Sample page metrics after a navigation method, if enabled.
+
+    Only the outermost measured call samples, so goto_* methods built on
+    other navigations are recorded once, with the action's wall time.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = getattr(self, 'metrics', None)
+        if metrics is None or getattr(self, '_measuring', False):
+            return method(self, *args, **kwargs)
+        self._measuring = True
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            self._measuring = False
+        metrics.collect(self.driver, method.__name__,
+                        time.perf_counter() - start)
+        return result
+    return wrapper
@@ -11,7 +11,12 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support.expected_conditions import staleness_of
 
-__version__ = '0.0.3'
+try:
+    from staxing.element_cache import ElementCache
+except ImportError:
+    from element_cache import ElementCache
+
+__version__ = '0.0.4'
 
 
 class SeleniumWait(object):
@@ -21,6 +26,7 @@ class SeleniumWait(object):
         """Constructor."""
         self.browser = driver
         self.wait = wait
+        self.generation = 0
         self.pseudos = [
             '::after', '::before', '::first-letter', '::first-line',
             '::selection', '::backdrop', '::placeholder', '::marker',
@@ -35,6 +41,12 @@ class SeleniumWait(object):
         WebDriverWait(self.browser, self.wait).until(
             staleness_of(old_page)
         )
+        self.page_changed()
+
+    def page_changed(self):
+        """Mark a new page so cached element handles are dropped."""
+        self.generation += 1
+        ElementCache.for_driver(self.browser).page_changed()
 
     @contextmanager
     def wait_for_loading_staleness(self, style, pseudo_element):
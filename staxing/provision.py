@@ -0,0 +1,205 @@
+"""Idempotent, content-addressed test data provisioning."""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from staxing.assignment import Assignment
+except ImportError:
+    from assignment import Assignment
+try:
+    from staxing.cleanup import CourseCleanup
+except ImportError:
+    from cleanup import CourseCleanup
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+try:
+    from staxing.schedule import normalize
+except ImportError:
+    from schedule import normalize
+try:
+    from staxing.tutor_api import AssignmentAPI
+except ImportError:
+    from tutor_api import AssignmentAPI
+
+__version__ = '0.0.3'
+
+SPEC_FIELDS = ('periods', 'reading_list', 'problems', 'url', 'feedback',
+               'status')
+TAG = re.compile(r'\[staxing:([0-9a-f]{16})\]')
+SAVE_LOCK = threading.Lock()
+
+
+def spec_key(assignment, args):
+    """Return a stable key for an assignment spec.
+
+    The title and description are left out so randomly titled specs from
+    Assignment.rword still resolve to the same plan. Periods are
+    normalized first, so '04/03/2017' and a Moment for that day match.
+    """
+    spec = {'type': assignment}
+    spec.update((field, args.get(field)) for field in SPEC_FIELDS)
+    if spec['periods']:
+        spec['periods'] = dict(
+            (period, [[when.date.isoformat(), when.time] for when in pair])
+            for period, pair in normalize(spec['periods']).items())
+    canonical = json.dumps(spec, sort_keys=True, separators=(',', ':'),
+                           default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def spec_range(args):
+    """Return the earliest and latest dates in a spec's periods."""
+    dates = []
+    for opens, closes in normalize(args['periods']).values():
+        dates += [opens.date, closes.date]
+    return min(dates), max(dates)
+
+
+class Provisioner(object):
+    """Create assignments only when a matching plan is not in the course.
+
+    Each spec is keyed by spec_key and the key is tagged into the plan
+    description. Existing plans are found with one listing per date range
+    (API or calendar scrape, through CourseCleanup). Matches are recorded
+    in a local JSON cache so a plan whose tag was lost is still found by
+    its id or title; the listing always runs, so deleted plans are
+    created again.
+
+    teacher (Teacher): logged-in teacher on the course calendar
+    use_api (bool): list and create plans through the Tutor API, with
+        the teacher's backend or a private one; the teacher's own mode
+        is left unchanged
+    cache_path (string): JSON cache file shared by parallel workers;
+        defaults to STAXING_PROVISION_CACHE or .staxing-provision.json
+    """
+
+    def __init__(self, teacher, use_api=True, cache_path=None):
+        """Provisioner constructor."""
+        self.teacher = teacher
+        self.use_api = use_api
+        self.backend = None
+        if use_api:
+            self.backend = teacher.assign.backend or \
+                AssignmentAPI.from_driver(teacher.driver, base_url=teacher.url)
+            self.lister = CourseCleanup(api=self.backend.api,
+                                        course_id=self.backend.course_id)
+        else:
+            self.lister = CourseCleanup.from_teacher(teacher, use_api=False)
+        self.cache_path = cache_path if cache_path else \
+            os.getenv('STAXING_PROVISION_CACHE', '.staxing-provision.json')
+        self.course = '%s|%s' % (
+            teacher.url,
+            self.lister.course_id if self.lister.course_id is not None
+            else teacher.driver.current_url)
+        self.records = self._load().get(self.course, {})
+        self.listings = {}
+        self.lock = threading.Lock()
+
+    def _load(self):
+        """Read the cache file."""
+        try:
+            with open(self.cache_path) as cache:
+                return json.load(cache)
+        except (IOError, ValueError):
+            return {}
+
+    def _save(self):
+        """Merge this course's records into the cache file.
+
+        The read, merge and replace hold an flock on a side file, so
+        workers sharing the cache keep each other's records; without
+        fcntl only this process's threads are serialized.
+        """
+        with SAVE_LOCK, open(self.cache_path + '.lock', 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            data = self._load()
+            records = data.get(self.course, {})
+            records.update(self.records)
+            data[self.course] = self.records = records
+            handle, temporary = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.cache_path)),
+                suffix='.tmp')
+            try:
+                with os.fdopen(handle, 'w') as cache:
+                    json.dump(data, cache, indent=2, sort_keys=True)
+                os.replace(temporary, self.cache_path)
+            except Exception:
+                os.remove(temporary)
+                raise
+
+    def plans(self, start, end):
+        """Return the course plans for a date range, listed once."""
+        key = (start.isoformat(), end.isoformat())
+        if key not in self.listings:
+            self.listings[key] = self.lister.list_plans(start, end)
+        return self.listings[key]
+
+    def find(self, key, args):
+        """Return the existing plan for a key or None."""
+        record = self.records.get(key)
+        for plan in self.plans(*spec_range(args)):
+            tags = TAG.findall(plan.get('description') or '')
+            if key in tags:
+                return plan
+            if record is None:
+                continue
+            if (record['id'] is not None and
+                    plan.get('id') == record['id']) or \
+                    plan.get('title') == record['title']:
+                return plan
+        return None
+
+    def create(self, assignment, args):
+        """Create one plan through the API backend or the browser."""
+        if self.backend is None:
+            return self.teacher.add_assignment(
+                assignment, dict(args, mode=Assignment.UI))
+        return self.backend.add(
+            assignment,
+            name=args['title'],
+            description=args.get('description', ''),
+            periods=args['periods'],
+            state=args['status'],
+            url=args.get('url'),
+            reading_list=args.get('reading_list'),
+            problems=args.get('problems'),
+            feedback=args.get('feedback'))
+
+    def ensure(self, assignment, args):
+        """Return the plan record for a spec, creating it only if missing."""
+        key = spec_key(assignment, args)
+        plan = self.find(key, args)
+        created = plan is None
+        if created:
+            args = dict(args)
+            args['description'] = '%s [staxing:%s]' % (
+                args.get('description', ''), key)
+            result = self.create(assignment, args)
+            plan = result if isinstance(result, dict) else \
+                {'title': args['title'], 'id': None}
+            self.listings.clear()
+        record = {'key': key, 'id': plan.get('id'), 'title': plan['title'],
+                  'type': assignment}
+        with self.lock:
+            self.records[key] = record
+            self._save()
+        LOG.info(self, '%s %s plan %s', 'Created' if created else 'Reused',
+                 assignment, record['title'], key=key)
+        return dict(record, created=created)
+
+    def ensure_all(self, specs):
+        """Provision (assignment, args) pairs and return their records."""
+        return [self.ensure(assignment, args) for assignment, args in specs]
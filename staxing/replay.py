@@ -0,0 +1,238 @@
+"""Record WebDriver command streams and replay them without a browser.
+
+A CommandRecorder captures every command a flow sends to the driver
+together with the raw response. A ReplayServer answers the same commands
+from the recording over a local WebDriver endpoint, so Replayer can time
+and profile the library's own work in isolation from Tutor and the
+browser.
+"""
+
+import copy
+import cProfile
+import gzip
+import io
+import json
+import pstats
+import re
+import string
+import time
+
+from selenium import webdriver
+
+try:
+    from staxing.latency import LatencyHistogram
+except ImportError:
+    from latency import LatencyHistogram
+try:
+    from staxing.stub_server import StubServer
+except ImportError:
+    from stub_server import StubServer
+
+__version__ = '0.0.2'
+
+SESSION_PATH = re.compile(r'^/session/[^/]+')
+
+
+class CommandRecorder(object):
+    """Capture the command stream of a Remote WebDriver.
+
+    The executor is wrapped below the element unwrapping, so responses are
+    stored exactly as the endpoint sent them.
+    """
+
+    def __init__(self, driver):
+        """Recorder constructor."""
+        self.driver = driver
+        self.executor = driver.command_executor
+        self.original = None
+        self.entries = []
+
+    def start(self):
+        """Begin recording."""
+        if self.original is not None:
+            return self
+        self.original = self.executor.execute
+        commands = self.executor._commands
+
+        def execute(command, params):
+            method, template = commands[command]
+            path = string.Template(template).substitute(params)
+            body = {key: value for key, value in params.items()
+                    if key != 'sessionId'}
+            start = time.perf_counter()
+            response = self.original(command, params)
+            self.entries.append({
+                'c': command,
+                'm': method,
+                'p': SESSION_PATH.sub('/session/-', path),
+                'b': body,
+                # the driver unwraps element values in place afterwards
+                'r': copy.deepcopy(response),
+                't': round(time.perf_counter() - start, 6),
+            })
+            return response
+
+        self.executor.execute = execute
+        return self
+
+    def stop(self):
+        """Stop recording and restore the executor."""
+        if self.original is not None:
+            self.executor.execute = self.original
+            self.original = None
+        return self
+
+    def __enter__(self):
+        """Record inside a with block."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop recording at the end of a with block."""
+        self.stop()
+
+    def save(self, path):
+        """Write the recording as gzipped JSON lines."""
+        header = {
+            'session': self.driver.session_id,
+            'w3c': getattr(self.driver, 'w3c', False),
+            'capabilities': self.driver.capabilities,
+            'commands': len(self.entries),
+        }
+        with gzip.open(path, 'wt') as stream:
+            for line in [header] + self.entries:
+                stream.write(json.dumps(line, separators=(',', ':')))
+                stream.write('\n')
+        return path
+
+
+def load(path):
+    """Return (header, entries) from a saved recording."""
+    with gzip.open(path, 'rt') as stream:
+        lines = [json.loads(line) for line in stream if line.strip()]
+    return lines[0], lines[1:]
+
+
+class ReplayServer(StubServer):
+    """Local WebDriver endpoint answering from a recording, in order.
+
+    strict (bool): answer a command that differs from the recording with
+        an error instead of the recorded response
+    """
+
+    def __init__(self, path, strict=False, **kwargs):
+        """Replay server constructor."""
+        super(ReplayServer, self).__init__(**kwargs)
+        self.header, self.entries = load(path)
+        self.strict = strict
+        self.cursor = 0
+        self.mismatches = []
+        self.quits = 0
+        self.route('POST', r'/session', self._new_session)
+        self.route('DELETE', r'/session/[^/]+', self._quit)
+        for method in ('GET', 'POST', 'DELETE'):
+            self.route(method, r'(/session/.+)', self._command)
+
+    def rewind(self):
+        """Serve the recording from the start again."""
+        self.cursor = 0
+        self.mismatches = []
+
+    def _new_session(self, request):
+        session = self.header['session']
+        capabilities = self.header['capabilities']
+        if self.header['w3c']:
+            return {'value': {'sessionId': session,
+                              'capabilities': capabilities}}
+        return {'sessionId': session, 'status': 0, 'value': capabilities}
+
+    def _quit(self, request):
+        self.quits += 1
+        return {'value': None} if self.header['w3c'] else \
+            {'sessionId': self.header['session'], 'status': 0, 'value': None}
+
+    def _command(self, request, path):
+        if self.cursor >= len(self.entries):
+            return 500, {'value': {'error': 'unknown error',
+                                   'message': 'Replay exhausted'}}
+        entry = self.entries[self.cursor]
+        self.cursor += 1
+        path = SESSION_PATH.sub('/session/-', path)
+        if entry['m'] != request.method or entry['p'] != path:
+            self.mismatches.append((self.cursor - 1, request.method, path))
+            if self.strict:
+                return 500, {'value': {
+                    'error': 'unknown error',
+                    'message': 'Expected %s %s' % (entry['m'], entry['p'])}}
+        response = entry['r']
+        status = response.get('status') if isinstance(response, dict) \
+            else None
+        if isinstance(status, int) and status > 399:
+            return status, response.get('value')
+        return response
+
+
+class Replayer(object):
+    """Time a flow against a recording with no browser or network.
+
+    flow: callable(driver) repeating the recorded actions, e.g.
+        lambda driver: Teacher(existing_driver=driver, ...).add_assignment(
+            Assignment.READING, args)
+    """
+
+    def __init__(self, path, strict=False):
+        """Replayer constructor; serves until close()."""
+        self.server = ReplayServer(path, strict=strict).start()
+
+    def close(self):
+        """Stop the replay endpoint."""
+        self.server.stop()
+
+    def driver(self):
+        """Return a Remote WebDriver attached to the replay endpoint."""
+        return webdriver.Remote(command_executor=self.server.url,
+                                desired_capabilities={})
+
+    def run(self, flow, repeat=5, profile=False):
+        """Replay a flow repeatedly and return timing statistics.
+
+        Wall time includes the library's sleeps; CPU time is the stable
+        measure of its own overhead and counts only the calling thread,
+        not the replay endpoint serving it.
+        """
+        wall = LatencyHistogram()
+        cpu = LatencyHistogram()
+        profiler = cProfile.Profile() if profile else None
+        mismatches = 0
+        for _ in range(repeat):
+            self.server.rewind()
+            driver = self.driver()
+            start_wall = time.perf_counter()
+            start_cpu = time.thread_time()
+            if profiler:
+                profiler.enable()
+            try:
+                flow(driver)
+            finally:
+                if profiler:
+                    profiler.disable()
+                cpu.record(time.thread_time() - start_cpu)
+                wall.record(time.perf_counter() - start_wall)
+                mismatches += len(self.server.mismatches)
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+        report = {
+            'commands': len(self.server.entries),
+            'recorded_seconds': sum(entry['t']
+                                    for entry in self.server.entries),
+            'wall': wall.summary(),
+            'cpu': cpu.summary(),
+            'mismatches': mismatches,
+        }
+        if profiler:
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats(
+                'cumulative').print_stats(25)
+            report['profile'] = output.getvalue()
+        return report
@@ -0,0 +1,250 @@
+"""Browser-side helper runtime to collapse WebDriver round trips.
+
+A small script is installed in the page as window.__staxing the first time
+a helper is called on a document; navigation drops it and the next call
+installs it again. Each helper then runs a whole step - find, scroll, read
+a style, click several times, fill a form - in one execute_script call.
+
+Targets are WebElements or (by, value) locators as returned by
+LOCATORS.get().
+"""
+
+from weakref import WeakKeyDictionary, ref
+
+from selenium.common.exceptions import NoSuchElementException
+
+__version__ = '0.0.2'
+
+VERSION = __version__
+RUNTIME_SCRIPT = '''
+    window.__staxing = (function (version) {
+        function first(nodes, test) {
+            for (var i = 0; i < nodes.length; i++) {
+                if (!test || test(nodes[i])) { return nodes[i]; }
+            }
+            return null;
+        }
+        function find(by, value, root) {
+            root = root || document;
+            switch (by) {
+            case 'css selector': return root.querySelector(value);
+            case 'id': return document.getElementById(value);
+            case 'name': return root.querySelector(
+                '[name="' + value.replace(/"/g, '\\\\"') + '"]');
+            case 'class name':
+                return first(root.getElementsByClassName(value));
+            case 'tag name': return first(root.getElementsByTagName(value));
+            case 'link text':
+                return first(root.querySelectorAll('a'), function (link) {
+                    return link.textContent.trim() === value;
+                });
+            case 'partial link text':
+                return first(root.querySelectorAll('a'), function (link) {
+                    return link.textContent.indexOf(value) >= 0;
+                });
+            }
+            return document.evaluate(value, root, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        function resolve(target) {
+            if (target && target.nodeType) { return target; }
+            return target ? find(target[0], target[1]) : null;
+        }
+        function color(text) {
+            var parts = String(text).match(/[\\d.]+/g) || [];
+            if (parts.length === 3) { parts.push('1'); }
+            return parts.map(Number).join(',');
+        }
+        function read(node, property) {
+            if (!property || property === 'text') {
+                return node.textContent.trim();
+            }
+            if (property.indexOf('style:') === 0) {
+                return window.getComputedStyle(node)[property.slice(6)];
+            }
+            return property in node ? node[property] :
+                node.getAttribute(property);
+        }
+        function setValue(node, value) {
+            if (node.type === 'checkbox' || node.type === 'radio') {
+                if (node.checked !== !!value) { node.click(); }
+                return;
+            }
+            // the prototype setter updates React's value tracker too
+            var setter = Object.getOwnPropertyDescriptor(
+                Object.getPrototypeOf(node), 'value');
+            if (setter && setter.set) {
+                setter.set.call(node, value);
+            } else {
+                node.value = value;
+            }
+            node.dispatchEvent(new Event('input', {bubbles: true}));
+            node.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+        function scrollIntoViewWithOffset(target, offset) {
+            var node = resolve(target);
+            if (node) {
+                node.scrollIntoView();
+                window.scrollBy(0, -(offset || 0));
+            }
+            return node;
+        }
+        return {
+            version: version,
+            find: function (by, value) { return find(by, value); },
+            findByText: function (selector, text, exact) {
+                return first(document.querySelectorAll(selector),
+                    function (node) {
+                        var content = node.textContent.trim();
+                        return exact ? content === text :
+                            content.indexOf(text) >= 0;
+                    });
+            },
+            scrollIntoViewWithOffset: scrollIntoViewWithOffset,
+            clickN: function (target, times) {
+                var node = resolve(target);
+                if (!node) { return null; }
+                for (var i = 0; i < times; i++) { node.click(); }
+                return times;
+            },
+            clickUnlessStyle: function (target, property, value, offset,
+                                        dispatch) {
+                var node = scrollIntoViewWithOffset(target, offset);
+                if (!node) { return null; }
+                var current = window.getComputedStyle(node)[property];
+                if (color(current) === color(value) || current === value) {
+                    return false;
+                }
+                if (!dispatch) { return node; }
+                node.click();
+                return true;
+            },
+            setValues: function (values) {
+                var missing = [];
+                for (var selector in values) {
+                    var node = document.querySelector(selector);
+                    if (node) {
+                        setValue(node, values[selector]);
+                    } else {
+                        missing.push(selector);
+                    }
+                }
+                return missing;
+            },
+            snapshot: function (spec) {
+                var found = {};
+                for (var name in spec) {
+                    var node = resolve(spec[name]);
+                    found[name] = node ? read(node, spec[name][2]) : null;
+                }
+                return found;
+            }
+        };
+    })(arguments[0]);
+'''
+CALL_SCRIPT = '''
+    var runtime = window.__staxing;
+    if (!runtime || runtime.version !== arguments[0]) {
+        return {missing: true};
+    }
+    return {value: runtime[arguments[1]].apply(runtime, arguments[2])};
+'''
+
+
+class Runtime(object):
+    """Call the injected page helpers, one execute_script per step."""
+
+    _runtimes = WeakKeyDictionary()
+
+    def __init__(self, driver):
+        """Runtime constructor."""
+        self._driver = ref(driver)
+        self.calls = 0
+        self.injections = 0
+
+    @property
+    def driver(self):
+        """Return the WebDriver."""
+        return self._driver()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Return the shared runtime for a WebDriver."""
+        runtime = cls._runtimes.get(driver)
+        if runtime is None:
+            runtime = cls._runtimes[driver] = cls(driver)
+        return runtime
+
+    def call(self, name, *args):
+        """Run one runtime helper and return its result."""
+        self.calls += 1
+        result = self.driver.execute_script(CALL_SCRIPT, VERSION, name,
+                                            list(args))
+        if not result or result.get('missing'):
+            # new document: install and call in the same round trip
+            self.injections += 1
+            result = self.driver.execute_script(
+                RUNTIME_SCRIPT + CALL_SCRIPT, VERSION, name, list(args))
+        return result.get('value')
+
+    def _found(self, value, target):
+        """Raise NoSuchElementException if the target was not found."""
+        if value is None:
+            raise NoSuchElementException('Runtime target not found: %s' %
+                                         (target,))
+        return value
+
+    def find(self, locator):
+        """Return the first element matching a (by, value) locator."""
+        return self._found(self.call('find', *locator), locator)
+
+    def find_by_text(self, selector, text, exact=True):
+        """Return the first selector match whose text is (or has) text."""
+        return self._found(self.call('findByText', selector, text, exact),
+                           text)
+
+    def scroll_to(self, target, offset=80):
+        """Scroll a target into view, leaving offset pixels above it."""
+        return self._found(
+            self.call('scrollIntoViewWithOffset', target, offset), target)
+
+    def click(self, target, times=1):
+        """Click a target several times in one call.
+
+        These are DOM clicks (node.click()): unlike WebElement.click() they
+        do not check that the target is displayed or uncovered.
+        """
+        return self._found(self.call('clickN', target, times), target)
+
+    def click_unless_style(self, target, property, value, offset=80,
+                           native=True):
+        """Scroll to and click a target unless its computed style matches.
+
+        native (bool): click through WebDriver, which checks the target is
+            displayed and uncovered; False clicks in the page instead
+        Returns True if the target was clicked.
+        """
+        result = self._found(self.call('clickUnlessStyle', target, property,
+                                       value, offset, not native), target)
+        if native and result is not False:
+            result.click()
+            return True
+        return result
+
+    def set_values(self, values):
+        """Set {css selector: value} form fields; return missing selectors.
+
+        Inputs fire input and change events; checkboxes and radio buttons
+        are clicked when their state differs.
+        """
+        return self.call('setValues', values)
+
+    def snapshot(self, spec):
+        """Read several elements at once.
+
+        spec (dict): {name: (by, value[, property])}; property is 'text'
+            (default), 'style:<css property>', a DOM property or an
+            attribute. Missing elements read as None.
+        """
+        return self.call('snapshot', {name: list(target)
+                                      for name, target in spec.items()})
@@ -0,0 +1,120 @@
+"""Batched open and due date planning for assignment periods."""
+
+import datetime
+import re
+
+from collections import namedtuple
+
+__version__ = '0.0.1'
+
+TIME_FORMAT = re.compile(r'^\s*(\d{1,2}):?(\d{2})?\s*([ap])?\.?m?\.?\s*$',
+                         re.IGNORECASE)
+
+Moment = namedtuple('Moment', ['date', 'time'])
+Moment.__doc__ = """Pre-normalized date and time for a plan.
+
+date (datetime.date): day picked in the datepicker
+time (string): time input keystrokes, e.g. '630a'; None keeps the default
+"""
+
+
+def parse_date(value):
+    """Return a date from a 'MM/DD/YYYY' string or a date."""
+    if isinstance(value, datetime.date):
+        return value
+    month, day, year = value.split('/')
+    return datetime.date(int(year), int(month), int(day))
+
+
+def parse_time(value):
+    """Return 'HH:MM' from the UI time forms ('8:00 am', '1159p', '14:30')."""
+    if isinstance(value, datetime.time):
+        return value.strftime('%H:%M')
+    match = TIME_FORMAT.match(value)
+    if not match:
+        raise ValueError('Unknown time format: %s' % value)
+    hour, minute, meridian = match.groups()
+    if minute is None and len(hour) > 2:
+        hour, minute = hour[:-2], hour[-2:]
+    hour = int(hour)
+    minute = int(minute) if minute else 0
+    if meridian:
+        hour = hour % 12 + (12 if meridian.lower() == 'p' else 0)
+    if hour > 23 or minute > 59:
+        raise ValueError('Time out of range: %s' % value)
+    return '%02d:%02d' % (hour, minute)
+
+
+def input_time(value):
+    """Return the keystrokes the time input expects, e.g. '630a'."""
+    hour, minute = (int(part) for part in parse_time(value).split(':'))
+    return '%d%02d%s' % (hour % 12 or 12, minute, 'p' if hour >= 12 else 'a')
+
+
+def moment(value):
+    """Normalize a date, 'MM/DD/YYYY' or (date, time) pair to a Moment."""
+    if isinstance(value, Moment):
+        return value
+    if isinstance(value, tuple):
+        date, at = value
+        return Moment(parse_date(date), input_time(at) if at else None)
+    return Moment(parse_date(value), None)
+
+
+def normalize(periods):
+    """Return a periods dictionary with every value as (Moment, Moment).
+
+    Raises ValueError when a period is due before it opens.
+    """
+    normalized = {}
+    for period, (opens, closes) in periods.items():
+        opens, closes = moment(opens), moment(closes)
+        if closes.date < opens.date:
+            raise ValueError('%s is due before it opens' % period)
+        normalized[period] = (opens, closes)
+    return normalized
+
+
+class Schedule(object):
+    """Plan open and due moments for many periods and assignments at once.
+
+    start (date|string): first open date; defaults to today
+    open_time (string): open time for every plan, e.g. '12:01 am'
+    due_time (string): due time for every plan, e.g. '7:00 am'
+    """
+
+    def __init__(self, start=None, open_time=None, due_time=None):
+        """Schedule constructor."""
+        self.start = parse_date(start) if start else datetime.date.today()
+        self.open_time = input_time(open_time) if open_time else None
+        self.due_time = input_time(due_time) if due_time else None
+
+    def build(self, periods, count=1, open_after=0, duration=7, spacing=7,
+              stagger=0):
+        """Return count periods dictionaries ready for assign_periods.
+
+        periods ([string]): period names, or ['all']
+        count (int): number of assignments to schedule
+        open_after (int): days from start to the first open date
+        duration (int): days each assignment stays open
+        spacing (int): days between consecutive assignments
+        stagger (int): extra days added per period, in list order
+        """
+        if count < 1 or duration < 0 or spacing < 0 or stagger < 0:
+            raise ValueError('Schedule sizes must not be negative.')
+        base = self.start.toordinal() + open_after
+        offsets = [index * stagger for index in range(len(periods))]
+        plans = []
+        for number in range(count):
+            first = base + number * spacing
+            plans.append({
+                period: (
+                    Moment(datetime.date.fromordinal(first + offset),
+                           self.open_time),
+                    Moment(datetime.date.fromordinal(first + offset +
+                                                     duration),
+                           self.due_time),
+                )
+                for period, offset in zip(periods, offsets)
+            })
+        return plans
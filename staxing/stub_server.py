@@ -0,0 +1,234 @@
+"""Local stand-in HTTP servers for exercising staxing without Tutor."""
+
+import json
+import re
+import threading
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+__version__ = '0.0.1'
+
+
+class _ThreadedServer(ThreadingMixIn, HTTPServer):
+    """HTTP server handling each request on its own thread."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StubRequest(object):
+    """Request details passed to stub route handlers."""
+
+    def __init__(self, method, path, query, headers, body):
+        """Request constructor."""
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        """Return the decoded JSON body."""
+        return json.loads(self.body.decode('utf-8')) if self.body else None
+
+
+class StubServer(object):
+    """Threaded HTTP server answering from registered route handlers.
+
+    Handlers take (request, *groups) and return a body, or a tuple of
+    (status, body) or (status, body, headers). Dictionaries and lists are
+    sent as JSON. Every request is kept in self.requests.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """Server constructor; port 0 picks a free port."""
+        self.routes = []
+        self.requests = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Dispatch every method to the stub routes."""
+
+            def _dispatch(self):
+                stub._handle(self)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = \
+                _dispatch
+
+            def log_message(self, format, *args):
+                """Keep test output quiet."""
+
+        self.server = _ThreadedServer((host, port), Handler)
+        self.thread = None
+
+    @property
+    def url(self):
+        """Return the server base URL."""
+        host, port = self.server.server_address[:2]
+        return 'http://%s:%s' % (host, port)
+
+    def route(self, method, pattern, handler):
+        """Register a handler for a method and full-match path regex."""
+        self.routes.append((method.upper(), re.compile(pattern), handler))
+        return self
+
+    def start(self):
+        """Serve in a background thread."""
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       name='staxing-stub', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        """Start the server for a with block."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop the server at the end of a with block."""
+        self.stop()
+
+    def _handle(self, handler):
+        """Route one request and write the response."""
+        parsed = urlparse(handler.path)
+        length = int(handler.headers.get('Content-Length') or 0)
+        request = StubRequest(handler.command, parsed.path,
+                              parse_qs(parsed.query), handler.headers,
+                              handler.rfile.read(length) if length else b'')
+        with self.lock:
+            self.requests.append(request)
+        status, body, headers = 404, {'error': 'not found'}, {}
+        for method, pattern, route in self.routes:
+            match = pattern.fullmatch(parsed.path)
+            if method == handler.command and match:
+                try:
+                    result = route(request, *match.groups())
+                except Exception as err:
+                    result = (500, {'error': repr(err)})
+                if isinstance(result, tuple):
+                    status, body = result[0], result[1]
+                    headers = result[2] if len(result) > 2 else {}
+                else:
+                    status, body = 200, result
+                break
+        if isinstance(body, (dict, list)):
+            data = json.dumps(body).encode('utf-8')
+            headers.setdefault('Content-Type', 'application/json')
+        elif isinstance(body, bytes):
+            data = body
+        else:
+            data = ('' if body is None else str(body)).encode('utf-8')
+            headers.setdefault('Content-Type', 'text/html; charset=utf-8')
+        handler.send_response(status)
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        if handler.command != 'HEAD':
+            handler.wfile.write(data)
+
+
+class FakeTutor(StubServer):
+    """In-memory stand-in for the Tutor plan API.
+
+    courses: {course_id: {'name', 'ecosystem_id', 'periods': [...]}}
+    readings: {ecosystem_id: Tutor readings tree}
+    exercises: {ecosystem_id: [{'id', 'uid', 'page_id'}]}
+    """
+
+    def __init__(self, courses=None, readings=None, exercises=None,
+                 **kwargs):
+        """Fake Tutor constructor."""
+        super(FakeTutor, self).__init__(**kwargs)
+        self.courses = courses if courses is not None else {
+            1: {
+                'name': 'Physics with Courseware Review',
+                'ecosystem_id': 1,
+                'periods': [
+                    {'id': 11, 'name': 'First'},
+                    {'id': 12, 'name': 'Second'},
+                    {'id': 13, 'name': 'Third'},
+                ],
+            },
+        }
+        self.readings = readings if readings is not None else {
+            1: [
+                {'id': 'ch1', 'title': 'Chapter 1', 'chapter_section': [1],
+                 'children': [
+                     {'id': 101, 'title': 'Intro', 'chapter_section': [1, 1]},
+                     {'id': 102, 'title': 'Units', 'chapter_section': [1, 2]},
+                 ]},
+                {'id': 'ch2', 'title': 'Chapter 2', 'chapter_section': [2],
+                 'children': [
+                     {'id': 201, 'title': 'Motion', 'chapter_section': [2, 1]},
+                 ]},
+            ],
+        }
+        self.exercises = exercises if exercises is not None else {
+            1: [
+                {'id': 1000 + index, 'uid': '%s@1' % (1000 + index),
+                 'page_id': page}
+                for index, page in enumerate([101, 101, 102, 102, 201, 201])
+            ],
+        }
+        self.plans = {}
+        self.next_plan = 1
+        self.route('GET', r'/api/courses/(\d+)', self._course)
+        self.route('GET', r'/api/ecosystems/(\d+)/readings', self._readings)
+        self.route('GET', r'/api/ecosystems/(\d+)/exercises/homework_core',
+                   self._exercises)
+        self.route('GET', r'/api/courses/(\d+)/dashboard', self._dashboard)
+        self.route('POST', r'/api/courses/(\d+)/plans', self._create_plan)
+        self.route('DELETE', r'/api/plans/(\d+)', self._delete_plan)
+
+    def _course(self, request, course_id):
+        course = self.courses.get(int(course_id))
+        if course is None:
+            return 404, {'error': 'no course'}
+        return dict(course, id=int(course_id))
+
+    def _readings(self, request, ecosystem_id):
+        return self.readings.get(int(ecosystem_id), [])
+
+    def _exercises(self, request, ecosystem_id):
+        pages = set(int(page) for page in request.query.get('page_ids[]', []))
+        return {'items': [
+            exercise for exercise in self.exercises.get(int(ecosystem_id), [])
+            if not pages or exercise['page_id'] in pages
+        ]}
+
+    def _dashboard(self, request, course_id):
+        start = request.query.get('start_at', ['0000'])[0]
+        end = request.query.get('end_at', ['9999'])[0] + ' 99'
+        plans = [
+            plan for plan in list(self.plans.values())
+            if plan['course_id'] == int(course_id) and any(
+                start <= tasking['due_at'] <= end
+                for tasking in plan.get('tasking_plans', []))
+        ]
+        return {'plans': plans}
+
+    def _create_plan(self, request, course_id):
+        if int(course_id) not in self.courses:
+            return 404, {'error': 'no course'}
+        plan = request.json()
+        with self.lock:
+            plan['id'] = self.next_plan
+            self.next_plan += 1
+        plan['course_id'] = int(course_id)
+        plan['is_published'] = bool(plan.get('is_publish_requested'))
+        self.plans[plan['id']] = plan
+        return 201, plan
+
+    def _delete_plan(self, request, plan_id):
+        plan = self.plans.pop(int(plan_id), None)
+        if plan is None:
+            return 404, {'error': 'no plan'}
+        return plan
@@ -0,0 +1,358 @@
+"""Process and memory accounting for local browser sessions.
+
+psutil is used when installed; otherwise /proc is read directly, which
+covers the Linux CI hosts. Remote (Sauce Labs) sessions have no local
+processes and are skipped.
+"""
+
+import atexit
+import os
+import signal
+import threading
+import time
+
+from weakref import ref
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+
+__version__ = '0.0.3'
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def _proc_stat(pid):
+    """Return the fields of /proc/<pid>/stat after the command name."""
+    with open('/proc/%s/stat' % pid) as stat:
+        return stat.read().rsplit(')', 1)[1].split()
+
+
+def children(pid):
+    """Return every descendant process id of pid."""
+    if psutil is not None:
+        try:
+            return [child.pid for child in
+                    psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    parents = {}
+    for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+        if not entry.isdigit():
+            continue
+        try:
+            parents.setdefault(int(_proc_stat(entry)[1]), []).append(
+                int(entry))
+        except (IOError, OSError, IndexError):
+            continue
+    found = []
+    queue = [pid]
+    while queue:
+        for child in parents.get(queue.pop(), []):
+            found.append(child)
+            queue.append(child)
+    return found
+
+
+def usage(pid):
+    """Return (resident bytes, cpu seconds) for a process or None."""
+    try:
+        if psutil is not None:
+            process = psutil.Process(pid)
+            times = process.cpu_times()
+            return process.memory_info().rss, times.user + times.system
+        fields = _proc_stat(pid)
+        with open('/proc/%s/statm' % pid) as statm:
+            resident = int(statm.read().split()[1]) * PAGE_SIZE
+        return resident, (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except Exception:
+        return None
+
+
+def started(pid):
+    """Return the start time identifying a process, or None if gone.
+
+    A process id can be reused once its process exits; the start time
+    tells a reused id from the process that was tracked.
+    """
+    try:
+        if psutil is not None:
+            return psutil.Process(pid).create_time()
+        return int(_proc_stat(pid)[19])
+    except Exception:
+        return None
+
+
+def alive(pid):
+    """Return True if a process exists and is not a zombie."""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+    try:
+        return _proc_stat(pid)[0] != 'Z'
+    except (IOError, OSError, IndexError):
+        try:
+            os.kill(pid, 0)
+            return True
+        except OSError:
+            return False
+
+
+def driver_pids(driver):
+    """Return the local driver service process id for a WebDriver."""
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return [process.pid] if getattr(process, 'pid', None) else []
+
+
+class Session(object):
+    """Process tree and resource peaks for one browser session."""
+
+    def __init__(self, name, pids, driver=None):
+        """Session constructor."""
+        self.name = name
+        self.roots = list(pids)
+        self.pids = {}
+        self._discover(pids)
+        self._driver = ref(driver) if driver is not None else None
+        self.started = time.time()
+        self.peak_rss = 0
+        self.cpu = 0.0
+        self.samples = 0
+        self.released = False
+
+    @property
+    def driver(self):
+        """Return the WebDriver if it is still referenced."""
+        return self._driver() if self._driver is not None else None
+
+    def _discover(self, pids):
+        """Record the start time of processes not tracked yet."""
+        for pid in pids:
+            if pid not in self.pids:
+                start = started(pid)
+                if start is not None:
+                    self.pids[pid] = start
+
+    def _refresh(self):
+        """Add current descendants and drop exited or reused ids."""
+        for root in self.roots:
+            if self.same(root):
+                self._discover(children(root))
+        for pid in list(self.pids):
+            if not self.same(pid):
+                del self.pids[pid]
+
+    def same(self, pid):
+        """Return True if pid is still the process that was tracked."""
+        return pid in self.pids and started(pid) == self.pids[pid] and \
+            alive(pid)
+
+    def sample(self):
+        """Sum memory and CPU over the current process tree."""
+        self._refresh()
+        rss = 0
+        cpu = 0.0
+        for pid in list(self.pids):
+            stats = usage(pid)
+            if stats is None:
+                continue
+            rss += stats[0]
+            cpu += stats[1]
+        self.peak_rss = max(self.peak_rss, rss)
+        self.cpu = max(self.cpu, cpu)
+        self.samples += 1
+        return rss
+
+    def living(self):
+        """Return the tracked process ids still running.
+
+        Exited processes are forgotten, so an id later reused by an
+        unrelated process is never reported.
+        """
+        self._refresh()
+        return sorted(self.pids)
+
+    def summary(self):
+        """Return the session's resource report."""
+        return {
+            'name': self.name,
+            'pids': sorted(self.pids),
+            'peak_rss_mb': round(self.peak_rss / 1048576.0, 1),
+            'cpu_seconds': round(self.cpu, 2),
+            'samples': self.samples,
+            'seconds': round(time.time() - self.started, 1),
+            'released': self.released,
+        }
+
+
+class Supervisor(object):
+    """Track, sample and reap the processes behind each WebDriver.
+
+    interval (float): seconds between background samples; 0 disables the
+        sampler so samples are only taken on demand
+    grace (float): seconds to wait after SIGTERM before SIGKILL
+    """
+
+    def __init__(self, interval=5.0, grace=3.0):
+        """Supervisor constructor."""
+        self.interval = interval
+        self.grace = grace
+        self.sessions = []
+        self.lock = threading.Lock()
+        self.thread = None
+        self.handlers = {}
+
+    def track(self, driver, name=None, pids=None):
+        """Start accounting for a driver's local processes."""
+        pids = list(pids or []) + driver_pids(driver)
+        if not pids:
+            return None
+        session = Session(name if name else 'session-%s' % pids[0], pids,
+                          driver)
+        session.sample()
+        with self.lock:
+            self.sessions.append(session)
+            if self.interval and self.thread is None:
+                self.thread = threading.Thread(target=self._run,
+                                               name='staxing-supervisor',
+                                               daemon=True)
+                self.thread.start()
+        self.install()
+        return session
+
+    def find(self, driver):
+        """Return the active session for a driver or None."""
+        with self.lock:
+            for session in self.sessions:
+                if session.driver is driver and not session.released:
+                    return session
+        return None
+
+    def sample(self):
+        """Sample every active session now."""
+        with self.lock:
+            active = [session for session in self.sessions
+                      if not session.released]
+        for session in active:
+            session.sample()
+
+    def sample_driver(self, driver):
+        """Sample one driver's session now; return its resident bytes.
+
+        Call before quit() so children re-parented by the exiting
+        browser are still found under the session's roots.
+        """
+        session = self.find(driver)
+        return session.sample() if session is not None else None
+
+    def _run(self):
+        """Sample on a timer."""
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sample()
+            except Exception as err:
+                LOG.debug(self, 'Sampling failed: %s', err)
+
+    def kill(self, pids, session=None):
+        """Terminate processes, escalating to SIGKILL after the grace.
+
+        With a session, each process is checked to still be the one the
+        session tracked before every signal.
+        """
+        def owned(pid):
+            return alive(pid) and (session is None or session.same(pid))
+
+        for pid in pids:
+            if owned(pid):
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+        deadline = time.monotonic() + self.grace
+        remaining = [pid for pid in pids if owned(pid)]
+        while remaining and time.monotonic() < deadline:
+            time.sleep(0.1)
+            remaining = [pid for pid in remaining if owned(pid)]
+        for pid in remaining:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        return list(pids)
+
+    def release(self, driver, quit_error=None):
+        """Close a session's accounting and kill anything left running.
+
+        The session is forgotten; returns the process ids that had to be
+        killed.
+        """
+        session = self.find(driver)
+        if session is None:
+            return []
+        session.sample()
+        session.released = True
+        with self.lock:
+            self.sessions.remove(session)
+        leaked = session.living()
+        if leaked:
+            LOG.warning(self, 'Reaping %s leaked processes for %s',
+                        len(leaked), session.name, error=quit_error)
+            self.kill(leaked, session)
+        return leaked
+
+    def reap(self):
+        """Kill the processes of every unreleased session."""
+        with self.lock:
+            active = [session for session in self.sessions
+                      if not session.released]
+            self.sessions = []
+        killed = []
+        for session in active:
+            session.released = True
+            killed += self.kill(session.living(), session)
+        if killed:
+            LOG.warning(self, 'Reaped %s orphaned browser processes',
+                        len(killed))
+        return killed
+
+    def report(self):
+        """Return the resource summary of every active session."""
+        with self.lock:
+            return [session.summary() for session in self.sessions]
+
+    def install(self):
+        """Reap on interpreter exit and on SIGTERM or SIGINT (once)."""
+        if self.handlers or \
+                threading.current_thread() is not threading.main_thread():
+            return
+        atexit.register(self.reap)
+        for number in (signal.SIGTERM, signal.SIGINT):
+            try:
+                self.handlers[number] = signal.signal(number, self._signal)
+            except (ValueError, OSError):
+                continue
+
+    def _signal(self, number, frame):
+        """Reap, then hand the signal to the previous handler."""
+        self.reap()
+        previous = self.handlers.get(number)
+        if callable(previous):
+            return previous(number, frame)
+        if previous == signal.SIG_IGN:
+            return
+        signal.signal(number, signal.SIG_DFL)
+        os.kill(os.getpid(), number)
+
+
+SUPERVISOR = Supervisor(interval=float(
+    os.getenv('STAXING_SAMPLE_INTERVAL', '5')))
@@ -0,0 +1,195 @@
+"""Interleave several logical sessions across the tabs of one browser."""
+
+import time
+
+try:
+    from staxing.element_cache import ElementCache
+except ImportError:
+    from element_cache import ElementCache
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+
+__version__ = '0.0.3'
+
+# the old document keeps the mark until it unloads
+NAVIGATE = '''
+window.__staxingLeaving = true;
+window.location.href = arguments[0];
+'''
+READY = 'return [document.readyState, !window.__staxingLeaving];'
+TIMEOUT = 300
+
+
+class Tab(object):
+    """One logical session living in a browser window or tab.
+
+    Task generators yield to hand the browser to another tab:
+        yield                 resume on the next round
+        yield 1.5             resume after at least 1.5 seconds
+        yield tab.navigate(u) start loading u and resume once it is ready
+        yield predicate       resume when predicate(tab) is true
+
+    helper (Helper): optional User/Helper session driving this tab; its
+        methods act on the tab because the scheduler focuses the tab
+        before resuming its task
+    """
+
+    def __init__(self, scheduler, name, handle, helper=None):
+        """Tab constructor."""
+        self.scheduler = scheduler
+        self.name = name
+        self.handle = handle
+        self.helper = helper
+        self.task = None
+        self.ready_at = 0.0
+        self.condition = None
+        self.steps = 0
+        self.error = None
+
+    @property
+    def driver(self):
+        """Return the shared WebDriver focused on this tab."""
+        return self.scheduler.focus(self)
+
+    def navigate(self, url):
+        """Start loading a page without blocking; yield the result."""
+        driver = self.driver
+        previous = driver.current_url
+        driver.execute_script(NAVIGATE, url)
+        ElementCache.for_driver(driver).page_changed()
+        return Tab.loaded(previous)
+
+    @staticmethod
+    def loaded(previous=None):
+        """Return a predicate true once the tab left previous and loaded.
+
+        The navigation is done when the document is complete and either
+        the marked old document is gone or the URL changed, so redirects
+        and in-page navigations both count.
+        """
+        def ready(tab):
+            driver = tab.driver
+            state, fresh = driver.execute_script(READY)
+            if state != 'complete':
+                return False
+            return previous is None or fresh or \
+                driver.current_url != previous
+        return ready
+
+
+class TabScheduler(object):
+    """Run task generators for many tabs on one WebDriver.
+
+    Steps run round-robin; a tab waiting on a page load or a delay is
+    skipped so another tab can use the browser in the meantime.
+
+    driver (WebDriver): browser hosting every tab
+    poll (float): seconds to sleep when every tab is waiting
+    """
+
+    def __init__(self, driver, poll=0.05):
+        """Scheduler constructor."""
+        self.driver = driver
+        self.poll = poll
+        self.tabs = []
+        self.current = driver.current_window_handle
+        ElementCache.for_driver(driver).focus(self.current)
+
+    def focus(self, tab):
+        """Switch the browser to a tab if it is not already focused."""
+        if self.current != tab.handle:
+            self.driver.switch_to.window(tab.handle)
+            self.current = tab.handle
+            # cached element handles are kept per window
+            ElementCache.for_driver(self.driver).focus(tab.handle)
+        return self.driver
+
+    def open(self, name, url=None, helper=None):
+        """Open a tab (the first reuses the current window) and return it.
+
+        helper (Helper): session for the tab, built on this browser with
+            existing_driver; the tab does not quit the shared browser
+        """
+        if helper is not None:
+            if helper.driver is not self.driver:
+                raise ValueError('Tab %s helper drives another browser.' %
+                                 name)
+            helper.shared_driver = True
+        if not self.tabs:
+            handle = self.driver.current_window_handle
+        else:
+            before = set(self.driver.window_handles)
+            self.driver.execute_script('window.open("about:blank");')
+            handle = (set(self.driver.window_handles) - before).pop()
+        tab = Tab(self, name, handle, helper)
+        self.tabs.append(tab)
+        if url:
+            tab.condition = tab.navigate(url)
+        return tab
+
+    def add(self, tab, task, *args, **kwargs):
+        """Attach a task generator function, called as task(tab, ...)."""
+        tab.task = task(tab, *args, **kwargs)
+        return tab
+
+    def _waiting(self, tab, now):
+        """Return True if a tab cannot run yet."""
+        if tab.ready_at > now:
+            return True
+        if tab.condition is not None:
+            if not tab.condition(tab):
+                return True
+            tab.condition = None
+        return False
+
+    def _step(self, tab):
+        """Resume a tab's task until its next yield."""
+        self.focus(tab)
+        try:
+            request = next(tab.task)
+        except StopIteration:
+            tab.task = None
+            return
+        except Exception as err:
+            tab.task = None
+            tab.error = err
+            LOG.warning(self, 'Tab %s failed: %s', tab.name, err)
+            return
+        tab.steps += 1
+        if isinstance(request, (int, float)):
+            tab.ready_at = time.monotonic() + request
+        elif callable(request):
+            tab.condition = request
+
+    def run(self, timeout=TIMEOUT):
+        """Run every task to completion and return {tab name: error}.
+
+        Raises TimeoutError after timeout seconds; None waits forever.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        while any(tab.task is not None for tab in self.tabs):
+            progressed = False
+            for tab in self.tabs:
+                if tab.task is None or self._waiting(tab, time.monotonic()):
+                    continue
+                self._step(tab)
+                progressed = True
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError('Tabs still running: %s' % ', '.join(
+                    tab.name for tab in self.tabs if tab.task is not None))
+            if not progressed:
+                time.sleep(self.poll)
+        return {tab.name: tab.error for tab in self.tabs}
+
+    def close(self):
+        """Close every tab but the first."""
+        cache = ElementCache.for_driver(self.driver)
+        for tab in self.tabs[1:]:
+            self.focus(tab)
+            self.driver.close()
+            cache.drop_window(tab.handle)
+        if self.tabs:
+            self.focus(self.tabs[0])
+        self.tabs = self.tabs[:1]
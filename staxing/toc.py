@@ -0,0 +1,210 @@
+"""CNX book tables of contents, fetched once and cached on disk."""
+
+import json
+import os
+import re
+import tempfile
+import time
+
+from collections import namedtuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from bs4 import BeautifulSoup
+
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+
+__version__ = '0.0.1'
+
+BOOK_PATH = re.compile(r'/contents/([^:/]+)(?::([^/?#]+))?')
+NUMBER = re.compile(r'^\s*(\d+(?:\.\d+)*)\.?\s+')
+# end-of-chapter pages, which carry no section number
+CLOSING = ('key terms', 'key equations', 'summary', 'chapter summary',
+           'review questions', 'problems', 'exercises', 'references',
+           'conceptual questions', 'test prep', 'critical thinking items',
+           'additional problems', 'challenge problems')
+
+Entry = namedtuple('Entry', ['index', 'id', 'short_id', 'title', 'number',
+                             'chapter', 'url'])
+Entry.__doc__ = """One page in a book's reading order.
+
+index (int): position in the flattened table of contents
+id (string): page uuid, without a version
+short_id (string): short page id, when the archive provides one
+title (string): page title without its number
+number (string): section number, e.g. '2.3'; introductions are 'n.0'
+chapter (int): chapter number, or None outside the chapters
+url (string): webview URL of the page
+"""
+
+
+def book_from_url(url):
+    """Return (book id, page id) from a webview URL or (None, None)."""
+    match = BOOK_PATH.search(urlparse(url).path)
+    if not match:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+def _bare(identifier):
+    """Return an id without its '@version' suffix."""
+    return (identifier or '').split('@')[0]
+
+
+def _title(raw):
+    """Split an archive title into (number, text)."""
+    text = ' '.join(BeautifulSoup(raw or '', 'html.parser').get_text(
+        ' ').split())
+    match = NUMBER.match(text)
+    if match:
+        return match.group(1), text[match.end():]
+    return None, text
+
+
+class BookTOC(object):
+    """Reading order of a CNX book from the archive JSON.
+
+    The tree is fetched once per book version and stored in cache_dir;
+    books requested without a version are refreshed after max_age seconds.
+
+    book (string): book uuid or short id, optionally '@version'
+    site (string): webview base URL used to build page links
+    archive (string): archive base URL serving /contents/<book>.json
+    """
+
+    def __init__(self, book, site='https://demo.cnx.org/',
+                 archive='https://archive.cnx.org/', cache_dir=None,
+                 max_age=86400, session=None, timeout=30):
+        """Table of contents constructor."""
+        self.book = book
+        self.site = site if site.endswith('/') else site + '/'
+        self.archive = archive if archive.endswith('/') else archive + '/'
+        self.cache_dir = cache_dir if cache_dir else os.getenv(
+            'STAXING_TOC_CACHE',
+            os.path.join(tempfile.gettempdir(), 'staxing-toc'))
+        self.max_age = max_age
+        self.session = session if session is not None else requests.Session()
+        self.timeout = timeout
+        self._entries = None
+        self.by_id = {}
+        self.by_number = {}
+        self.by_title = {}
+
+    @property
+    def path(self):
+        """Return the cache file for this book."""
+        return os.path.join(self.cache_dir, '%s.json' %
+                            re.sub(r'[^\w.@-]', '_', self.book))
+
+    def _cached(self):
+        """Return the cached archive tree or None."""
+        try:
+            if '@' not in self.book and \
+                    time.time() - os.path.getmtime(self.path) > self.max_age:
+                return None
+            with open(self.path) as cache:
+                return json.load(cache)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def fetch(self):
+        """Download the book tree from the archive and cache it."""
+        response = self.session.get(
+            urljoin(self.archive, 'contents/%s.json' % self.book),
+            timeout=self.timeout)
+        response.raise_for_status()
+        book = response.json()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary = '%s.%s' % (self.path, os.getpid())
+        with open(temporary, 'w') as cache:
+            json.dump(book, cache)
+        os.replace(temporary, self.path)
+        LOG.debug(self, 'Cached table of contents for %s', self.book)
+        return book
+
+    @property
+    def entries(self):
+        """Return every page in reading order."""
+        if self._entries is None:
+            book = self._cached() or self.fetch()
+            self._build(book)
+        return self._entries
+
+    def _build(self, book):
+        """Flatten the archive tree and index its pages."""
+        book_id = book.get('id', self.book)
+        if book.get('version') and '@' not in book_id:
+            book_id = '%s@%s' % (book_id, book['version'])
+        self._entries = []
+        chapter = [0]
+
+        def walk(nodes, chapter_number):
+            position = 0
+            for node in nodes:
+                number, title = _title(node.get('title'))
+                children = node.get('contents')
+                if children is not None:
+                    if chapter_number is not None or \
+                            any('contents' in child for child in children):
+                        # units hold chapters; deeper groups stay in one
+                        walk(children, chapter_number)
+                        continue
+                    chapter[0] = int(number.split('.')[0]) if number \
+                        else chapter[0] + 1
+                    walk(children, chapter[0])
+                    continue
+                if number is None and chapter_number is not None:
+                    if title.lower().startswith('introduction'):
+                        number = '%s.0' % chapter_number
+                    elif title.lower() not in CLOSING:
+                        position += 1
+                        number = '%s.%s' % (chapter_number, position)
+                elif number is not None and '.' in number:
+                    position = int(number.split('.')[-1])
+                page = _bare(node.get('id'))
+                self._entries.append(Entry(
+                    len(self._entries), page, node.get('shortId'), title,
+                    number, chapter_number,
+                    '%scontents/%s:%s' % (self.site, book_id, page)))
+
+        walk(book.get('tree', {}).get('contents', []), None)
+        for entry in self._entries:
+            self.by_id[entry.id] = entry
+            if entry.short_id:
+                self.by_id[_bare(entry.short_id)] = entry
+            if entry.number:
+                self.by_number.setdefault(entry.number, entry)
+            self.by_title.setdefault(entry.title.lower(), entry)
+
+    def find(self, section_name=None, section_number=None):
+        """Return the entry for a section number or title."""
+        entries = self.entries
+        entry = None
+        if section_number is not None:
+            entry = self.by_number.get(str(section_number))
+        elif section_name is not None:
+            entry = self.by_title.get(section_name.lower()) or next(
+                (item for item in entries
+                 if section_name.lower() in item.title.lower()), None)
+        if entry is None:
+            raise LookupError('No section %s in %s' % (
+                section_number if section_number is not None
+                else section_name, self.book))
+        return entry
+
+    def locate(self, url):
+        """Return the entry for a webview page URL or None."""
+        page = _bare(book_from_url(url)[1])
+        return self.by_id.get(page) if self.entries else None
+
+    def __len__(self):
+        """Return the number of pages."""
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        """Return the entry at a reading order position."""
+        return self.entries[index]
@@ -0,0 +1,296 @@
+"""Tutor JSON API access that reuses a logged-in browser session."""
+
+import random
+import re
+
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+try:
+    from staxing.events import LOG
+except ImportError:
+    from events import LOG
+try:
+    from staxing.schedule import parse_date, parse_time
+except ImportError:
+    from schedule import parse_date, parse_time
+
+__version__ = '0.0.1'
+
+COURSE_PATH = re.compile(r'/courses?/(\d+)')
+
+
+def session_from_driver(driver, session=None):
+    """Copy the browser's cookies into a requests session."""
+    if session is None and getattr(driver, 'http_session', None) is not None:
+        # the browserless driver already browses with a requests session
+        return driver.http_session
+    session = session if session is not None else requests.Session()
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie['name'], cookie['value'],
+                            domain=cookie.get('domain', ''),
+                            path=cookie.get('path', '/'))
+    session.headers['User-Agent'] = driver.execute_script(
+        'return navigator.userAgent;') or session.headers['User-Agent']
+    token = driver.execute_script(
+        'var meta = document.querySelector("meta[name=csrf-token]");' +
+        'return meta ? meta.content : null;')
+    if token:
+        session.headers['X-CSRF-Token'] = token
+    return session
+
+
+def course_id_from_url(url):
+    """Return the course id in a Tutor URL or None."""
+    match = COURSE_PATH.search(urlparse(url).path)
+    return int(match.group(1)) if match else None
+
+
+class TutorAPI(object):
+    """Thin JSON client for the Tutor API."""
+
+    def __init__(self, base_url, session=None, timeout=30):
+        """API client constructor.
+
+        base_url (string): Tutor site, e.g. https://tutor-qa.openstax.org
+        session (requests.Session): session holding the login cookies
+        timeout (float): seconds to wait for each response
+        """
+        self.base_url = base_url.rstrip('/') + '/'
+        self.session = session if session is not None else requests.Session()
+        self.session.headers.setdefault('Accept', 'application/json')
+        self.timeout = timeout
+        self.cache = {}
+
+    @classmethod
+    def from_driver(cls, driver, base_url=None, **kwargs):
+        """Build a client sharing a WebDriver's login session."""
+        if base_url is None:
+            parsed = urlparse(driver.current_url)
+            base_url = '%s://%s' % (parsed.scheme, parsed.netloc)
+        return cls(base_url, session_from_driver(driver), **kwargs)
+
+    def clone(self):
+        """Return a client with its own connection pool and the same login.
+
+        requests sessions are not thread-safe, so each worker thread uses
+        its own clone.
+        """
+        session = requests.Session()
+        session.headers.update(self.session.headers)
+        session.cookies.update(self.session.cookies)
+        api = type(self)(self.base_url, session, self.timeout)
+        api.cache = self.cache
+        return api
+
+    def request(self, method, path, **kwargs):
+        """Send a request and return the decoded JSON body."""
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.request(
+            method, urljoin(self.base_url, path.lstrip('/')), **kwargs)
+        response.raise_for_status()
+        return response.json() if response.content else None
+
+    def get(self, path, **params):
+        """GET a path with query parameters."""
+        return self.request('GET', path, params=params)
+
+    def cached(self, path, **params):
+        """GET a path once per client."""
+        key = (path, tuple(sorted(params.items())))
+        if key not in self.cache:
+            self.cache[key] = self.get(path, **params)
+        return self.cache[key]
+
+    def post(self, path, data):
+        """POST a JSON body."""
+        return self.request('POST', path, json=data)
+
+    def delete(self, path):
+        """DELETE a path."""
+        return self.request('DELETE', path)
+
+    def course(self, course_id):
+        """Return the course record, including its periods."""
+        return self.cached('/api/courses/%s' % course_id)
+
+    def readings(self, ecosystem_id):
+        """Return the chapter and section tree for an ecosystem."""
+        return self.cached('/api/ecosystems/%s/readings' % ecosystem_id)
+
+    def exercises(self, ecosystem_id, page_ids):
+        """Return the homework exercises for a set of pages."""
+        return self.get('/api/ecosystems/%s/exercises/homework_core' %
+                        ecosystem_id,
+                        **{'page_ids[]': sorted(page_ids)})['items']
+
+    def plans(self, course_id, start, end):
+        """Return the course plans shown on the calendar between two dates."""
+        return self.get('/api/courses/%s/dashboard' % course_id,
+                        start_at=parse_date(start).isoformat(),
+                        end_at=parse_date(end).isoformat())['plans']
+
+    def create_plan(self, course_id, plan):
+        """Create a task plan and return the stored record."""
+        return self.post('/api/courses/%s/plans' % course_id, plan)
+
+    def delete_plan(self, plan_id):
+        """Delete a task plan."""
+        return self.delete('/api/plans/%s' % plan_id)
+
+
+class AssignmentAPI(object):
+    """Assignment backend that creates plans over HTTP.
+
+    Takes the same arguments as the Assignment.add entries so a test can
+    switch between the UI and the API without changing its data.
+    """
+
+    OPEN_TIME = '00:01'
+    DUE_TIME = '07:00'
+
+    def __init__(self, api, course_id):
+        """Backend constructor."""
+        self.api = api
+        self.course_id = course_id
+
+    @classmethod
+    def from_driver(cls, driver, course_id=None, base_url=None):
+        """Build a backend for the course open in a WebDriver."""
+        course_id = course_id if course_id is not None else \
+            course_id_from_url(driver.current_url)
+        if course_id is None:
+            raise ValueError('No course id in %s' % driver.current_url)
+        return cls(TutorAPI.from_driver(driver, base_url), course_id)
+
+    @property
+    def course(self):
+        """Return the course record."""
+        return self.api.course(self.course_id)
+
+    def sections(self):
+        """Return {'ch<n>' or '<n>.<m>': [page ids]} for the course book."""
+        sections = {}
+        for chapter in self.api.readings(self.course['ecosystem_id']):
+            pages = []
+            for page in chapter.get('children', []):
+                key = '.'.join(str(part) for part in page['chapter_section'])
+                sections[key] = [page['id']]
+                pages.append(page['id'])
+            sections['ch%s' % chapter['chapter_section'][0]] = pages
+        return sections
+
+    def page_ids(self, readings):
+        """Return page ids for chapter and section numbers."""
+        sections = self.sections()
+        pages = []
+        for section in readings:
+            if section == 'tutor':
+                continue
+            if section not in sections:
+                raise ValueError('Unknown section: %s' % section)
+            pages += [page for page in sections[section] if page not in pages]
+        return pages
+
+    def tasking_plans(self, periods):
+        """Return tasking plans for the UI periods dictionary."""
+        known = {period['name']: period['id']
+                 for period in self.course['periods']}
+        targets = {name: periods['all'] for name in known} \
+            if 'all' in periods else periods
+        tasking = []
+        for name, (opens, closes) in sorted(targets.items()):
+            if name not in known:
+                raise ValueError('Unknown period: %s' % name)
+            tasking.append({
+                'target_id': str(known[name]),
+                'target_type': 'period',
+                'opens_at': self._moment(opens, self.OPEN_TIME),
+                'due_at': self._moment(closes, self.DUE_TIME),
+            })
+        if not tasking:
+            raise ValueError('No periods matched')
+        return tasking
+
+    def _moment(self, value, default_time):
+        """Return 'YYYY-MM-DD HH:MM' for a date or a (date, time) pair."""
+        date, at = value if isinstance(value, tuple) else (value, None)
+        return '%s %s' % (parse_date(date).isoformat(),
+                          parse_time(at) if at else default_time)
+
+    def exercise_ids(self, problems):
+        """Choose exercise ids the way the homework UI picks them."""
+        sections = self.sections()
+        pages = self.page_ids(problems)
+        by_page = {}
+        for exercise in self.api.exercises(self.course['ecosystem_id'],
+                                           pages):
+            by_page.setdefault(exercise['page_id'], []).append(exercise)
+        using = []
+        for section, choice in problems.items():
+            if section == 'tutor' or choice is None or \
+                    str(choice).lower() == 'none':
+                continue
+            available = [exercise for page in sections[section]
+                         for exercise in by_page.get(page, [])]
+            if choice == 'all':
+                chosen = available
+            elif isinstance(choice, tuple):
+                low, high = choice
+                total = min(random.randint(int(low), int(high)),
+                            len(available))
+                chosen = random.sample(available, total)
+            elif isinstance(choice, int):
+                chosen = available[:choice]
+            else:
+                wanted = set(str(ex) for ex in choice)
+                chosen = [exercise for exercise in available
+                          if exercise['uid'] in wanted or
+                          str(exercise['id']) in wanted]
+            for exercise in chosen:
+                if exercise['id'] not in using:
+                    using.append(exercise['id'])
+        return pages, using
+
+    def build(self, assignment, name, description, periods, state,
+              reading_list=None, problems=None, url=None, feedback=None):
+        """Return the plan JSON for Assignment.add arguments."""
+        plan = {
+            'title': name,
+            'description': description or '',
+            'type': assignment,
+            'is_publish_requested': state == 'publish',
+            'tasking_plans': self.tasking_plans(periods),
+            'settings': {},
+        }
+        if assignment == 'reading':
+            plan['settings']['page_ids'] = self.page_ids(reading_list or [])
+        elif assignment == 'homework':
+            problems = problems or {}
+            pages, exercises = self.exercise_ids(problems)
+            plan['settings'] = {
+                'page_ids': pages,
+                'exercise_ids': exercises,
+                'exercises_count_dynamic': int(problems.get('tutor', 3)),
+            }
+            plan['is_feedback_immediate'] = feedback == 'immediate'
+        elif assignment == 'external':
+            plan['settings']['external_url'] = url
+        return plan
+
+    def add(self, assignment, name, description, periods, state,
+            reading_list=None, problems=None, url=None, feedback=None,
+            **kwargs):
+        """Create a plan and return its record; cancel creates nothing."""
+        if state == 'cancel':
+            return None
+        LOG.info(self, 'Creating a new %s', assignment.title(),
+                 course=self.course_id)
+        plan = self.build(assignment, name, description, periods, state,
+                          reading_list, problems, url, feedback)
+        return self.api.create_plan(self.course_id, plan)
+
+    def delete(self, plan_id):
+        """Delete a plan by id."""
+        return self.api.delete_plan(plan_id)
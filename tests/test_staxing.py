@@ -2,17 +2,57 @@
 
 import os
 import datetime
+import gc
+import io
+import json
 import pytest
+import subprocess
+import sys
+import tempfile
+import threading
 import time
 import unittest
+import weakref
 
 from random import randint
 from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver import Chrome, ChromeOptions, Remote
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as expect
 from selenium.webdriver.support.ui import WebDriverWait
+from urllib.parse import parse_qs, quote
+from staxing.admin_tables import AdminTable
+from staxing.artifacts import ArtifactRecorder
 from staxing.assignment import Assignment
+from staxing.broker import FileSemaphore, SessionBroker
+from staxing.budget import Budget, BudgetExceeded, main as budget_main
+from staxing.cleanup import CourseCleanup
+from staxing.content import BookCrawler
+from staxing.content_index import ContentIndex
+from staxing.element_cache import ElementCache
+from staxing.event_wait import EventWait
+from staxing.events import EventLogger, EventWriter
+from staxing.http_driver import HTTPDriver
 from staxing.helper import Helper, Teacher, Student, Admin, ContentQA, User
+from staxing.helper import Webview
+from staxing.jobs import JobWatcher
+from staxing.latency import LatencyHistogram
+from staxing.load import Pacer, PracticeLoad
+from staxing.locators import LOCATORS, Locator, LocatorRegistry
+from staxing.metrics import route
+from staxing.page_load import SeleniumWait
+from staxing.provision import Provisioner
+from staxing.replay import CommandRecorder, Replayer
+from staxing.runtime import Runtime
+from staxing.schedule import Moment, Schedule, input_time, normalize
+from staxing.supervisor import Supervisor, alive
+from staxing.tabs import TabScheduler
+from staxing.toc import BookTOC
+from staxing.stub_server import FakeTutor, StubServer
+from staxing.tutor_api import AssignmentAPI, TutorAPI
 
 __version__ = '0.0.5'
 TESTS = os.getenv(
@@ -26,6 +66,10 @@ TESTS = os.getenv(
         # 601,
         # 701,
         # 801,
+        901, 902, 903, 904, 905, 906, 907, 908, 909, 910,
+        911, 912, 913, 914, 915, 916, 917, 918, 919, 920,
+        921, 922, 923, 924, 925, 926, 927, 928, 929, 930,
+        931, 932, 933, 934, 935, 936, 937, 938, 939, 940,
     ])
 )
 
@@ -194,8 +238,7 @@ class TestStaxingUser(unittest.TestCase):
         courses = self.user.get_course_list()
         course_number = 0 if len(courses) <= 1 \
             else randint(1, len(courses)) - 1
-        title = courses[course_number].get_attribute('data-title')
-        Assignment.scroll_to(self.user.driver, courses[course_number])
+        title = courses[course_number]['title']
         self.user.select_course(title=title)
         was_successful = 'course' in self.user.current_url() or \
             'list' in self.user.current_url() or \
@@ -218,7 +261,7 @@ class TestStaxingUser(unittest.TestCase):
         courses = self.user.get_course_list()
         course_number = 0 if len(courses) <= 1 \
             else randint(1, len(courses)) - 1
-        appearance = courses[course_number].get_attribute('data-appearance')
+        appearance = courses[course_number]['appearance']
         appearance_courses = self.user.find_all(
                 By.XPATH,
                 '//div[contains(@data-appearance,"%s")]' % appearance
@@ -228,8 +271,7 @@ class TestStaxingUser(unittest.TestCase):
             for course in appearance_courses:
                 title = title.join((' ', course.text))
         else:
-            title = courses[course_number].text
-        Assignment.scroll_to(self.user.driver, courses[course_number])
+            title = courses[course_number]['text']
         self.user.select_course(appearance=appearance)
         was_successful = 'course' in self.user.current_url() or \
             'list' in self.user.current_url() or \
@@ -254,9 +296,7 @@ class TestStaxingUser(unittest.TestCase):
         course_number = 0 if len(courses) <= 1 \
             else randint(1, len(courses)) - 1
         print(course_number)
-        Assignment.scroll_to(self.user.driver, courses[course_number])
-        self.user.select_course(
-            title=courses[course_number].get_attribute('data-title'))
+        self.user.select_course(title=courses[course_number]['title'])
         url = self.user.current_url()
         was_successful = 'course' in url or \
             'list' in url or \
@@ -279,9 +319,7 @@ class TestStaxingUser(unittest.TestCase):
         courses = self.user.get_course_list()
         course_number = 0 if len(courses) <= 1 \
             else randint(1, len(courses)) - 1
-        Assignment.scroll_to(self.user.driver, courses[course_number])
-        self.user.select_course(
-            title=courses[course_number].get_attribute('data-title'))
+        self.user.select_course(title=courses[course_number]['title'])
         url = self.user.current_url()
         was_successful = 'course' in url or \
             'list' in url or \
@@ -741,3 +779,1575 @@ class TestStaxingContentQA(unittest.TestCase):
     # def test_base_case(self):
     #     """No test placeholder."""
     #     pass
+
+
+class TestStaxingLocators(unittest.TestCase):
+    """Staxing case tests for the locator registry."""
+
+    @pytest.mark.skipif(str(901) not in TESTS, reason='Excluded')
+    def test_locator_prefers_css_and_formats_templates(self):
+        """Compile a templated locator to its CSS form."""
+        by, value = LOCATORS.get('course.select', option='title',
+                                 value='Biology')
+        assert(by == By.CSS_SELECTOR), 'CSS not preferred: %s' % by
+        assert(value == 'div[data-title="Biology"] a'), \
+            'Template not formatted: %s' % value
+        by, value = LOCATORS.get('course.select', strategy=By.XPATH,
+                                 option='title', value='Biology')
+        assert(value == '//div[@data-title="Biology"]//a'), \
+            'XPath not formatted: %s' % value
+
+    @pytest.mark.skipif(str(902) not in TESTS, reason='Excluded')
+    def test_locator_registry_versions(self):
+        """Newer locator versions replace older ones."""
+        registry = LocatorRegistry()
+        registry.register(Locator('menu', xpath='//button', version=1))
+        registry.register(Locator('menu', css='button.menu', version=2))
+        assert(registry.get('menu') == (By.CSS_SELECTOR, 'button.menu')), \
+            'Version 2 not current: %s' % str(registry.get('menu'))
+        assert(registry.get('menu', version=1) == (By.XPATH, '//button')), \
+            'Version 1 not kept: %s' % str(registry.get('menu', version=1))
+
+
+class TestStaxingElementCache(unittest.TestCase):
+    """Staxing case tests for the element cache."""
+
+    class FakeElement(object):
+        """Element stand-in that can go stale."""
+
+        def __init__(self, id_):
+            """Element constructor."""
+            self.id = id_
+            self.stale = False
+
+        def click(self):
+            """Click or fail when stale."""
+            if self.stale:
+                raise StaleElementReferenceException('stale')
+            return self.id
+
+    class FakeDriver(object):
+        """WebDriver stand-in counting lookups."""
+
+        def __init__(self):
+            """Driver constructor."""
+            self.lookups = 0
+
+        def find_element(self, by, value):
+            """Return a new element per lookup."""
+            self.lookups += 1
+            return TestStaxingElementCache.FakeElement(self.lookups)
+
+    @pytest.mark.skipif(str(903) not in TESTS, reason='Excluded')
+    def test_element_cache_reuses_and_refreshes_handles(self):
+        """Reuse handles until they go stale or the page changes."""
+        driver = self.FakeDriver()
+        cache = ElementCache(driver)
+        locator = (By.ID, 'reading-title')
+        first = cache.find(locator)
+        assert(cache.find(locator) is first), 'Handle not reused'
+        assert(driver.lookups == 1), 'Extra lookups: %s' % driver.lookups
+        first.stale = True
+        assert(cache.click(locator) == 2), 'Stale handle not refreshed'
+        cache.clear()
+        cache.find(locator)
+        assert(driver.lookups == 3), 'Cache not cleared: %s' % driver.lookups
+        closed = self.FakeDriver()
+        page = SeleniumWait(closed, 1)
+        ElementCache.for_driver(closed).find(locator)
+        page.page_changed()
+        assert(ElementCache.for_driver(closed).elements == {}), \
+            'Page change kept handles'
+        released = weakref.ref(closed)
+        del closed, page
+        gc.collect()
+        assert(released() is None), 'Cache keeps its driver alive'
+
+    @pytest.mark.skipif(str(930) not in TESTS, reason='Excluded')
+    def test_element_cache_drops_handles_after_click_navigation(self):
+        """Refind elements after a User click loads a new page."""
+        server = StubServer()
+        server.route('GET', r'/account', lambda request: (
+            '<h1 id="heading">Account</h1><a href="/goodbye">Log out</a>'))
+        server.route('GET', r'/goodbye', lambda request: (
+            '<h1 id="heading">Signed out</h1>'))
+        heading = (By.ID, 'heading')
+        with server:
+            helper = User('qa_user', 'staxing', site=server.url,
+                          driver_type='http')
+            other = User('qa_teacher', 'staxing', site=server.url,
+                         existing_driver=helper.driver)
+            other.shared_driver = True
+            helper.get(server.url + '/account')
+            before = helper.cache.find(heading)
+            helper.accounts_logout()
+            after = other.cache.text(heading)
+            lookups = helper.cache.misses
+            other.get(server.url + '/account')
+            other.accounts_logout()
+            helper.delete()
+        assert(helper.cache is other.cache), 'Cache not shared by helpers'
+        assert(after == 'Signed out' and lookups == 2), \
+            'Old page handle reused: %s after %s lookups' % (after, lookups)
+        assert(other.cache.elements == {} and before.id), \
+            'Second helper did not invalidate: %s' % other.cache.elements
+
+
+class TestStaxingArtifacts(unittest.TestCase):
+    """Staxing case tests for failure artifacts."""
+
+    class FakeDriver(object):
+        """WebDriver stand-in answering every command."""
+
+        def execute(self, driver_command, params=None):
+            """Return an empty WebDriver response."""
+            return {'value': None}
+
+    @pytest.mark.skipif(str(904) not in TESTS, reason='Excluded')
+    def test_artifact_recorder_keeps_recent_commands(self):
+        """Only the last N commands are buffered."""
+        driver = self.FakeDriver()
+        recorder = ArtifactRecorder(driver, size=3)
+        for index in range(5):
+            driver.execute('get', {'url': 'https://example.com/%s' % index})
+        history = recorder.history()
+        assert(len(history) == 3), 'Buffer not bounded: %s' % len(history)
+        assert(history[-1]['detail'] == 'https://example.com/4'), \
+            'Newest command missing: %s' % history[-1]
+        closed = self.FakeDriver()
+        ArtifactRecorder.for_driver(closed).driver.execute('status')
+        released = weakref.ref(closed)
+        del closed
+        gc.collect()
+        assert(released() is None), 'Recorder keeps its driver alive'
+
+
+class TestStaxingLoad(unittest.TestCase):
+    """Staxing case tests for load generation."""
+
+    @pytest.mark.skipif(str(905) not in TESTS, reason='Excluded')
+    def test_latency_histogram_percentiles(self):
+        """Percentiles land within one bucket of the true value."""
+        histogram = LatencyHistogram()
+        for sample in range(1, 101):
+            histogram.record(sample / 100.0)
+        summary = histogram.summary()
+        assert(summary['count'] == 100), 'Count wrong: %s' % summary
+        assert(0.5 <= summary['p50'] <= 0.5 * LatencyHistogram.GROWTH), \
+            'Median off: %s' % summary['p50']
+        assert(summary['max'] == 1.0), 'Max wrong: %s' % summary['max']
+
+    @pytest.mark.skipif(str(906) not in TESTS, reason='Excluded')
+    def test_pacer_holds_target_rate(self):
+        """Evenly paced arrivals take (n - 1) / rate seconds."""
+        pacer = Pacer(rate=50, poisson=False)
+        start = time.monotonic()
+        for _ in range(6):
+            pacer.wait()
+        duration = time.monotonic() - start
+        assert(duration >= 0.1 * 0.98), 'Arrivals too fast: %s' % duration
+        assert(pacer.issued == 6), 'Arrivals not counted: %s' % pacer.issued
+
+    @pytest.mark.skipif(str(932) not in TESTS, reason='Excluded')
+    def test_practice_load_without_students(self):
+        """Report an empty run instead of failing to start the pool."""
+        report = PracticeLoad([], rate=10).run(sessions=1)
+        assert(report['students'] == 0 and report['sessions'] == 0 and
+               report['errors'] == []), 'Empty run: %s' % report
+
+
+class TestStaxingEvents(unittest.TestCase):
+    """Staxing case tests for structured logging."""
+
+    @pytest.mark.skipif(str(907) not in TESTS, reason='Excluded')
+    def test_event_logger_levels_and_fields(self):
+        """Write JSON events at or above the logger level only."""
+        stream = io.StringIO()
+        log = EventLogger(level='info', writer=EventWriter(stream),
+                          worker='gw1')
+        log.debug('teacher', 'hidden %s', 'detail')
+        log.info('teacher', 'Selected course %s', 'Physics')
+        log.flush()
+        lines = stream.getvalue().splitlines()
+        assert(len(lines) == 1), 'Level filter failed: %s' % lines
+        event = json.loads(lines[0])
+        assert(event['msg'] == 'Selected course Physics'), \
+            'Message not formatted: %s' % event
+        assert(event['role'] == 'teacher' and event['worker'] == 'gw1'), \
+            'Fields missing: %s' % event
+        assert(event['method'] == 'test_event_logger_levels_and_fields'), \
+            'Caller not recorded: %s' % event
+
+
+class TestStaxingTutorAPI(unittest.TestCase):
+    """Staxing case tests for API-backed assignments."""
+
+    @pytest.mark.skipif(str(908) not in TESTS, reason='Excluded')
+    def test_api_backend_creates_plans(self):
+        """Create readings and homework from the UI argument schema."""
+        with FakeTutor() as server:
+            backend = AssignmentAPI(TutorAPI(server.url), 1)
+            reading = backend.add(
+                Assignment.READING,
+                name='API reading',
+                description='',
+                periods={'all': ('02/10/2017', ('02/15/2017', '8:30 pm'))},
+                state=Assignment.PUBLISH,
+                reading_list=['ch1', '2.1'])
+            homework = backend.add(
+                Assignment.HOMEWORK,
+                name='API homework',
+                description='',
+                periods={'Second': ('02/10/2017', '02/15/2017')},
+                state=Assignment.DRAFT,
+                problems={'1.2': 'all', '2.1': 1, 'tutor': 2},
+                feedback='immediate')
+            canceled = backend.add(
+                Assignment.EVENT,
+                name='Never',
+                description='',
+                periods={'all': ('02/10/2017', '02/15/2017')},
+                state=Assignment.CANCEL)
+        assert(reading['is_published']), 'Reading not published'
+        assert(reading['settings']['page_ids'] == [101, 102, 201]), \
+            'Reading pages wrong: %s' % reading['settings']
+        assert(len(reading['tasking_plans']) == 3), \
+            'Not every period assigned: %s' % reading['tasking_plans']
+        assert(reading['tasking_plans'][0]['due_at'] == '2017-02-15 20:30'), \
+            'Due time wrong: %s' % reading['tasking_plans'][0]
+        assert(homework['settings']['exercise_ids'] == [1002, 1003, 1004]), \
+            'Exercises wrong: %s' % homework['settings']
+        assert(homework['tasking_plans'][0]['target_id'] == '12'), \
+            'Period wrong: %s' % homework['tasking_plans']
+        assert(canceled is None and len(server.plans) == 2), \
+            'Canceled plan created: %s' % server.plans
+
+    @pytest.mark.skipif(str(909) not in TESTS, reason='Excluded')
+    def test_cleanup_deletes_matching_plans(self):
+        """Remove only the matching plans inside the date range."""
+        with FakeTutor() as server:
+            backend = AssignmentAPI(TutorAPI(server.url), 1)
+            for title, due in [('tmp 1', '03/02/2017'),
+                               ('tmp 2', '03/20/2017'),
+                               ('keep', '03/05/2017'),
+                               ('tmp 3', '05/01/2017')]:
+                backend.add(Assignment.EVENT, name=title, description='',
+                            periods={'all': ('03/01/2017', due)},
+                            state=Assignment.PUBLISH)
+            cleanup = CourseCleanup(api=backend.api, course_id=1, workers=3)
+            report = cleanup.run('03/01/2017', '03/31/2017', match=r'^tmp')
+            left = sorted(plan['title'] for plan in server.plans.values())
+        assert(report['found'] == 2 and not report['failed']), \
+            'Wrong plans deleted: %s' % report
+        assert(left == ['keep', 'tmp 3']), 'Plans left: %s' % left
+
+    @pytest.mark.skipif(str(933) not in TESTS, reason='Excluded')
+    def test_cleanup_keeps_teacher_in_browser_mode(self):
+        """List plans through a private backend, not the teacher's."""
+        class FakeDriver(object):
+            def __init__(self, url):
+                self.current_url = '%s/course/1/t/month/2017-03-01' % url
+                self.http_session = TutorAPI(url).session
+
+        class BrowserTeacher(object):
+            def __init__(self, url):
+                self.url = url
+                self.driver = FakeDriver(url)
+                self.assign = Assignment()
+
+        with FakeTutor() as server:
+            AssignmentAPI(TutorAPI(server.url), 1).add(
+                Assignment.EVENT, name='tmp 1', description='',
+                periods={'all': ('03/01/2017', '03/02/2017')},
+                state=Assignment.PUBLISH)
+            teacher = BrowserTeacher(server.url)
+            cleanup = CourseCleanup.from_teacher(teacher)
+            plans = cleanup.list_plans('03/01/2017', '03/31/2017')
+        assert(teacher.assign.backend is None), \
+            'Teacher switched to API mode: %s' % teacher.assign.backend
+        assert([plan['title'] for plan in plans] == ['tmp 1']), \
+            'Plans not listed: %s' % plans
+
+    @pytest.mark.skipif(str(931) not in TESTS, reason='Excluded')
+    def test_cleanup_scrape_keeps_to_the_date_range(self):
+        """List only calendar plans shown on days inside the range."""
+        class FakeCalendar(object):
+            capabilities = {'browserName': 'firefox'}
+
+            def __init__(self, shown):
+                self.current_url = 'https://tutor.test/course/1/t/'
+                self.shown = shown
+
+            def get(self, url):
+                self.current_url = url
+
+            def find_element(self, by, value):
+                return 'rendered'
+
+            def execute_script(self, script):
+                month = self.current_url[-10:-3]
+                return [dict(title=title, href='https://tutor.test/plans/%s'
+                             % number, type='event', date=date)
+                        for number, title, date in self.shown
+                        if date is None or month in date or
+                        date.endswith('-27')]
+
+        dated = FakeCalendar([(1, 'early', '2017-03-02'),
+                              (2, 'late', '2017-03-20'),
+                              (3, 'spans', '2017-03-15'),
+                              (3, 'spans', '2017-03-16'),
+                              (4, 'february', '2017-02-27')])
+        cleanup = CourseCleanup(drivers=[dated])
+        titles = [plan['title']
+                  for plan in cleanup.list_plans('03/01/2017', '03/15/2017')]
+        assert(titles == ['early', 'spans']), 'Range not kept: %s' % titles
+        undated = CourseCleanup(drivers=[FakeCalendar([(1, 'tmp', None)])])
+        with pytest.raises(ValueError):
+            undated.list_plans('03/01/2017', '03/15/2017')
+        whole = undated.list_plans('03/01/2017', '03/31/2017')
+        assert([plan['id'] for plan in whole] == [1]), \
+            'Whole month not listed: %s' % whole
+
+    @pytest.mark.skipif(str(910) not in TESTS, reason='Excluded')
+    def test_provisioner_reuses_existing_plans(self):
+        """Create a spec once and reuse it on the next run."""
+        class APITeacher(object):
+            add_assignment = Teacher.add_assignment
+
+        class FakeDriver(object):
+            def __init__(self, url):
+                self.current_url = '%s/course/1/t/month/2017-04-01' % url
+                self.http_session = TutorAPI(url).session
+
+        cache = os.path.join(tempfile.mkdtemp(), 'provision.json')
+        spec = {
+            'periods': {'all': ('04/03/2017', '04/07/2017')},
+            'reading_list': ['1.1'],
+            'status': Assignment.PUBLISH,
+        }
+        with FakeTutor() as server:
+            teacher = APITeacher()
+            teacher.url = server.url
+            teacher.assign = Assignment(
+                backend=AssignmentAPI(TutorAPI(server.url), 1))
+            first = Provisioner(teacher, cache_path=cache).ensure(
+                Assignment.READING, dict(spec, title=Assignment.rword(8)))
+            second = Provisioner(teacher, cache_path=cache).ensure(
+                Assignment.READING, dict(spec, title=Assignment.rword(8)))
+            browser = APITeacher()
+            browser.url = server.url
+            browser.assign = Assignment()
+            browser.driver = FakeDriver(server.url)
+            third = Provisioner(browser, cache_path=cache).ensure(
+                Assignment.READING, dict(spec, title=Assignment.rword(8)))
+            total = len(server.plans)
+        assert(first['created'] and not second['created']), \
+            'Plan not reused: %s %s' % (first, second)
+        assert(second['title'] == first['title'] and total == 1), \
+            'Duplicate plan created: %s' % total
+        assert(not third['created'] and browser.assign.backend is None), \
+            'Teacher switched to API mode: %s' % browser.assign.backend
+
+    @pytest.mark.skipif(str(939) not in TESTS, reason='Excluded')
+    def test_provisioner_workers_share_the_cache(self):
+        """Keep every worker's records and key periods by their value."""
+        class APITeacher(object):
+            add_assignment = Teacher.add_assignment
+
+        cache = os.path.join(tempfile.mkdtemp(), 'provision.json')
+        april = datetime.date(2017, 4, 3)
+        typed = {'periods': {'all': ('04/03/2017', ('04/07/2017', '8pm'))},
+                 'status': Assignment.PUBLISH}
+        picked = {'periods': {'all': (Moment(april, None),
+                                      (datetime.date(2017, 4, 7),
+                                       '8:00 pm'))},
+                  'status': Assignment.PUBLISH}
+        with FakeTutor() as server:
+            teacher = APITeacher()
+            teacher.url = server.url
+            teacher.assign = Assignment(
+                backend=AssignmentAPI(TutorAPI(server.url), 1))
+            workers = [Provisioner(teacher, cache_path=cache)
+                       for _ in range(2)]
+            first = workers[0].ensure(
+                Assignment.READING, dict(typed, title='typed',
+                                         reading_list=['1.1']))
+            second = workers[1].ensure(
+                Assignment.READING, dict(picked, title='picked',
+                                         reading_list=['1.2']))
+            again = workers[1].ensure(
+                Assignment.READING, dict(picked, title='again',
+                                         reading_list=['1.1']))
+        with open(cache) as stream:
+            records = list(json.load(stream).values())[0]
+        assert(sorted(records) == sorted([first['key'], second['key']])), \
+            'Records lost: %s' % records
+        assert(not again['created'] and again['key'] == first['key']), \
+            'Periods keyed by form: %s %s' % (first, again)
+
+
+class TestStaxingSchedule(unittest.TestCase):
+    """Staxing case tests for schedule planning."""
+
+    @pytest.mark.skipif(str(911) not in TESTS, reason='Excluded')
+    def test_schedule_builds_normalized_periods(self):
+        """Plan staggered periods in the forms the inputs take."""
+        schedule = Schedule(start='01/30/2017', due_time='11:59 pm')
+        plans = schedule.build(['1st', '2nd'], count=3, duration=2,
+                               spacing=7, stagger=1)
+        opens, closes = plans[2]['2nd']
+        assert(len(plans) == 3), 'Wrong plan count: %s' % len(plans)
+        assert(opens == Moment(datetime.date(2017, 2, 14), None)), \
+            'Open moment wrong: %s' % (opens,)
+        assert(closes == Moment(datetime.date(2017, 2, 16), '1159p')), \
+            'Due moment wrong: %s' % (closes,)
+        mixed = normalize({'all': ('2/1/2017', ('2/3/2017', '6:30 am'))})
+        assert(mixed['all'][1] == Moment(datetime.date(2017, 2, 3), '630a')), \
+            'String periods not normalized: %s' % mixed
+        with pytest.raises(ValueError):
+            normalize({'all': ('2/3/2017', '2/1/2017')})
+
+    @pytest.mark.skipif(str(934) not in TESTS, reason='Excluded')
+    def test_schedule_types_twelve_hour_keystrokes(self):
+        """Type 24-hour and 12-hour times as 12-hour input keystrokes."""
+        typed = [input_time(value) for value in
+                 ('14:30', '8:00 am', '12:05 am', '1159p', '12:00')]
+        assert(typed == ['230p', '800a', '1205a', '1159p', '1200p']), \
+            'Time keystrokes wrong: %s' % typed
+
+    @pytest.mark.skipif(str(935) not in TESTS, reason='Excluded')
+    def test_delete_finds_calendar_for_scheduled_periods(self):
+        """Open the due month for string, pair and Moment periods."""
+        class FakeDriver(object):
+            current_url = 'https://tutor.example/course/1/t/'
+
+        schedule = Schedule(start='01/30/2017', due_time='11:59 pm')
+        periods = [
+            {'all': ('01/30/2017', '02/01/2017')},
+            {'1st': ('01/30/2017', ('02/01/2017', '14:30'))},
+            schedule.build(['1st'], count=1, duration=2)[0],
+        ]
+        urls = [Assignment().calendar_url(FakeDriver(), period)
+                for period in periods]
+        assert(set(urls) ==
+               {'https://tutor.example/course/1/t/month/2017-02-01'}), \
+            'Calendar URLs wrong: %s' % urls
+
+
+class TestStaxingSessions(unittest.TestCase):
+    """Staxing case tests for account switching."""
+
+    class FakeBrowser(object):
+        """WebDriver stand-in keeping a cookie jar per host."""
+
+        def __init__(self):
+            """Browser constructor."""
+            self.current_url = 'https://tutor-qa.openstax.org/dashboard'
+            self.jars = {}
+            self.loads = 0
+
+        @property
+        def cookies(self):
+            """Return the current host's cookies."""
+            return self.jars.setdefault(self.current_url.split('/')[2], {})
+
+        @cookies.setter
+        def cookies(self, cookies):
+            """Replace the current host's cookies."""
+            self.jars[self.current_url.split('/')[2]] = cookies
+
+        def execute(self, driver_command, params=None):
+            """Answer any other command."""
+            return {'value': None}
+
+        def get(self, url):
+            """Open a page."""
+            self.current_url = url
+            self.loads += 1
+
+        def refresh(self):
+            """Reload the page."""
+            self.loads += 1
+
+        def get_cookies(self):
+            """Return the cookies as WebDriver does."""
+            return [{'name': name, 'value': value, 'expiry': 1.5e9}
+                    for name, value in self.cookies.items()]
+
+        def delete_all_cookies(self):
+            """Sign out."""
+            self.cookies = {}
+
+        def add_cookie(self, cookie):
+            """Set one cookie."""
+            assert(isinstance(cookie['expiry'], int)), 'Float expiry'
+            self.cookies[cookie['name']] = cookie['value']
+
+        def execute_script(self, script, *args):
+            """Report the signed in user."""
+            user = self.cookies.get('session')
+            return json.dumps({'username': user}) if user else ''
+
+    @pytest.mark.skipif(str(912) not in TESTS, reason='Excluded')
+    def test_switch_account_swaps_cookie_jars(self):
+        """Switch accounts with saved cookies instead of the login UI."""
+        browser = self.FakeBrowser()
+        user = User('teacher01', 'password', existing_driver=browser)
+        browser.cookies = {'session': 'student01'}
+        user.save_session('student01')
+        browser.cookies = {'session': 'teacher01'}
+        user.switch_account('student01')
+        assert(user.whoami() == 'student01'), 'Not switched: %s' % \
+            user.whoami()
+        user.switch_account('teacher01')
+        assert(user.whoami() == 'teacher01'), 'Not switched back: %s' % \
+            user.whoami()
+        assert(browser.loads == 2), 'Extra page loads: %s' % browser.loads
+        browser.execute_script = lambda script, *args: '{}'
+        user.switch_account('student01')
+        assert(len(User.SESSIONS[(user.url, 'teacher01')]) == 1), \
+            'Unknown identity saved: %s' % User.SESSIONS
+        del browser.execute_script
+        User.SSO_HOSTS[user.url] = 'accounts-qa.openstax.org'
+        browser.jars['accounts-qa.openstax.org'] = {'sso': 'student01'}
+        user.save_session('student01')
+        assert(User.SESSIONS[(user.url, 'student01')]
+               ['accounts-qa.openstax.org'][0]['value'] == 'student01'), \
+            'Accounts cookies not saved'
+        user.clear_session()
+        assert(not any(browser.jars.values()) and
+               browser.current_url.startswith('https://tutor-qa')), \
+            'Signed in somewhere: %s' % browser.jars
+        User.SSO_HOSTS.pop(user.url)
+
+    class FakePicker(object):
+        """WebDriver stand-in showing the course picker."""
+
+        def __init__(self):
+            """Picker constructor."""
+            self.current_url = 'https://tutor-qa.openstax.org/dashboard'
+            self.scrapes = 0
+            self.visited = []
+            self.rendered = True
+
+        def find_element(self, by, value):
+            """Return a listing once the picker has rendered."""
+            if not self.rendered:
+                raise NoSuchElementException(value)
+            return 'listing'
+
+        def execute(self, driver_command, params=None):
+            """Answer any other command."""
+            return {'value': None}
+
+        def get(self, url):
+            """Open a page."""
+            self.current_url = url
+            self.visited.append(url)
+
+        def execute_script(self, script, *args):
+            """Return the listings in one call."""
+            self.scrapes += 1
+            return [
+                {'title': title, 'appearance': 'physics', 'text': title,
+                 'href': 'https://tutor-qa.openstax.org/course/%s' % number}
+                for number, title in ((7, 'Physics'), (9, 'Biology'))
+            ]
+
+    @pytest.mark.skipif(str(915) not in TESTS, reason='Excluded')
+    def test_select_course_uses_cached_index(self):
+        """Scrape the course picker once and open courses by href."""
+        browser = self.FakePicker()
+        browser.rendered = False
+        user = User('teacher01', 'password', existing_driver=browser,
+                    wait_time=1)
+        assert(user.get_course_list() == [] and not user.course_indexes), \
+            'Unrendered picker cached: %s' % user.course_indexes
+        browser.rendered = True
+        courses = user.get_course_list()
+        assert(list(user.course_indexes) == [(user.url, 'teacher01')]), \
+            'Index key: %s' % list(user.course_indexes)
+        assert([course['id'] for course in courses] == [7, 9]), \
+            'Course ids not parsed: %s' % courses
+        user.select_course(title='Biology')
+        user.select_course(title='Physics')
+        assert(browser.scrapes == 1), 'Index rescraped: %s' % browser.scrapes
+        assert(browser.visited == [courses[1]['href'], courses[0]['href']]), \
+            'Courses not opened directly: %s' % browser.visited
+
+
+class TestStaxingTabs(unittest.TestCase):
+    """Staxing case tests for tab multiplexing."""
+
+    class FakeBrowser(object):
+        """WebDriver stand-in with windows that load over several polls."""
+
+        def __init__(self, redirects=None):
+            """Browser constructor."""
+            self.window_handles = ['w0']
+            self.current_window_handle = 'w0'
+            self.urls = {'w0': 'about:blank'}
+            self.targets = {}
+            self.pending = {}
+            self.redirects = redirects or {}
+            self.switch_to = self
+            self.log = []
+
+        def window(self, handle):
+            """Focus a window."""
+            self.current_window_handle = handle
+
+        @property
+        def current_url(self):
+            """Return the focused window URL."""
+            return self.urls[self.current_window_handle]
+
+        def execute_script(self, script, *args):
+            """Open windows, navigate and report load state."""
+            handle = self.current_window_handle
+            if 'window.open' in script:
+                new = 'w%s' % len(self.window_handles)
+                self.window_handles.append(new)
+                self.urls[new] = 'about:blank'
+            elif 'location.href' in script:
+                self.targets[handle] = self.redirects.get(args[0], args[0])
+                self.pending[handle] = 3
+            elif 'readyState' in script:
+                self.pending[handle] = self.pending.get(handle, 0) - 1
+                if self.pending[handle] > 1:
+                    # the old document is still up
+                    return ['complete', False]
+                if handle in self.targets:
+                    self.urls[handle] = self.targets.pop(handle)
+                return ['complete' if self.pending[handle] < 0 else
+                        'loading', True]
+
+    class FakeHelper(object):
+        """Helper stand-in that reads the focused window."""
+
+        def __init__(self, driver):
+            """Helper constructor."""
+            self.driver = driver
+            self.shared_driver = False
+
+        def location(self):
+            """Return the focused window URL."""
+            return self.driver.current_url
+
+    @pytest.mark.skipif(str(913) not in TESTS, reason='Excluded')
+    def test_tab_scheduler_interleaves_waiting_tabs(self):
+        """Run one tab's steps while another waits for a page load."""
+        browser = self.FakeBrowser()
+        scheduler = TabScheduler(browser, poll=0)
+
+        def visit(tab, pages):
+            for page in pages:
+                yield tab.navigate(page)
+                browser.log.append((tab.name, tab.driver.current_url))
+
+        for name in ('first', 'second'):
+            tab = scheduler.open(name)
+            scheduler.add(tab, visit, ['http://%s/%s' % (name, number)
+                                       for number in range(2)])
+        errors = scheduler.run(timeout=5)
+        assert(not any(errors.values())), 'Tab failed: %s' % errors
+        assert(len(browser.window_handles) == 2), 'Windows not shared'
+        assert([name for name, _ in browser.log] ==
+               ['first', 'second', 'first', 'second']), \
+            'Tabs not interleaved: %s' % browser.log
+        assert(('second', 'http://second/1') in browser.log), \
+            'Tab state mixed up: %s' % browser.log
+
+    @pytest.mark.skipif(str(936) not in TESTS, reason='Excluded')
+    def test_tab_scheduler_follows_redirects_with_helpers(self):
+        """Finish redirected loads and run helpers on their own tabs."""
+        browser = self.FakeBrowser({'http://first/login':
+                                    'http://first/dashboard'})
+        scheduler = TabScheduler(browser, poll=0)
+
+        def visit(tab, page):
+            yield tab.navigate(page)
+            browser.log.append((tab.name, tab.helper.location()))
+
+        helpers = {}
+        for name in ('first', 'second'):
+            helpers[name] = self.FakeHelper(browser)
+            tab = scheduler.open(name, helper=helpers[name])
+            scheduler.add(tab, visit, 'http://%s/login' % name)
+        errors = scheduler.run(timeout=5)
+        assert(not any(errors.values())), 'Tab failed: %s' % errors
+        assert(sorted(browser.log) ==
+               [('first', 'http://first/dashboard'),
+                ('second', 'http://second/login')]), \
+            'Helpers not on their tabs: %s' % browser.log
+        assert(all(helper.shared_driver for helper in helpers.values())), \
+            'Tab helper may quit the shared browser'
+        with self.assertRaises(ValueError):
+            scheduler.open('other', helper=self.FakeHelper(object()))
+
+    @pytest.mark.skipif(str(940) not in TESTS, reason='Excluded')
+    def test_tab_scheduler_keeps_element_handles_per_tab(self):
+        """Reuse each tab's cached elements across tab switches."""
+        class FindingBrowser(self.FakeBrowser):
+            def find_element(self, by, value):
+                self.log.append(self.current_window_handle)
+                return (self.current_window_handle, len(self.log))
+
+        browser = FindingBrowser()
+        scheduler = TabScheduler(browser, poll=0)
+        cache = ElementCache.for_driver(browser)
+        found = {}
+
+        def read(tab):
+            for _ in range(3):
+                found.setdefault(tab.name, []).append(
+                    cache.find(('id', 'heading')))
+                yield
+            yield tab.navigate('http://%s/next' % tab.name)
+            found[tab.name].append(cache.find(('id', 'heading')))
+
+        for name in ('first', 'second'):
+            scheduler.add(scheduler.open(name), read)
+        errors = scheduler.run(timeout=5)
+        assert(not any(errors.values())), 'Tab failed: %s' % errors
+        assert(browser.log == ['w0', 'w1', 'w0', 'w1']), \
+            'Handles refound on tab switch: %s' % browser.log
+        assert(all(len(set(elements[:3])) == 1 and
+                   elements[0][0] == elements[3][0] and
+                   elements[0] != elements[3]
+                   for elements in found.values())), \
+            'Handles mixed between tabs: %s' % found
+
+
+class TestStaxingSupervisor(unittest.TestCase):
+    """Staxing case tests for process accounting."""
+
+    class FakeService(object):
+        """Driver service stand-in holding a process."""
+
+        def __init__(self, process):
+            """Service constructor."""
+            self.process = process
+
+    class FakeDriver(object):
+        """WebDriver stand-in whose quit leaks the browser."""
+
+        def __init__(self, process):
+            """Driver constructor."""
+            self.service = TestStaxingSupervisor.FakeService(process)
+
+    @pytest.mark.skipif(str(914) not in TESTS, reason='Excluded')
+    def test_supervisor_reaps_leaked_children(self):
+        """Kill a session's leftover process tree on release."""
+        spawn = ('import subprocess, sys, time; '
+                 'subprocess.Popen([sys.executable, "-c", '
+                 '"import time; time.sleep(60)"]); time.sleep(60)')
+        process = subprocess.Popen([sys.executable, '-c', spawn])
+        supervisor = Supervisor(interval=0, grace=2)
+        driver = self.FakeDriver(process)
+        session = supervisor.track(driver, name='leaky')
+        for _ in range(50):
+            if len(session.living()) == 2:
+                break
+            time.sleep(0.1)
+        session.sample()
+        pids = session.living()
+        assert(len(pids) == 2), 'Child not tracked: %s' % pids
+        assert(session.peak_rss > 0), 'Memory not sampled'
+        # an id seen earlier and since reused by an unrelated process
+        bystander = subprocess.Popen([sys.executable, '-c',
+                                      'import time; time.sleep(60)'])
+        session.pids[bystander.pid] = -1
+        assert(supervisor.sample_driver(driver) > 0), 'Driver not sampled'
+        leaked = supervisor.release(driver)
+        process.wait(5)
+        assert(sorted(leaked) == sorted(pids)), 'Not reaped: %s' % leaked
+        assert(not any(alive(pid) for pid in pids)), 'Processes survived'
+        assert(bystander.poll() is None), 'Reused process id killed'
+        bystander.kill()
+        bystander.wait(5)
+        assert(session.released), 'Session still open'
+        assert(supervisor.find(driver) is None), 'Session not forgotten'
+        assert(not supervisor.report()), 'Sessions kept: %s' % \
+            supervisor.report()
+
+    @pytest.mark.skipif(str(929) not in TESTS, reason='Excluded')
+    def test_helper_without_browser_deletes_quietly(self):
+        """Destroy a helper whose browser never started without errors."""
+        class NoBrowser(Helper):
+            def run_on(self, *args, **kwargs):
+                raise FileNotFoundError('chromedriver not found')
+
+        raised = []
+        hook, sys.unraisablehook = sys.unraisablehook, raised.append
+        try:
+            with pytest.raises(FileNotFoundError):
+                NoBrowser()
+            gc.collect()
+        finally:
+            sys.unraisablehook = hook
+        assert(not raised), 'Destructor raised: %s' % [
+            repr(error.exc_value) for error in raised]
+
+
+class TestStaxingReplay(unittest.TestCase):
+    """Staxing case tests for command replay."""
+
+    ELEMENT = 'element-6066-11e4-a52e-4f735466cecf'
+
+    def fake_browser(self):
+        """Return a stub answering a few W3C WebDriver commands."""
+        server = StubServer()
+        server.route('POST', r'/session', lambda request: {
+            'value': {'sessionId': 's1', 'capabilities': {'browserName': 'x'}}
+        })
+        server.route('POST', r'/session/s1/url',
+                     lambda request: {'value': None})
+        server.route('GET', r'/session/s1/title',
+                     lambda request: {'value': 'OpenStax Tutor'})
+        server.route('POST', r'/session/s1/element',
+                     lambda request: {'value': {self.ELEMENT: 'e1'}})
+        server.route('GET', r'/session/s1/element/e1/text',
+                     lambda request: {'value': 'Add Reading'})
+        return server
+
+    @staticmethod
+    def flow(driver):
+        """Open a page and read from it."""
+        driver.get('https://tutor-qa.openstax.org/')
+        return driver.title, driver.find_element(By.ID, 'add').text
+
+    @pytest.mark.skipif(str(916) not in TESTS, reason='Excluded')
+    def test_replay_serves_recorded_commands(self):
+        """Replay a recorded flow with the same results and no browser."""
+        path = os.path.join(tempfile.mkdtemp(), 'flow.jsonl.gz')
+        with self.fake_browser() as browser:
+            driver = Remote(command_executor=browser.url,
+                            desired_capabilities={})
+            with CommandRecorder(driver) as recorder:
+                recorded = self.flow(driver)
+            recorder.save(path)
+        results = []
+        replayer = Replayer(path, strict=True)
+        try:
+            report = replayer.run(lambda driver: results.append(
+                self.flow(driver)), repeat=3)
+        finally:
+            replayer.close()
+        assert(report['commands'] == 4), 'Commands: %s' % report['commands']
+        assert(report['mismatches'] == 0), 'Replay diverged: %s' % report
+        assert(results == [recorded] * 3), 'Results differ: %s' % results
+        assert(report['cpu']['count'] == 3), 'Runs not timed: %s' % report
+        assert(replayer.server.quits == 3), \
+            'Drivers left open: %s' % replayer.server.quits
+
+
+class TestStaxingBroker(unittest.TestCase):
+    """Staxing case tests for remote session brokering."""
+
+    @pytest.mark.skipif(str(917) not in TESTS, reason='Excluded')
+    def test_broker_retries_quota_errors_within_slots(self):
+        """Back off on quota errors and hold one slot per live session."""
+        refusals = [2]
+
+        def new_session(request):
+            if refusals[0]:
+                refusals[0] -= 1
+                return 500, {'value': {
+                    'error': 'session not created',
+                    'message': 'You have exceeded your concurrency limit'}}
+            return {'value': {'sessionId': 's1', 'capabilities': {}}}
+
+        server = StubServer().route('POST', r'/session', new_session)
+        server.route('DELETE', r'/session/s1', lambda request: {'value': None})
+        broker = SessionBroker(slots=1, lock_dir=tempfile.mkdtemp(),
+                               backoff=0.01, wait_timeout=0.5)
+        with server:
+            driver = broker.create(command_executor=server.url,
+                                   desired_capabilities={})
+            with pytest.raises(TimeoutError):
+                broker.create(command_executor=server.url,
+                              desired_capabilities={})
+            driver.quit()
+            broker.create(command_executor=server.url,
+                          desired_capabilities={}).quit()
+        summary = broker.summary()
+        assert(summary['quota_errors'] == 2), 'Retries: %s' % summary
+        assert(summary['attempts'] == 4), 'Attempts: %s' % summary
+        assert(summary['latency']['create']['count'] == 2), \
+            'Creation not timed: %s' % summary
+
+    @pytest.mark.skipif(str(937) not in TESTS, reason='Excluded')
+    def test_broker_semaphore_waits_without_fcntl(self):
+        """Block for a thread slot when file locks are unavailable."""
+        module = sys.modules[FileSemaphore.__module__]
+        fcntl, module.fcntl = module.fcntl, None
+        try:
+            semaphore = FileSemaphore(tempfile.mkdtemp(), 1)
+            token = semaphore.acquire()
+            with pytest.raises(TimeoutError):
+                semaphore.acquire(timeout=0.05)
+            waiter = threading.Thread(target=semaphore.acquire, daemon=True)
+            waiter.start()
+            waiter.join(0.1)
+            blocked = waiter.is_alive()
+            semaphore.release(token)
+            waiter.join(1)
+        finally:
+            module.fcntl = fcntl
+        assert(blocked and not waiter.is_alive()), \
+            'Untimed acquire did not wait for the slot'
+
+
+class TestStaxingAdminTables(unittest.TestCase):
+    """Staxing case tests for streaming admin tables."""
+
+    @pytest.mark.skipif(str(918) not in TESTS, reason='Excluded')
+    def test_admin_table_streams_pages(self):
+        """Yield rows across pages with filters in the query string."""
+        def page(request):
+            number = int(request.query.get('page', ['1'])[0])
+            rows = ''.join(
+                '<tr><td>%s</td><td><a href="/admin/users/%s/edit">qa_%s</a>'
+                '</td></tr>' % (index, index, index)
+                for index in range(number * 10 - 9, number * 10 + 1))
+            after = '<a rel="next" href="?page=%s&query=qa">Next</a>' % \
+                (number + 1) if number < 3 else ''
+            return 200, ('<table><thead><tr><th>Id</th><th>Username</th>'
+                         '</tr></thead><tbody>%s</tbody></table>'
+                         '<div class="pagination">%s</div>' % (rows, after)), \
+                {'Content-Type': 'text/html'}
+
+        with StubServer().route('GET', r'/admin/users', page) as server:
+            rows = list(AdminTable(None, server.url + '/admin/users',
+                                   {'query': 'qa'}))
+            fetched = len(server.requests)
+            first = next(iter(AdminTable(None, server.url + '/admin/users',
+                                         {'query': 'qa'})))
+        assert(len(rows) == 30 and fetched == 3), \
+            'Rows %s over %s pages' % (len(rows), fetched)
+        assert(rows[-1]['Username'] == 'qa_30'), 'Last row: %s' % rows[-1]
+        assert(rows[0]['href'].endswith('/admin/users/1/edit')), \
+            'Row link lost: %s' % rows[0]
+        assert(all(request.query['query'] == ['qa']
+                   for request in server.requests)), 'Filter dropped'
+        assert(first['Id'] == '1' and len(server.requests) <= 5), \
+            'Stopping early fetched %s pages' % (len(server.requests) - 3)
+
+
+class TestStaxingHTTPDriver(unittest.TestCase):
+    """Staxing case tests for the browserless driver."""
+
+    @pytest.mark.skipif(str(919) not in TESTS, reason='Excluded')
+    def test_http_driver_logs_in_without_a_browser(self):
+        """Log in through server-rendered forms using requests."""
+        form = ('<html><body><h1>OpenStax Accounts</h1>'
+                '<form method="post" action="%s">%s'
+                '<input type="hidden" name="token" value="abc">'
+                '<input type="submit" value="%s"></form></body></html>')
+
+        def password(request):
+            fields = parse_qs(request.body.decode('utf-8'))
+            if fields.get('token') != ['abc']:
+                return 422, 'Missing token'
+            return form % ('/login/password',
+                           '<input id="login_password" name="password">'
+                           '<input type="hidden" name="login" value="%s">' %
+                           fields['login'][0], 'Login')
+
+        def signed_in(request):
+            fields = parse_qs(request.body.decode('utf-8'))
+            if fields['password'] != ['staxing']:
+                return 401, 'Bad password'
+            return 303, '', {'Location': '/dashboard',
+                             'Set-Cookie': 'sid=%s; Path=/' %
+                             fields['login'][0]}
+
+        server = StubServer()
+        server.route('GET', r'/login', lambda request: form % (
+            '/login', '<input id="login_username_or_email" name="login">',
+            'Next'))
+        server.route('POST', r'/login', password)
+        server.route('POST', r'/login/password', signed_in)
+        server.route('GET', r'/dashboard', lambda request: (
+            '<ul><li class="course" data-id="7"><a href="/courses/7">'
+            'Physics</a></li><li class="course hidden" style="display: '
+            'none">Biology</li></ul>'))
+        server.route('GET', r'/courses/(\d+)', lambda request, course: (
+            '<h1>Course %s</h1>' % course))
+        with server:
+            user = User('qa_user', 'staxing', driver_type='http')
+            assert(isinstance(user.driver, HTTPDriver)), 'Browser started'
+            user.login(url=server.url + '/login')
+            course = user.find(By.XPATH,
+                               '//li[contains(@class,"course")]/a')
+            hidden = user.driver.find_elements(
+                By.CSS_SELECTOR, 'li.hidden')[0].is_displayed()
+            course.click()
+        assert(user.current_url().endswith('/courses/7')), \
+            'Link not followed: %s' % user.current_url()
+        assert({cookie['name']: cookie['value']
+                for cookie in user.driver.get_cookies()} ==
+               {'sid': 'qa_user'}), 'Session cookie lost'
+        assert(not hidden), 'Hidden element reported as displayed'
+        with pytest.raises(StaleElementReferenceException):
+            course.text
+        user.delete()
+
+
+class TestStaxingJobs(unittest.TestCase):
+    """Staxing case tests for background job polling."""
+
+    @pytest.mark.skipif(str(920) not in TESTS, reason='Excluded')
+    def test_job_watcher_waits_on_many_jobs(self):
+        """Poll several jobs in one loop, backing off while unchanged."""
+        began = time.monotonic()
+        finish = {1: 0.2, 2: 0.5, 3: 0.3}
+
+        def job(request, job_id):
+            job_id = int(job_id)
+            elapsed = time.monotonic() - began
+            status = 'queued' if elapsed < 0.1 else 'started'
+            if elapsed > finish[job_id]:
+                status = 'failed' if job_id == 3 else 'succeeded'
+            etag = '"%s-%s"' % (job_id, status)
+            if request.headers.get('If-None-Match') == etag:
+                return 304, b''
+            return 200, {'id': job_id, 'status': status}, {'ETag': etag}
+
+        with StubServer().route('GET', r'/api/jobs/(\d+)', job) as server:
+            watcher = JobWatcher(TutorAPI(server.url), interval=0.02,
+                                 max_interval=0.2)
+            statuses = watcher.wait([1, 2, 3], timeout=10)
+        report = watcher.report()
+        assert(statuses == {1: 'succeeded', 2: 'succeeded', 3: 'failed'}), \
+            'Statuses: %s' % statuses
+        assert(report['not_modified'] > 0), 'No conditional polling'
+        assert(report['requests'] < 100), 'Polling did not back off'
+        assert(report['latency']['completed']['count'] == 3), \
+            'Completion latency missing: %s' % report['latency']
+
+
+class TestStaxingWebview(unittest.TestCase):
+    """Staxing case tests for webview navigation."""
+
+    @pytest.mark.skipif(str(921) not in TESTS, reason='Excluded')
+    def test_webview_navigates_from_cached_toc(self):
+        """Resolve sections in memory and prefetch the following page."""
+        book = {'id': 'b00c', 'version': '3.1', 'tree': {'contents': [
+            {'id': 'pref@1', 'title': 'Preface'},
+            {'id': 'sub1', 'title': '<span class="os-number">1</span>'
+             '<span class="os-text">Units</span>', 'contents': [
+                {'id': 'intro@2', 'title': 'Introduction'},
+                {'id': 'p11@4', 'title': '1.1 Measurement'},
+                {'id': 'p12@1', 'title': '1.2 Significant Figures'},
+                {'id': 'keys@1', 'title': 'Key Terms'}]},
+            {'id': 'sub2', 'title': 'Kinematics', 'contents': [
+                {'id': 'p21@1', 'title': 'Displacement'}]}]}}
+
+        class Browser(object):
+            current_url = 'about:blank'
+            scripts = []
+
+            def get(self, url):
+                self.current_url = url
+
+            def execute_script(self, script, *args):
+                self.scripts.append(args)
+
+        cache = tempfile.mkdtemp()
+        with StubServer().route('GET', r'/contents/b00c@3\.1\.json',
+                                lambda request: book) as server:
+            browser = Browser()
+            view = Webview(browser, site='https://cnx.test/',
+                           book='b00c@3.1', archive=server.url,
+                           cache_dir=cache)
+            entry = view.goto_section(section_number='1.2')
+            after = view.next()
+            chapter = view.next()
+            back = view.previous()
+            again = Webview(browser, site='https://cnx.test/',
+                            archive=server.url, cache_dir=cache)
+            found = again.goto_section(section_name='measurement')
+            fetched = len(server.requests)
+        assert(entry.url == 'https://cnx.test/contents/b00c@3.1:p12'), \
+            'Section URL: %s' % entry.url
+        assert(after.title == 'Key Terms' and after.number is None), \
+            'Closing page: %s' % (after,)
+        assert(chapter.number == '2.1' and back.id == 'keys'), \
+            'Navigation: %s %s' % (chapter, back)
+        assert(found.number == '1.1' and fetched == 1), \
+            'TOC fetched %s times' % fetched
+        assert(browser.scripts[0] == ('https://cnx.test/contents/'
+                                      'b00c@3.1:keys',)), \
+            'Next page not prefetched: %s' % browser.scripts
+
+
+class TestStaxingContent(unittest.TestCase):
+    """Staxing case tests for the book content crawler."""
+
+    @pytest.mark.skipif(str(922) not in TESTS, reason='Excluded')
+    def test_book_crawler_reports_page_issues(self):
+        """Crawl every page concurrently and stream issues to a report."""
+        pages = {
+            'good': '<section id="s1"><h2>Motion</h2><p>Velocity'
+                    '<a href="#s1">here</a><img src="/resources/ok.png">'
+                    '</p></section>',
+            'links': '<p><a href="#gone">x</a><a href="/missing">y</a>'
+                     '<img src="/resources/lost.png"><img alt="no src">'
+                     '<a href="/resources/ok.png">z</a></p>',
+            'math': '<section><h3>Empty</h3></section><p>Solve \\(x^2\\)'
+                    '<math><merror><mtext>bad</mtext></merror></math></p>',
+        }
+        book = {'id': 'bk', 'version': '1', 'tree': {'contents': [
+            {'id': page, 'title': '1.%s Page' % number}
+            for number, page in enumerate(sorted(pages), 1)]}}
+        server = StubServer()
+        server.route('GET', r'/contents/bk\.json', lambda request: book)
+        server.route('GET', r'/contents/bk:(\w+)\.json',
+                     lambda request, page: {'content': pages[page]})
+        server.route('HEAD', r'/resources/ok\.png', lambda request: '')
+        report = os.path.join(tempfile.mkdtemp(), 'report.jsonl')
+        with server:
+            toc = BookTOC('bk', archive=server.url, site=server.url,
+                          cache_dir=tempfile.mkdtemp())
+            summary = BookCrawler(toc, workers=2).run(report)
+            heads = [request.path for request in server.requests
+                     if request.method == 'HEAD']
+        with open(report) as lines:
+            results = {line['page']: line
+                       for line in map(json.loads, lines)}
+        assert(summary['pages'] == 3 and summary['errors'] == 0), \
+            'Summary: %s' % summary
+        assert(results['good']['issues'] == []), \
+            'False positives: %s' % results['good']['issues']
+        assert(sorted(found['message'] for found in
+                      results['links']['issues']) ==
+               ['Image failed', 'Image has no source', 'Link failed',
+                'Missing anchor']), 'Link issues: %s' % results['links']
+        assert(summary['issues'] == {'broken_links': 2, 'missing_images': 2,
+                                     'empty_sections': 1,
+                                     'malformed_math': 2}), \
+            'Issue counts: %s' % summary['issues']
+        assert(heads.count('/resources/ok.png') == 1), \
+            'URL checked more than once: %s' % heads
+
+    @pytest.mark.skipif(str(938) not in TESTS, reason='Excluded')
+    def test_book_crawler_releases_waiters_on_errors(self):
+        """Wake threads waiting on a URL check that raised."""
+        entered = threading.Event()
+        release = threading.Event()
+
+        class FailingSession(object):
+            def head(self, url, **kwargs):
+                entered.set()
+                release.wait(5)
+                raise ValueError('Unparsable response')
+
+        class Crawler(BookCrawler):
+            session = FailingSession()
+
+        crawler = Crawler(None, session=Crawler.session)
+        found = []
+        first = threading.Thread(
+            target=lambda: self.assertRaises(ValueError, crawler.status,
+                                             'http://book/ref'), daemon=True)
+        first.start()
+        entered.wait(5)
+        waiter = threading.Thread(
+            target=lambda: found.append(crawler.status('http://book/ref')),
+            daemon=True)
+        waiter.start()
+        time.sleep(0.1)
+        release.set()
+        first.join(5)
+        waiter.join(5)
+        assert(not waiter.is_alive() and found == [None]), \
+            'Waiting thread not released: %s' % found
+
+    @pytest.mark.skipif(str(923) not in TESTS, reason='Excluded')
+    def test_content_index_rechecks_changed_pages(self):
+        """Skip unchanged pages on a second crawl of a republished book."""
+        pages = {'etag': '<p>Stable <a href="/ref">ref</a></p>',
+                 'plain': '<p>Also stable <a href="/ref2">ref</a></p>',
+                 'edited': '<p>First draft</p>'}
+        book = {'id': 'bk', 'version': '1', 'tree': {'contents': [
+            {'id': page, 'title': page} for page in sorted(pages)]}}
+
+        def content(request, page):
+            if page == 'etag':
+                if request.headers.get('If-None-Match') == '"v1"':
+                    return 304, b''
+                return 200, {'content': pages[page]}, {'ETag': '"v1"'}
+            return {'content': pages[page]}
+
+        server = StubServer()
+        server.route('GET', r'/contents/bk(@\d)?\.json',
+                     lambda request, version: book)
+        server.route('GET', r'/contents/bk(?:@\d)?:(\w+)\.json', content)
+        server.route('HEAD', r'/ref2?', lambda request: '')
+        index = ContentIndex(os.path.join(tempfile.mkdtemp(), 'index.db'))
+        with server:
+            first = BookCrawler(BookTOC('bk@1', server.url, server.url,
+                                        cache_dir=tempfile.mkdtemp()),
+                                index=index).run()
+            pages['edited'] = '<p>Second draft \\(x\\)</p>'
+            checked = len(server.requests)
+            second = BookCrawler(BookTOC('bk@2', server.url, server.url,
+                                         cache_dir=tempfile.mkdtemp()),
+                                 index=index).run()
+            heads = [request for request in server.requests[checked:]
+                     if request.method == 'HEAD']
+        index.close()
+        assert(first['unchanged'] == 0 and first['issues'] == {}), \
+            'First crawl: %s' % first
+        assert(second['unchanged'] == 2), 'Second crawl: %s' % second
+        assert(second['issues'] == {'malformed_math': 1}), \
+            'Edited page not rechecked: %s' % second['issues']
+        assert(heads == []), 'Unchanged links requested again'
+
+
+class TestStaxingMetrics(unittest.TestCase):
+    """Staxing case tests for front-end navigation metrics."""
+
+    class FakeBrowser(object):
+        """WebDriver stand-in reporting fixed page timings."""
+
+        def __init__(self):
+            """Browser constructor."""
+            self.current_url = 'about:blank'
+            self.scripts = 0
+
+        def execute(self, driver_command, params=None):
+            """Answer any other command."""
+            return {'value': None}
+
+        def get(self, url):
+            """Open a page."""
+            self.current_url = url
+
+        def execute_script(self, script, *args):
+            """Return one metrics sample per call."""
+            self.scripts += 1
+            return {'url': self.current_url, 'soft': False,
+                    'timing': {'ttfb': 120, 'dom_content_loaded': 800,
+                               'load': 1500}, 'resources': 40,
+                    'bytes': 204800, 'kinds': {'script': 12},
+                    'slowest': 900, 'long_tasks': 2}
+
+    @pytest.mark.skipif(str(924) not in TESTS, reason='Excluded')
+    def test_navigation_metrics_by_route(self):
+        """Sample once per navigation and aggregate by route."""
+        browser = self.FakeBrowser()
+        admin = Admin(username='admin', password='password',
+                      site='https://tutor.test', existing_driver=browser)
+        admin.get('https://tutor.test/course/5/t/calendar')
+        assert(browser.scripts == 0), 'Metrics collected while disabled'
+        metrics = admin.enable_metrics()
+        admin.get('https://tutor.test/course/5/t/calendar')
+        admin.get('https://tutor.test/course/19/t/calendar?tab=1')
+        admin.goto_user_list()
+        summary = metrics.summary()
+        calendar = summary['/course/:id/t/calendar']
+        assert(browser.scripts == 3), 'Nested navigation sampled twice'
+        assert(calendar['visits'] == 2 and calendar['long_tasks'] == 4), \
+            'Calendar aggregate: %s' % calendar
+        assert(calendar['timing']['load']['count'] == 2 and
+               calendar['kilobytes'] == 400.0), 'Timing: %s' % calendar
+        assert(summary['/admin/users']['timing']['goto_user_list']
+               ['count'] == 1), 'Action not labelled: %s' % summary
+        assert(route('https://cnx.test/contents/'
+                     '031da8d3-b525-429c-80cf-6c8ed997733a@9.8') ==
+               '/contents/:uuid'), 'Route placeholders'
+
+
+class TestStaxingBudget(unittest.TestCase):
+    """Staxing case tests for performance budgets."""
+
+    @pytest.mark.skipif(str(925) not in TESTS, reason='Excluded')
+    def test_budget_checked_after_navigations(self):
+        """Violations are collected per navigation and fail the flow."""
+        budget = Budget.parse(
+            '# default limits\n'
+            '*                       dom<2s load<6s requests<=80\n'
+            '/course/:id/t/*         load<1200ms kb<150\n')
+        assert(budget.limits('/course/:id/t/calendar') ==
+               {'dom_content_loaded': 2.0, 'load': 1.2, 'requests': 80.0,
+                'kilobytes': 150.0}), 'Rules: %s' % budget.rules
+        with self.assertRaises(ValueError):
+            Budget.parse('* paint<1s')
+        browser = TestStaxingMetrics.FakeBrowser()
+        admin = Admin(username='admin', password='password',
+                      site='https://tutor.test', existing_driver=browser)
+        metrics = admin.enable_metrics(budget=budget)
+        admin.goto_user_list()
+        admin.assert_budget()
+        admin.get('https://tutor.test/course/5/t/calendar')
+        assert([(found.metric, found.value) for found in metrics.violations]
+               == [('kilobytes', 200.0), ('load', 1.5)]), \
+            'Violations: %s' % metrics.violations
+        with self.assertRaises(BudgetExceeded):
+            admin.assert_budget()
+        report = metrics.report()
+        assert(not report['passed'] and
+               report['routes']['/admin/users']['load']['ok']), \
+            'Report: %s' % report
+        strict = Admin(username='admin', password='password',
+                       site='https://tutor.test', existing_driver=browser)
+        strict.enable_metrics(budget=budget, strict=True)
+        with self.assertRaises(BudgetExceeded):
+            strict.get('https://tutor.test/course/7/t/scores')
+        folder = tempfile.mkdtemp()
+        summary = os.path.join(folder, 'metrics.json')
+        limits = os.path.join(folder, 'budget.txt')
+        metrics.save(summary)
+        assert(budget_main(['check', summary]) == 2), 'Usage not printed'
+        assert(budget_main(['update', summary, limits]) == 0 and
+               budget_main(['check', summary, limits]) == 0), \
+            'Baseline does not pass: %s' % open(limits).read()
+        assert(Budget.load(limits).limits('/admin/users')['load'] >= 1.5), \
+            'Baseline lacks headroom: %s' % open(limits).read()
+
+
+class TestStaxingEventWait(unittest.TestCase):
+    """Staxing case tests for event-driven waits."""
+
+    class FakeChrome(object):
+        """Chrome stand-in resolving waits in one script call."""
+
+        capabilities = {'browserName': 'chrome'}
+
+        def __init__(self):
+            """Browser constructor."""
+            self.scripts = []
+            self.timeouts = []
+            self.finds = 0
+            self.log = []
+            self.unloads = 0
+            self.document = ['complete', True]
+
+        def set_script_timeout(self, seconds):
+            """Record the script timeout."""
+            self.timeouts.append(seconds)
+
+        def execute_async_script(self, script, *args):
+            """Resolve a condition unless it targets a missing element."""
+            self.scripts.append(args)
+            if self.unloads:
+                self.unloads -= 1
+                raise WebDriverException('document unloaded while waiting '
+                                         'for result')
+            if args[0] == 'stale':
+                raise StaleElementReferenceException('Element is gone')
+            return None if 'missing' in args else 'element'
+
+        def find_element(self, by, value):
+            """Count DOM polls."""
+            self.finds += 1
+            return 'polled'
+
+        def execute_script(self, script, *args):
+            """Report the document state and whether it was seen."""
+            return self.document
+
+        def get_log(self, log_type):
+            """Return and clear the buffered DevTools events."""
+            entries, self.log = self.log, []
+            return entries
+
+        def network(self, method, request=None, kind='XHR', age=0):
+            """Buffer one DevTools event, age seconds old."""
+            self.log.append({
+                'level': 'INFO',
+                'timestamp': (time.time() - age) * 1000,
+                'message': json.dumps({'message': {
+                    'method': method if '.' in method else
+                    'Network.%s' % method,
+                    'params': {'requestId': request, 'type': kind,
+                               'frame': {'id': 'main'}}}})})
+
+    @pytest.mark.skipif(str(926) not in TESTS, reason='Excluded')
+    def test_event_waits_without_polling(self):
+        """Chrome waits resolve in the page; other browsers poll."""
+        browser = self.FakeChrome()
+        wait = EventWait(browser, 2)
+        assert(wait.until(expect.element_to_be_clickable(
+            (By.ID, 'save'))) == 'element'), 'Condition not resolved'
+        assert(wait.until(expect.staleness_of('stale'))), 'Stale not seen'
+        with pytest.raises(TimeoutException):
+            wait.until(expect.visibility_of_element_located(
+                (By.CSS_SELECTOR, 'missing')))
+        assert(browser.finds == 0 and len(browser.scripts) == 3), \
+            'Polled %s times' % browser.finds
+        assert(browser.timeouts == [7]), 'Timeouts: %s' % browser.timeouts
+        assert(wait.settle() and not browser.log), 'Log read while disabled'
+        wait.browser.logging = True
+        browser.network('requestWillBeSent', '1', age=5)
+        browser.network('loadingFinished', '1', age=5)
+        start = time.monotonic()
+        assert(wait.settle(quiet=0.5) and time.monotonic() - start < 0.1), \
+            'Quiet network waited on'
+        browser.network('requestWillBeSent', '2', 'WebSocket')
+        browser.network('requestWillBeSent', '3')
+        assert(not wait.settle(quiet=0.05, timeout=0.2)), 'Request ignored'
+        browser.network('loadingFailed', '3')
+        assert(wait.settle(quiet=0.05)), 'Network never settled'
+        browser.network('requestWillBeSent', '4')
+        browser.network('Page.frameNavigated')
+        browser.network('requestWillBeSent', '5', age=60)
+        assert(wait.settle(quiet=0.05, timeout=1)), 'Old requests counted'
+        assert(wait.browser.requests == 4), 'Requests: %s' % (
+            wait.browser.requests)
+        firefox = self.FakeChrome()
+        firefox.capabilities = {'browserName': 'firefox'}
+        assert(EventWait(firefox, 1).until(expect.presence_of_element_located(
+            (By.ID, 'save'))) == 'polled' and not firefox.scripts), \
+            'Fallback did not poll'
+        browser.scripts = []
+        browser.unloads = 1
+        assert(wait.load() and len(browser.scripts) == 2), \
+            'Navigation not followed: %s' % browser.scripts
+        start = time.monotonic()
+        assert(EventWait(firefox, 1, 0.05).load(grace=0.2) and
+               time.monotonic() - start >= 0.2), 'Old document accepted'
+        firefox.document = ['complete', False]
+        start = time.monotonic()
+        assert(EventWait(firefox, 1, 0.05).load() and
+               time.monotonic() - start < 0.1), 'New document waited on'
+
+
+class TestStaxingRuntime(unittest.TestCase):
+    """Staxing case tests for the injected page runtime."""
+
+    class FakePage(object):
+        """Browser stand-in answering runtime calls like the page would."""
+
+        def __init__(self):
+            """Browser constructor."""
+            self.installed = False
+            self.calls = []
+            self.scripts = 0
+            self.count = '3'
+            self.background = 'rgb(255, 255, 255)'
+            self.clicks = 0
+
+        def click(self):
+            """Stand in for the toggle element clicked through WebDriver."""
+            self.clicks += 1
+
+        def get(self, url):
+            """Open a new document without the runtime."""
+            self.installed = False
+
+        def execute_script(self, script, version, name, args):
+            """Install the runtime when sent, then run the helper."""
+            self.scripts += 1
+            if 'window.__staxing = ' in script:
+                self.installed = True
+            if not self.installed:
+                return {'missing': True}
+            self.calls.append((name, args))
+            if name == 'snapshot':
+                return {'value': {'count': self.count}}
+            if name == 'clickUnlessStyle':
+                if self.background == 'rgb(153, 153, 153)':
+                    return {'value': False}
+                return {'value': True if args[4] else self}
+            if name == 'clickN':
+                return {'value': args[1]}
+            return {'value': args[0]}
+
+    @pytest.mark.skipif(str(927) not in TESTS, reason='Excluded')
+    def test_runtime_steps_take_one_call(self):
+        """Install once per document and run each step in one call."""
+        browser = self.FakePage()
+        runtime = Runtime.for_driver(browser)
+        assert(Assignment.scroll_to(browser, 'footer') == 'footer'), \
+            'Element not returned'
+        assert(runtime.injections == 1 and browser.scripts == 2), \
+            'Install not combined with the call: %s' % browser.scripts
+        Assignment.scroll_to(browser, 'header')
+        assert(browser.scripts == 3), 'Runtime installed twice'
+        browser.get('https://tutor.test/course/5/t/calendar')
+        assignment = Assignment()
+        assignment.open_assignment_menu(browser)
+        browser.background = 'rgb(153, 153, 153)'
+        assignment.open_assignment_menu(browser)
+        assert(runtime.injections == 2 and browser.scripts == 6), \
+            'Runtime not reinstalled after navigation'
+        assert(browser.clicks == 1), \
+            'Menu not clicked through WebDriver: %s' % browser.clicks
+        assignment.set_tutor_selections(browser, {'tutor': 5})
+        name, (target, times) = browser.calls[-1]
+        assert(name == 'clickN' and times == 2 and tuple(target) ==
+               LOCATORS.get('homework.tutor_fewer') and
+               browser.scripts == 8), 'Clicks: %s' % browser.calls[-2:]
+        browser.count = None
+        with pytest.raises(NoSuchElementException):
+            assignment.set_tutor_selections(browser, {'tutor': 5})
+
+    @pytest.mark.skipif(str(928) not in TESTS, reason='Excluded')
+    def test_runtime_helpers_in_chrome(self):
+        """Run every runtime helper against a real page."""
+        page = '''
+            <style>
+                #open { background-color: rgb(153, 153, 153); }
+                #closed { background-color: white; }
+            </style>
+            <div style="height: 3000px"></div>
+            <button id="open" onclick="this.dataset.clicks = 1">Open</button>
+            <button id="closed" onclick="this.dataset.clicks = 1">No</button>
+            <span class="count">3</span>
+            <button name="more" onclick="var count =
+                document.querySelector('.count');
+                count.textContent = +count.textContent + 1;">+</button>
+            <a href="#top"> Chapter 1 Motion </a>
+            <input id="title" oninput="this.dataset.typed = this.value">
+            <input id="done" type="checkbox">
+        '''
+        options = ChromeOptions()
+        options.add_argument('--headless')
+        driver = Chrome(options=options)
+        try:
+            driver.get('data:text/html;charset=utf-8,' + quote(page))
+            runtime = Runtime.for_driver(driver)
+            elements = [runtime.find(locator) for locator in [
+                (By.ID, 'open'), (By.CSS_SELECTOR, '#closed'),
+                (By.NAME, 'more'), (By.CLASS_NAME, 'count'),
+                (By.TAG_NAME, 'input'), (By.LINK_TEXT, 'Chapter 1 Motion'),
+                (By.PARTIAL_LINK_TEXT, 'Motion'),
+                (By.XPATH, '//input[@type="checkbox"]')]]
+            found = [element.get_attribute('id') or element.text
+                     for element in elements]
+            assert(found == ['open', 'closed', '+', '3', 'title',
+                             'Chapter 1 Motion', 'Chapter 1 Motion',
+                             'done']), 'Locators not resolved: %s' % found
+            assert(runtime.find_by_text('a', 'Chapter', exact=False).text ==
+                   'Chapter 1 Motion'), 'Text search failed'
+            with pytest.raises(NoSuchElementException):
+                runtime.find((By.ID, 'missing'))
+            assert(runtime.click((By.NAME, 'more'), 3) == 3), 'Clicks lost'
+            clicked = [runtime.click_unless_style(
+                (By.ID, name), 'background-color', 'rgba(153, 153, 153, 1)')
+                for name in ('open', 'closed')]
+            assert(clicked == [False, True]), 'Style not compared: %s' % (
+                clicked)
+            assert(driver.execute_script('return window.pageYOffset;') > 0), \
+                'Target not scrolled into view'
+            missing = runtime.set_values({'#title': 'Physics', '#done': True,
+                                          '#gone': 'x'})
+            snapshot = runtime.snapshot({
+                'count': (By.CLASS_NAME, 'count'),
+                'typed': (By.ID, 'title', 'data-typed'),
+                'done': (By.ID, 'done', 'checked'),
+                'open': (By.ID, 'open', 'data-clicks'),
+                'closed': (By.ID, 'closed', 'data-clicks'),
+                'color': (By.ID, 'open', 'style:backgroundColor'),
+                'gone': (By.ID, 'gone')})
+        finally:
+            driver.quit()
+        assert(missing == ['#gone']), 'Missing fields: %s' % missing
+        assert(snapshot == {'count': '6', 'typed': 'Physics', 'done': True,
+                            'open': None, 'closed': '1',
+                            'color': 'rgb(153, 153, 153)', 'gone': None}), \
+            'Page state wrong: %s' % snapshot